@@ -2,12 +2,33 @@ from __future__ import annotations
 
 from datetime import datetime, date
 import logging
-from typing import Any
+from typing import Any, Literal
 
-from fastapi import APIRouter, Query, Body, HTTPException
+from fastapi import APIRouter, Query, Body, Depends, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 
-from backend.app.schemas import CompareRequestInput, Bet, HistoryOut
-from backend.app.services import build_compare_request_with_live_data, execute_compare
+from backend.app.history_export import EXPORT_FORMATS, stream_history
+from backend.app.history_writer import get_history_writer
+from backend.app.metrics import stage_timer
+from backend.app.tracing import span
+from backend.app.result_cache import get_result_cache, is_replayable, request_hash
+from backend.app.schemas import (
+    CompareRequestInput,
+    CompareRequest,
+    Bet,
+    BatchCompareInput,
+    SweepRequestInput,
+    HistoryOut,
+)
+from backend.app.services import (
+    build_compare_request_with_live_data,
+    build_compare_request_with_live_data_async,
+    build_compare_requests_batch,
+    execute_compare,
+    sweep_equity_weights,
+    sweep_weight_grid,
+)
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -42,7 +63,7 @@ def _try_history_imports():
         raise RuntimeError(str(e))
 
 
-def _save_history(payload_dict: dict, result_dict: dict, params_dict: dict) -> None:
+def _save_history_inline(rows: list[dict]) -> None:
     try:
         SessionLocal, history_crud = _try_history_imports()
     except RuntimeError as e:
@@ -51,31 +72,110 @@ def _save_history(payload_dict: dict, result_dict: dict, params_dict: dict) -> N
     try:
         db = SessionLocal()
         try:
-            history_crud.create_history(db, payload=payload_dict, result=result_dict, params=params_dict)
+            history_crud.create_history_bulk(db, rows)
         finally:
             db.close()
     except Exception as e:
-        logger.warning("history save failed: %s", e)
+        logger.warning("history save failed (%d rows): %s", len(rows), e)
+
+
+def _history_row(payload_dict: dict, result_dict: dict, params_dict: dict, request_hash: str | None) -> dict:
+    # every row carries the same keys so mixed batches stay one executemany
+    return {
+        "payload": payload_dict,
+        "result": result_dict,
+        "params": params_dict,
+        "notes": None,
+        "request_hash": request_hash,
+    }
+
+
+def _save_history(payload_dict: dict, result_dict: dict, params_dict: dict, request_hash: str | None = None) -> None:
+    _save_history_bulk([_history_row(payload_dict, result_dict, params_dict, request_hash)])
+
+
+def _save_history_bulk(rows: list[dict]) -> None:
+    # Hand off to the background writer when it is running (app lifespan);
+    # otherwise write inline.
+    writer = get_history_writer()
+    with span("history.save", rows=len(rows), mode="queued" if writer is not None else "inline"):
+        if writer is not None:
+            writer.submit_many(rows)
+            return
+        _save_history_inline(rows)
+
+
+async def _lookup_result(key: str) -> dict | None:
+    cache = get_result_cache()
+    if cache is None:
+        return None
+    if cache.blocking:
+        return await run_in_threadpool(cache.get, key)
+    return cache.get(key)
+
+
+def _remember_result(req: CompareRequest, end: str, key: str, result: dict) -> str | None:
+    """Store a replayable result; returns the hash to record on its history row (None otherwise)."""
+    if not is_replayable(req, end):
+        return None
+    cache = get_result_cache()
+    if cache is not None:
+        cache.set(key, result)
+    return key
+
+
+def _odds_meta(req: CompareRequest, snapshot: str | None) -> dict:
+    return {
+        "snapshot_timestamp": snapshot,
+        "resolved_odds": req.bet.odds,
+        "fallback_used": getattr(req.bet, "_fallback", False),
+    }
+
+
+def _history_params(start: str, end: str, snapshot: str | None) -> dict:
+    return {"start": start, "end": end, **({"odds_date": snapshot} if snapshot else {})}
+
+
+def _history_payload(payload: CompareRequestInput) -> dict:
+    return {
+        "starting_capital": payload.starting_capital,
+        "equity_symbol": payload.equity_symbol,
+        "equity_weight": payload.equity_weight,
+        "bet": payload.bet.model_dump(),
+    }
 
 
 @router.post("/compare")
-def compare_handler(
+async def compare_handler(
+    response: Response,
     start: str = Query(..., description="Equity start date YYYY-MM-DD"),
     end: str = Query(..., description="Equity end date YYYY-MM-DD"),
     odds_date: str | None = Query(None, description="Historical odds snapshot ISO timestamp or YYYY-MM-DD"),
     payload: CompareRequestInput = Body(...)
 ):
-    # validate dates
-    start_d = _parse_day("start", start)
-    end_d = _parse_day("end", end)
-    if start_d > end_d:
-        raise HTTPException(status_code=422, detail="start must be <= end")
+    with stage_timer("validate"), span("compare.validate"):
+        start_d = _parse_day("start", start)
+        end_d = _parse_day("end", end)
+        if start_d > end_d:
+            raise HTTPException(status_code=422, detail="start must be <= end")
 
-    snapshot = _parse_snapshot("odds_date", odds_date) if odds_date else None
+        snapshot = _parse_snapshot("odds_date", odds_date) if odds_date else None
     bet_obj: Bet = payload.bet
+    history_payload = _history_payload(payload)
+    history_params = _history_params(start, end, snapshot)
+
+    # identical replayable requests are served as-is and not re-recorded
+    key = request_hash(history_payload, start, end, snapshot)
+    with stage_timer("cache_lookup"), span("compare.cache_lookup") as sp:
+        cached = await _lookup_result(key)
+        sp.set(hit=cached is not None)
+    if cached is not None:
+        response.headers["X-Result-Cache"] = "hit"
+        return cached
+    response.headers["X-Result-Cache"] = "miss"
 
     try:
-        req = build_compare_request_with_live_data(
+        req = await build_compare_request_with_live_data_async(
             starting_capital=payload.starting_capital,
             equity_symbol=payload.equity_symbol,
             equity_weight=payload.equity_weight,
@@ -84,24 +184,16 @@ def compare_handler(
             end=end,
             odds_date=snapshot,
         )
-        result = execute_compare(req)
+        with stage_timer("execute"), span("compare.execute"):
+            result = execute_compare(req)
 
         # add odds metadata
-        result["odds_meta"] = {
-            "snapshot_timestamp": snapshot,
-            "resolved_odds": req.bet.odds,
-            "fallback_used": getattr(req.bet, "_fallback", False),
-        }
-
-        # persist history if possible
-        params_dict = {"start": start, "end": end, **({"odds_date": snapshot} if snapshot else {})}
-        payload_dict = {
-            "starting_capital": payload.starting_capital,
-            "equity_symbol": payload.equity_symbol,
-            "equity_weight": payload.equity_weight,
-            "bet": bet_obj.model_dump(),
-        }
-        _save_history(payload_dict, result, params_dict)
+        result["odds_meta"] = _odds_meta(req, snapshot)
+        stored_hash = _remember_result(req, end, key, result)
+
+        # persist history if possible (sync DB session; keep it off the event loop)
+        with stage_timer("history_write"):
+            await run_in_threadpool(_save_history, history_payload, result, history_params, stored_hash)
         return result
     except HTTPException:
         raise
@@ -110,14 +202,190 @@ def compare_handler(
         raise HTTPException(status_code=502, detail=f"Processing error: {e}")
 
 
+@router.post("/compare/batch")
+def compare_batch_handler(payload: BatchCompareInput = Body(...)):
+    """
+    Evaluate many compare scenarios in one request.
+    Shared (symbol, start, end) and (event_id, odds_date) lookups are fetched once,
+    and history for the whole batch is persisted with a single bulk insert.
+    Scenarios already in the result cache (or repeated within the batch) are not
+    recomputed or recorded again.
+    """
+    scenarios = payload.scenarios
+    snapshots: list[str | None] = []
+    for i, sc in enumerate(scenarios):
+        try:
+            start_d = _parse_day("start", sc.start)
+            end_d = _parse_day("end", sc.end)
+            if start_d > end_d:
+                raise HTTPException(status_code=422, detail="start must be <= end")
+            snapshots.append(_parse_snapshot("odds_date", sc.odds_date) if sc.odds_date else None)
+        except HTTPException as e:
+            raise HTTPException(status_code=422, detail=f"scenarios[{i}]: {e.detail}")
+
+    try:
+        cache = get_result_cache()
+        payloads = [_history_payload(sc) for sc in scenarios]
+        keys = [request_hash(p, sc.start, sc.end, snap) for p, sc, snap in zip(payloads, scenarios, snapshots)]
+        results: list[dict | None] = [None] * len(scenarios)
+        first_index: dict[str, int] = {}
+        to_build = []
+        # one bulk lookup for the whole batch (a single IN (...) query on the db backend)
+        cached_results = cache.get_many(keys) if cache is not None else {}
+        for i, key in enumerate(keys):
+            cached = cached_results.get(key)
+            if cached is not None:
+                results[i] = cached
+            elif key not in first_index:
+                first_index[key] = i
+                to_build.append(i)
+
+        reqs = build_compare_requests_batch([
+            {
+                "starting_capital": scenarios[i].starting_capital,
+                "equity_symbol": scenarios[i].equity_symbol,
+                "equity_weight": scenarios[i].equity_weight,
+                "bet_data": scenarios[i].bet.model_dump(),
+                "start": scenarios[i].start,
+                "end": scenarios[i].end,
+                "odds_date": snapshots[i],
+            }
+            for i in to_build
+        ])
+
+        history_rows = []
+        for i, req in zip(to_build, reqs):
+            sc, snapshot = scenarios[i], snapshots[i]
+            result = execute_compare(req)
+            result["odds_meta"] = _odds_meta(req, snapshot)
+            results[i] = result
+            stored_hash = _remember_result(req, sc.end, keys[i], result)
+            history_rows.append(
+                _history_row(payloads[i], result, _history_params(sc.start, sc.end, snapshot), stored_hash)
+            )
+        # in-batch repeats share the first occurrence's result
+        for i, key in enumerate(keys):
+            if results[i] is None:
+                results[i] = results[first_index[key]]
+
+        _save_history_bulk(history_rows)
+        return {"count": len(results), "results": results}
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception("compare_batch_processing_error")
+        raise HTTPException(status_code=502, detail=f"Processing error: {e}")
+
+
+@router.post("/compare/sweep")
+def compare_sweep_handler(
+    start: str = Query(..., description="Equity start date YYYY-MM-DD"),
+    end: str = Query(..., description="Equity end date YYYY-MM-DD"),
+    odds_date: str | None = Query(None, description="Historical odds snapshot ISO timestamp or YYYY-MM-DD"),
+    payload: SweepRequestInput = Body(...)
+):
+    """
+    Equity-weight sweep: resolve the equity return and odds once, then evaluate the
+    whole weight range for both win and loss branches. Sweeps are not saved to history.
+    """
+    start_d = _parse_day("start", start)
+    end_d = _parse_day("end", end)
+    if start_d > end_d:
+        raise HTTPException(status_code=422, detail="start must be <= end")
+
+    snapshot = _parse_snapshot("odds_date", odds_date) if odds_date else None
+
+    try:
+        req = build_compare_request_with_live_data(
+            starting_capital=payload.starting_capital,
+            equity_symbol=payload.equity_symbol,
+            equity_weight=payload.weight_min,
+            bet_data=payload.bet.model_dump(),
+            start=start,
+            end=end,
+            odds_date=snapshot,
+        )
+        weights = sweep_weight_grid(payload.weight_min, payload.weight_max, payload.weight_step)
+        result = sweep_equity_weights(req, weights)
+        result["odds_meta"] = _odds_meta(req, snapshot)
+        return result
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception("compare_sweep_processing_error")
+        raise HTTPException(status_code=502, detail=f"Processing error: {e}")
+
+
+def history_filters(
+    symbol: str | None = Query(None, description="Equity symbol"),
+    event_id: str | None = Query(None, description="Bet event id"),
+    outcome: Literal["win", "loss"] | None = Query(None),
+    created_from: datetime | None = Query(None, description="Inclusive lower bound on created_at"),
+    created_to: datetime | None = Query(None, description="Exclusive upper bound on created_at"),
+    roi_min: float | None = Query(None, description="Minimum roi_pct (inclusive)"),
+    roi_max: float | None = Query(None, description="Maximum roi_pct (inclusive)"),
+) -> dict[str, Any]:
+    """History filter query parameters, shared by the listing and the export (crud.history.filter_history)."""
+    return {
+        "symbol": symbol, "event_id": event_id, "outcome": outcome,
+        "created_from": created_from, "created_to": created_to,
+        "roi_min": roi_min, "roi_max": roi_max,
+    }
+
+
 @router.get("/compare/history", response_model=list[HistoryOut])
-def get_compare_history(limit: int = 50, offset: int = 0):
+def get_compare_history(
+    response: Response,
+    request: Request,
+    limit: int = Query(50, ge=1, le=1000),
+    offset: int = Query(0, ge=0, description="Deprecated: use cursor (keyset) paging"),
+    cursor: str | None = Query(None, description="Opaque cursor from the previous page's X-Next-Cursor header"),
+    filters: dict[str, Any] = Depends(history_filters),
+):
+    """
+    Newest-first history. Pages are keyset-paginated on (created_at, id): follow the
+    X-Next-Cursor header (also sent as a Link rel="next") until it is absent.
+    offset paging is still accepted for older clients but degrades on deep pages.
+    Filters run against indexed generated columns, so they combine with either mode.
+    """
     try:
         SessionLocal, history_crud = _try_history_imports()
     except RuntimeError as e:
         raise HTTPException(status_code=501, detail=f"History not configured: {e}")
     db = SessionLocal()
     try:
-        return history_crud.list_history(db, limit=limit, offset=offset)
+        if offset and not cursor:
+            return history_crud.list_history(db, limit=limit, offset=offset, **filters)
+        try:
+            rows, next_cursor = history_crud.list_history_page(db, limit=limit, cursor=cursor, **filters)
+        except ValueError:
+            raise HTTPException(status_code=422, detail="Invalid cursor")
+        if next_cursor:
+            next_url = request.url.remove_query_params(["offset", "cursor"]).include_query_params(cursor=next_cursor)
+            response.headers["X-Next-Cursor"] = next_cursor
+            response.headers["Link"] = f'<{next_url}>; rel="next"'
+        return rows
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+@router.get("/compare/history/export")
+def export_compare_history(
+    format: Literal["ndjson", "csv"] = Query("ndjson", description="ndjson (documents as stored) or csv (flattened)"),
+    filters: dict[str, Any] = Depends(history_filters),
+):
+    """
+    Whole-table (optionally filtered) export, oldest first, streamed from a server-side
+    cursor so memory stays constant regardless of table size. Takes the same filters
+    as the listing, so a filtered view can be exported as-is.
+    """
+    try:
+        SessionLocal, _ = _try_history_imports()
+    except RuntimeError as e:
+        raise HTTPException(status_code=501, detail=f"History not configured: {e}")
+    chunks = stream_history(SessionLocal, format, **filters)
+    return StreamingResponse(
+        chunks,
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="comparison_history.{format}"'},
+    )
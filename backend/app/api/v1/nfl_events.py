@@ -1,14 +1,15 @@
 from fastapi import APIRouter
 import os
-import requests
+from backend.app.config import settings
+from backend.app.upstream import http_get
 
 router = APIRouter()
 
 @router.get("/nfl_events")
 def nfl_events():
     ODDS_API_KEY = os.getenv("ODDS_API_KEY")
-    url = f"https://api.the-odds-api.com/v4/sports/americanfootball_nfl/events?apiKey={ODDS_API_KEY}"
-    response = requests.get(url)
+    url = f"{settings.ODDS_API_BASE_URL.rstrip('/')}/v4/sports/americanfootball_nfl/events?apiKey={ODDS_API_KEY}"
+    response = http_get(url)
     if response.status_code == 200:
         return response.json()
     else:
@@ -0,0 +1,38 @@
+from fastapi import APIRouter
+
+from backend.app import cache, upstream
+from backend.app.history_writer import history_writer_stats
+from backend.app.result_cache import result_cache_stats
+from backend.app.singleflight import singleflight_stats
+
+router = APIRouter()
+
+
+@router.get("/stats/upstream")
+def upstream_stats():
+    """Connection reuse counters for the pooled upstream sessions, per host."""
+    return upstream.connection_stats()
+
+
+@router.get("/stats/cache")
+def cache_stats():
+    """Hit/miss/eviction counters for the upstream lookup caches."""
+    return cache.cache_stats()
+
+
+@router.get("/stats/singleflight")
+def coalescing_stats():
+    """How many upstream fetches were coalesced onto an identical in-flight call."""
+    return singleflight_stats()
+
+
+@router.get("/stats/history_writer")
+def history_writer():
+    """Queue depth, throughput and flush latency of the background history writer."""
+    return history_writer_stats()
+
+
+@router.get("/stats/result_cache")
+def result_cache():
+    """Hit/miss/store counters for memoized /compare results."""
+    return result_cache_stats()
@@ -0,0 +1,229 @@
+"""
+Local columnar daily-bar store.
+
+One memory-mapped .npy file per symbol holding a structured array of
+(day, open, close) sorted by day (days since 1970-01-01), plus a small JSON
+sidecar recording the date ranges the file is known to be complete for
+(disjoint backfills stay separate ranges, so the gap between them is not
+treated as covered). Any (start, end) equity return inside one of those ranges
+is two binary searches on the mapped day column, with no network.
+
+The store is filled by a bulk backfill and kept current with incremental
+top-ups (both fetch from Alpaca, walking every page):
+
+    python -m backend.app.bar_store backfill SPY AAPL --start 2015-01-01
+    python -m backend.app.bar_store topup            # every stored symbol
+
+fetch_equity_return_pct consults the store first when BAR_STORE_DIR is set.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import threading
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from backend.app.bars import alpaca_headers, iter_bar_pages
+from backend.app.cache import NOT_COVERED
+from backend.app.config import settings
+
+logger = logging.getLogger(__name__)
+
+BAR_DTYPE = np.dtype([("day", "<i4"), ("open", "<f8"), ("close", "<f8")])
+
+
+def _day_number(value: str | date) -> int:
+    if isinstance(value, str):
+        value = date.fromisoformat(value[:10])
+    return (value - date(1970, 1, 1)).days
+
+
+def _last_closed_day() -> date:
+    """Today's daily bar is still forming; the store only records finished days."""
+    return datetime.now(timezone.utc).date() - timedelta(days=1)
+
+
+def merge_ranges(ranges: List[List[str]]) -> List[List[str]]:
+    """Union of [first_day, last_day] ISO ranges; ranges that overlap or touch (next day) are joined."""
+    merged: List[List[str]] = []
+    for first, last in sorted(ranges):
+        if merged and _day_number(first) <= _day_number(merged[-1][1]) + 1:
+            merged[-1][1] = max(merged[-1][1], last)
+        else:
+            merged.append([first, last])
+    return merged
+
+
+def covered_ranges(meta: Dict[str, Any]) -> List[List[str]]:
+    # sidecars written before "covered" existed describe a single range
+    return meta.get("covered") or [[meta["first_day"], meta["synced_through"]]]
+
+
+def bars_to_array(bars: List[Dict[str, Any]]) -> np.ndarray:
+    arr = np.empty(len(bars), dtype=BAR_DTYPE)
+    for i, b in enumerate(bars):
+        arr[i] = (_day_number(b["t"]), b["o"], b["c"])
+    return arr
+
+
+class BarStore:
+    def __init__(self, root: str):
+        self.root = root
+        self._lock = threading.Lock()
+        # symbol -> (mtime_ns, mapped bars, meta)
+        self._mapped: Dict[str, Tuple[int, np.ndarray, Dict[str, str]]] = {}
+
+    def _paths(self, symbol: str) -> Tuple[str, str]:
+        base = os.path.join(self.root, symbol.upper())
+        return base + ".npy", base + ".json"
+
+    def symbols(self) -> List[str]:
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(f[:-4] for f in os.listdir(self.root) if f.endswith(".npy"))
+
+    def load(self, symbol: str) -> Tuple[np.ndarray, Dict[str, str]] | None:
+        data_path, meta_path = self._paths(symbol)
+        try:
+            mtime = os.stat(meta_path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+        with self._lock:
+            entry = self._mapped.get(symbol)
+            if entry is not None and entry[0] == mtime:
+                return entry[1], entry[2]
+        with open(meta_path) as f:
+            meta = json.load(f)
+        bars = np.load(data_path, mmap_mode="r")
+        with self._lock:
+            self._mapped[symbol] = (mtime, bars, meta)
+        return bars, meta
+
+    def window_return(self, symbol: str, start: str, end: str) -> float | None | object:
+        """
+        (last_close - first_open) / first_open over the stored bars in [start, end],
+        None when fewer than two bars fall inside (same rule as the live fetch),
+        or NOT_COVERED when the store has no complete data for the window.
+        """
+        loaded = self.load(symbol)
+        if loaded is None:
+            return NOT_COVERED
+        bars, meta = loaded
+        try:
+            start_day, end_day = _day_number(start), _day_number(end)
+        except ValueError:
+            return NOT_COVERED
+        if not any(_day_number(first) <= start_day and end_day <= _day_number(last)
+                   for first, last in covered_ranges(meta)):
+            return NOT_COVERED
+        days = bars["day"]
+        lo = int(np.searchsorted(days, start_day, side="left"))
+        hi = int(np.searchsorted(days, end_day, side="right"))
+        if hi - lo < 2:
+            return None
+        first_open = float(bars["open"][lo])
+        last_close = float(bars["close"][hi - 1])
+        return (last_close - first_open) / first_open
+
+    def write(self, symbol: str, new_bars: np.ndarray, first_day: str, synced_through: str) -> int:
+        """
+        Merge bars into the symbol file (new rows win on the same day); atomic replace.
+        [first_day, synced_through] is added to the covered ranges; first_day and
+        synced_through in the sidecar are the overall extent (topup resumes after it).
+        """
+        os.makedirs(self.root, exist_ok=True)
+        data_path, meta_path = self._paths(symbol)
+        loaded = self.load(symbol)
+        covered = [[first_day, synced_through]]
+        if loaded is not None:
+            old_bars, old_meta = loaded
+            covered += covered_ranges(old_meta)
+            merged = np.concatenate([np.asarray(new_bars, dtype=BAR_DTYPE), np.array(old_bars)])
+        else:
+            merged = np.asarray(new_bars, dtype=BAR_DTYPE)
+        covered = merge_ranges(covered)
+        # unique keeps the first occurrence per day, i.e. the freshly fetched row
+        _, idx = np.unique(merged["day"], return_index=True)
+        merged = merged[idx]
+
+        tmp_data = data_path + ".tmp.npy"
+        np.save(tmp_data, merged)
+        os.replace(tmp_data, data_path)
+        tmp_meta = meta_path + ".tmp"
+        with open(tmp_meta, "w") as f:
+            json.dump({"first_day": covered[0][0], "synced_through": covered[-1][1], "covered": covered}, f)
+        os.replace(tmp_meta, meta_path)
+        with self._lock:
+            self._mapped.pop(symbol, None)
+        return len(merged)
+
+    def backfill(self, symbol: str, start: str, end: str | None = None) -> int:
+        symbol = symbol.upper()
+        end = min(end or _last_closed_day().isoformat(), _last_closed_day().isoformat())
+        if start > end:
+            return 0
+        headers = alpaca_headers()
+        if headers is None:
+            raise RuntimeError("ALPACA_API_KEY / ALPACA_API_SECRET not set")
+        fetched = [bars_to_array(page) for page in iter_bar_pages(symbol, start, end, headers)]
+        new_bars = np.concatenate(fetched) if fetched else np.empty(0, dtype=BAR_DTYPE)
+        count = self.write(symbol, new_bars, start, end)
+        logger.info("bar_store_backfill symbol=%s start=%s end=%s fetched=%d stored=%d",
+                    symbol, start, end, len(new_bars), count)
+        return count
+
+    def topup(self, symbol: str) -> int:
+        """Fetch only the days after the symbol's synced_through date."""
+        loaded = self.load(symbol)
+        if loaded is None:
+            raise KeyError(f"{symbol} not in bar store; run backfill first")
+        start = (date.fromisoformat(loaded[1]["synced_through"]) + timedelta(days=1)).isoformat()
+        return self.backfill(symbol, start)
+
+
+_store: BarStore | None = None
+_store_lock = threading.Lock()
+
+
+def get_bar_store() -> BarStore | None:
+    """Process-wide store under BAR_STORE_DIR, or None when the store is disabled."""
+    global _store
+    if not settings.BAR_STORE_DIR:
+        return None
+    with _store_lock:
+        if _store is None or _store.root != settings.BAR_STORE_DIR:
+            _store = BarStore(settings.BAR_STORE_DIR)
+        return _store
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Maintain the local daily-bar store")
+    parser.add_argument("--dir", default=settings.BAR_STORE_DIR, help="store directory (default BAR_STORE_DIR)")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    bf = sub.add_parser("backfill", help="bulk-load symbols over a date range")
+    bf.add_argument("symbols", nargs="+")
+    bf.add_argument("--start", required=True, help="YYYY-MM-DD")
+    bf.add_argument("--end", default=None, help="YYYY-MM-DD (default: last closed day)")
+    tu = sub.add_parser("topup", help="fetch new days for stored symbols")
+    tu.add_argument("symbols", nargs="*")
+    args = parser.parse_args(argv)
+
+    if not args.dir:
+        parser.error("set BAR_STORE_DIR or pass --dir")
+    store = BarStore(args.dir)
+    if args.cmd == "backfill":
+        for symbol in args.symbols:
+            print(f"{symbol.upper()}: {store.backfill(symbol, args.start, args.end)} bars")
+    else:
+        for symbol in args.symbols or store.symbols():
+            print(f"{symbol.upper()}: {store.topup(symbol.upper())} bars")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
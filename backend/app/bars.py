@@ -0,0 +1,204 @@
+"""
+Paginated, streaming reader for Alpaca daily bars.
+
+Alpaca caps each response at `limit` bars and returns a next_page_token for the
+rest. The readers here walk every page but never hold the whole series: pages
+are fed into a BarAggregate, which keeps only running values (first open, last
+close, count, peak/drawdown and a Welford accumulator for volatility).
+
+Long windows are split into date chunks (BARS_CHUNK_DAYS) that are fetched
+concurrently, up to BARS_PREFETCH chunks ahead of the consumer, and consumed in
+order; each chunk paginates on its own. Memory is bounded by prefetch x chunk.
+"""
+from __future__ import annotations
+
+import asyncio
+import math
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from typing import Any, AsyncIterator, Dict, Iterator, List, Tuple
+
+import httpx
+
+from backend.app.config import settings
+from backend.app.tracing import submit_in_context
+from backend.app.upstream import http_get
+
+_prefetch_pool = ThreadPoolExecutor(max_workers=max(settings.BARS_PREFETCH, 1), thread_name_prefix="bars")
+
+
+def alpaca_headers() -> Dict[str, str] | None:
+    """Alpaca data API auth headers, or None when credentials are missing."""
+    key = os.getenv("ALPACA_API_KEY")
+    secret = os.getenv("ALPACA_API_SECRET")
+    if not (key and secret):
+        return None
+    return {"APCA-API-KEY-ID": key, "APCA-API-SECRET-KEY": secret}
+
+
+def bars_url(symbol: str) -> str:
+    return f"{settings.ALPACA_DATA_BASE_URL.rstrip('/')}/v2/stocks/{symbol}/bars"
+
+
+class BarAggregate:
+    """Running aggregates over daily bars fed in chronological order."""
+
+    def __init__(self):
+        self.count = 0
+        self.first_open: float | None = None
+        self.last_close: float | None = None
+        self._peak: float | None = None
+        self.max_drawdown = 0.0
+        # Welford over close-to-close simple returns
+        self._n = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    def add(self, bar: Dict[str, Any]) -> None:
+        close = bar["c"]
+        if self.count == 0:
+            self.first_open = bar["o"]
+        else:
+            r = close / self.last_close - 1
+            self._n += 1
+            delta = r - self._mean
+            self._mean += delta / self._n
+            self._m2 += delta * (r - self._mean)
+        if self._peak is None or close > self._peak:
+            self._peak = close
+        elif self._peak > 0:
+            self.max_drawdown = max(self.max_drawdown, (self._peak - close) / self._peak)
+        self.last_close = close
+        self.count += 1
+
+    def add_page(self, bars: List[Dict[str, Any]]) -> None:
+        for bar in bars:
+            self.add(bar)
+
+    def equity_return(self) -> float | None:
+        """(last_close - first_open) / first_open; None under two bars (same rule as before paging)."""
+        if self.count < 2:
+            return None
+        return (self.last_close - self.first_open) / self.first_open
+
+    def volatility(self) -> float | None:
+        """Sample standard deviation of daily close-to-close returns."""
+        if self._n < 2:
+            return None
+        return math.sqrt(self._m2 / (self._n - 1))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "bars": self.count,
+            "first_open": self.first_open,
+            "last_close": self.last_close,
+            "return_pct": self.equity_return(),
+            "max_drawdown": self.max_drawdown if self.count else None,
+            "volatility": self.volatility(),
+        }
+
+
+def chunk_windows(start: str, end: str, chunk_days: int) -> List[Tuple[str, str]]:
+    """Split an inclusive [start, end] day window into consecutive chunks."""
+    try:
+        s, e = date.fromisoformat(start[:10]), date.fromisoformat(end[:10])
+    except ValueError:
+        return [(start, end)]
+    if chunk_days <= 0 or s > e:
+        return [(start, end)]
+    out = []
+    while s <= e:
+        chunk_end = min(s + timedelta(days=chunk_days - 1), e)
+        out.append((s.isoformat(), chunk_end.isoformat()))
+        s = chunk_end + timedelta(days=1)
+    return out
+
+
+def _params(start: str, end: str, page_token: str | None) -> Dict[str, Any]:
+    params: Dict[str, Any] = {"start": start, "end": end, "timeframe": "1Day", "limit": settings.BARS_PAGE_LIMIT}
+    if page_token:
+        params["page_token"] = page_token
+    return params
+
+
+def _fetch_chunk(url: str, headers: Dict[str, str], start: str, end: str) -> List[List[Dict[str, Any]]]:
+    pages = []
+    token = None
+    while True:
+        resp = http_get(url, headers=headers, params=_params(start, end, token), timeout=10)
+        resp.raise_for_status()
+        body = resp.json()
+        pages.append(body.get("bars") or [])
+        token = body.get("next_page_token")
+        if not token:
+            return pages
+
+
+def iter_bar_pages(symbol: str, start: str, end: str, headers: Dict[str, str]) -> Iterator[List[Dict[str, Any]]]:
+    """Yield every page of daily bars for the window in order; HTTP errors propagate."""
+    url = bars_url(symbol)
+    chunks = deque(chunk_windows(start, end, settings.BARS_CHUNK_DAYS))
+    if len(chunks) == 1:
+        # single chunk: stream page by page without the pool
+        yield from _fetch_chunk(url, headers, *chunks[0])
+        return
+    in_flight = deque()
+    try:
+        while chunks or in_flight:
+            while chunks and len(in_flight) < max(settings.BARS_PREFETCH, 1):
+                in_flight.append(submit_in_context(_prefetch_pool, _fetch_chunk, url, headers, *chunks.popleft()))
+            yield from in_flight.popleft().result()
+    finally:
+        for fut in in_flight:
+            fut.cancel()
+
+
+async def _fetch_chunk_async(
+    client: httpx.AsyncClient, url: str, headers: Dict[str, str], start: str, end: str
+) -> List[List[Dict[str, Any]]]:
+    pages = []
+    token = None
+    while True:
+        resp = await client.get(url, headers=headers, params=_params(start, end, token), timeout=10)
+        resp.raise_for_status()
+        body = resp.json()
+        pages.append(body.get("bars") or [])
+        token = body.get("next_page_token")
+        if not token:
+            return pages
+
+
+async def aiter_bar_pages(
+    client: httpx.AsyncClient, symbol: str, start: str, end: str, headers: Dict[str, str]
+) -> AsyncIterator[List[Dict[str, Any]]]:
+    """Async iter_bar_pages: chunk tasks run ahead of the consumer on the event loop."""
+    url = bars_url(symbol)
+    chunks = deque(chunk_windows(start, end, settings.BARS_CHUNK_DAYS))
+    in_flight: deque = deque()
+    try:
+        while chunks or in_flight:
+            while chunks and len(in_flight) < max(settings.BARS_PREFETCH, 1):
+                in_flight.append(asyncio.ensure_future(_fetch_chunk_async(client, url, headers, *chunks.popleft())))
+            for page in await in_flight.popleft():
+                yield page
+    finally:
+        for task in in_flight:
+            task.cancel()
+
+
+def aggregate_bars(symbol: str, start: str, end: str, headers: Dict[str, str]) -> BarAggregate:
+    agg = BarAggregate()
+    for page in iter_bar_pages(symbol, start, end, headers):
+        agg.add_page(page)
+    return agg
+
+
+async def aggregate_bars_async(
+    client: httpx.AsyncClient, symbol: str, start: str, end: str, headers: Dict[str, str]
+) -> BarAggregate:
+    agg = BarAggregate()
+    async for page in aiter_bar_pages(client, symbol, start, end, headers):
+        agg.add_page(page)
+    return agg
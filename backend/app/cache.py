@@ -0,0 +1,159 @@
+"""
+In-process caches for upstream lookups.
+
+TTLCache is a thread-safe, size-bounded LRU with an optional per-entry TTL
+(ttl=None keeps the entry until it is evicted) and an optional SQLite tier on
+disk that survives restarts. Keys are tuples of JSON-serializable parts; values
+must be JSON-serializable. Every cache registers itself by name so stats can be
+reported in one place.
+"""
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Tuple
+
+MISSING = object()
+# returned by the local bar/odds stores when they cannot answer and the caller must go upstream
+NOT_COVERED = object()
+
+_registry: Dict[str, "TTLCache"] = {}
+
+
+class _DiskTier:
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL)"
+            )
+            self._conn.commit()
+
+    def get(self, key: str) -> Tuple[Any, float | None]:
+        with self._lock:
+            row = self._conn.execute("SELECT value, expires_at FROM cache WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return MISSING, None
+        value, expires_at = row
+        if expires_at is not None and expires_at <= time.time():
+            self.delete(key)
+            return MISSING, None
+        return json.loads(value), expires_at
+
+    def set(self, key: str, value: Any, expires_at: float | None) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value), expires_at),
+            )
+            self._conn.commit()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM cache")
+            self._conn.commit()
+
+
+class TTLCache:
+    def __init__(self, name: str, maxsize: int, disk_path: str | None = None):
+        self.name = name
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, Tuple[Any, float | None]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk = _DiskTier(disk_path) if disk_path else None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        _registry[name] = self
+
+    @staticmethod
+    def _disk_key(key: Hashable) -> str:
+        return json.dumps(list(key) if isinstance(key, tuple) else key)
+
+    def get(self, key: Hashable) -> Any:
+        """Cached value or MISSING."""
+        now = time.time()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at is None or expires_at > now:
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+
+        if self._disk is not None:
+            value, expires_at = self._disk.get(self._disk_key(key))
+            if value is not MISSING:
+                with self._lock:
+                    self.disk_hits += 1
+                    self._put(key, value, expires_at)
+                return value
+
+        with self._lock:
+            self.misses += 1
+        return MISSING
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None) -> None:
+        expires_at = time.time() + ttl if ttl is not None else None
+        with self._lock:
+            self._put(key, value, expires_at)
+        if self._disk is not None:
+            self._disk.set(self._disk_key(key), value, expires_at)
+
+    def _put(self, key: Hashable, value: Any, expires_at: float | None) -> None:
+        self._data[key] = (value, expires_at)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self, disk: bool = True) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = self.disk_hits = self.misses = self.evictions = 0
+        if disk and self._disk is not None:
+            self._disk.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": round((self.hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+                "disk_tier": self._disk is not None,
+            }
+
+
+def disk_path(name: str, cache_dir: str | None) -> str | None:
+    """SQLite file for a named cache under cache_dir, or None when the disk tier is disabled."""
+    if not cache_dir:
+        return None
+    return os.path.join(cache_dir, f"{name}.sqlite3")
+
+
+def cache_stats() -> Dict[str, Dict[str, Any]]:
+    return {name: c.stats() for name, c in _registry.items()}
+
+
+def clear_all(disk: bool = True) -> None:
+    for c in _registry.values():
+        c.clear(disk=disk)
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
@@ -6,6 +8,50 @@ class Settings(BaseSettings):
     ALPACA_API_SECRET: str | None = None
     ALPACA_BASE_URL: str | None = None
     ODDS_API_KEY: str | None = None
+    # upstream API roots; point both at backend/loadtest/mock_upstream.py to run offline
+    ALPACA_DATA_BASE_URL: str = "https://data.alpaca.markets"
+    ODDS_API_BASE_URL: str = "https://api.the-odds-api.com"
+    # bounded pool used to resolve the equity and odds legs concurrently
+    UPSTREAM_MAX_WORKERS: int = 8
+    # pooled upstream HTTP clients (backend/app/upstream.py)
+    UPSTREAM_MAX_CONNECTIONS: int = 100
+    UPSTREAM_POOL_MAXSIZE: int = 20
+    UPSTREAM_MAX_RETRIES: int = 1
+    UPSTREAM_BACKOFF_FACTOR: float = 0.3
+    # upstream lookup caches (backend/app/cache.py); CACHE_DIR enables the on-disk tier
+    CACHE_DIR: str | None = None
+    EQUITY_CACHE_MAXSIZE: int = 4096
+    EQUITY_CACHE_OPEN_TTL_SEC: float = 300.0
+    ODDS_CACHE_MAXSIZE: int = 1024
+    # paginated bar reader (backend/app/bars.py)
+    BARS_PAGE_LIMIT: int = 1000
+    BARS_CHUNK_DAYS: int = 365
+    BARS_PREFETCH: int = 4
+    # background history writer (backend/app/history_writer.py)
+    HISTORY_WRITER_ENABLED: bool = True
+    HISTORY_QUEUE_MAXSIZE: int = 10000
+    HISTORY_BATCH_SIZE: int = 500
+    HISTORY_FLUSH_INTERVAL_SEC: float = 0.5
+    HISTORY_ENQUEUE_TIMEOUT_SEC: float = 0.5
+    HISTORY_DRAIN_TIMEOUT_SEC: float = 10.0
+    # local daily-bar store (backend/app/bar_store.py); unset = always fetch bars live
+    BAR_STORE_DIR: str | None = None
+    # local odds time-series store (backend/app/odds_store.py); unset = always fetch odds live.
+    # A stored snapshot answers a lookup only when the live endpoint would return that same
+    # snapshot; ODDS_STORE_MAX_STALENESS_SEC > 0 also accepts one up to that many seconds older.
+    ODDS_STORE_PATH: str | None = None
+    ODDS_STORE_MAX_STALENESS_SEC: float = 0.0
+    # memoized /compare results (backend/app/result_cache.py): memory | db | off
+    RESULT_CACHE_BACKEND: Literal["memory", "db", "off"] = "memory"
+    RESULT_CACHE_MAXSIZE: int = 2048
+    # GET /metrics and per-request latency histograms (backend/app/metrics.py)
+    METRICS_ENABLED: bool = True
+    # request tracing spans (backend/app/tracing.py): off | stdout | file (JSON lines to TRACE_FILE)
+    TRACE_EXPORTER: Literal["off", "stdout", "file"] = "off"
+    TRACE_FILE: str | None = None
+    # app log output (backend.* loggers); %(trace_id)s / %(span_id)s tie lines to their request
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "%(asctime)s %(levelname)s %(name)s trace=%(trace_id)s span=%(span_id)s :: %(message)s"
 
     # Pydantic v2 settings config
     model_config = SettingsConfigDict(
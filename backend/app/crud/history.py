@@ -1,3 +1,8 @@
+import base64
+import uuid
+from datetime import datetime
+
+from sqlalchemy import insert, select, tuple_
 from sqlalchemy.orm import Session
 from backend.app.models.comparison_history import ComparisonHistory
 
@@ -8,11 +13,128 @@ def create_history(db: Session, payload: dict, result: dict, params: dict | None
     db.refresh(rec)
     return rec
 
-def list_history(db: Session, limit: int = 50, offset: int = 0):
+def create_history_bulk(db: Session, rows: list[dict]) -> int:
+    """Insert many history rows in one executemany (multi-row INSERT); rows hold payload/result/params/notes."""
+    if not rows:
+        return 0
+    db.execute(insert(ComparisonHistory), rows)
+    db.commit()
+    return len(rows)
+
+def filter_history(
+    q,
+    symbol: str | None = None,
+    event_id: str | None = None,
+    outcome: str | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+    roi_min: float | None = None,
+    roi_max: float | None = None,
+):
+    """
+    Narrow a history query on the generated filter columns. created_from is inclusive,
+    created_to exclusive; roi bounds are inclusive.
+    """
+    if symbol:
+        q = q.filter(ComparisonHistory.equity_symbol == symbol.strip().upper())
+    if event_id:
+        q = q.filter(ComparisonHistory.event_id == event_id.lower())
+    if outcome:
+        q = q.filter(ComparisonHistory.outcome == outcome)
+    if created_from is not None:
+        q = q.filter(ComparisonHistory.created_at >= created_from)
+    if created_to is not None:
+        q = q.filter(ComparisonHistory.created_at < created_to)
+    if roi_min is not None:
+        q = q.filter(ComparisonHistory.roi_pct >= roi_min)
+    if roi_max is not None:
+        q = q.filter(ComparisonHistory.roi_pct <= roi_max)
+    return q
+
+def get_result_by_hash(db: Session, request_hash: str) -> dict | None:
+    """Result of the newest history row stored under request_hash, or None."""
+    return db.execute(
+        select(ComparisonHistory.result)
+        .where(ComparisonHistory.request_hash == request_hash)
+        .order_by(ComparisonHistory.created_at.desc())
+        .limit(1)
+    ).scalar_one_or_none()
+
+# keeps IN (...) under SQLite's bound-parameter limit on older builds
+_HASH_CHUNK = 900
+
+def get_results_by_hashes(db: Session, request_hashes: list[str]) -> dict[str, dict]:
+    """Newest stored result per request_hash, one IN (...) query per chunk; missing hashes are absent."""
+    unique = list(dict.fromkeys(request_hashes))
+    found: dict[str, dict] = {}
+    for i in range(0, len(unique), _HASH_CHUNK):
+        rows = db.execute(
+            select(ComparisonHistory.request_hash, ComparisonHistory.result)
+            .where(ComparisonHistory.request_hash.in_(unique[i:i + _HASH_CHUNK]))
+            .order_by(ComparisonHistory.created_at.desc())
+        ).all()
+        for request_hash, result in rows:
+            found.setdefault(request_hash, result)
+    return found
+
+def list_history(db: Session, limit: int = 50, offset: int = 0, **filters):
     return (
-        db.query(ComparisonHistory)
+        filter_history(db.query(ComparisonHistory), **filters)
         .order_by(ComparisonHistory.created_at.desc())
         .limit(limit)
         .offset(offset)
         .all()
-    )
\ No newline at end of file
+    )
+
+def encode_cursor(rec: ComparisonHistory) -> str:
+    raw = f"{rec.created_at.isoformat()}|{rec.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    """Inverse of encode_cursor; raises ValueError on anything malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, rec_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), uuid.UUID(rec_id)
+    except Exception as e:
+        raise ValueError("invalid cursor") from e
+
+def list_history_page(db: Session, limit: int = 50, cursor: str | None = None, **filters):
+    """
+    Keyset page ordered by (created_at, id) DESC, served by ix_comparison_history_created_at_id.
+    Returns (rows, next_cursor); next_cursor is None on the last page. One extra row is
+    read to detect a following page, so no COUNT is needed. filters as in filter_history;
+    a cursor is only meaningful with the same filters it was issued under.
+    """
+    q = filter_history(db.query(ComparisonHistory), **filters)
+    if cursor:
+        created_at, rec_id = decode_cursor(cursor)
+        q = q.filter(tuple_(ComparisonHistory.created_at, ComparisonHistory.id) < tuple_(created_at, rec_id))
+    rows = (
+        q.order_by(ComparisonHistory.created_at.desc(), ComparisonHistory.id.desc())
+        .limit(limit + 1)
+        .all()
+    )
+    if len(rows) > limit:
+        rows = rows[:limit]
+        return rows, encode_cursor(rows[-1])
+    return rows, None
+
+def iter_history(db: Session, batch_size: int = 1000, **filters):
+    """
+    Yield history rows (plain Row tuples, no ORM identity map) oldest first through a
+    server-side cursor: yield_per streams batch_size rows at a time, so memory stays flat
+    however large the table is. filters as in filter_history.
+    """
+    stmt = filter_history(
+        select(
+            ComparisonHistory.id,
+            ComparisonHistory.created_at,
+            ComparisonHistory.payload,
+            ComparisonHistory.result,
+            ComparisonHistory.params,
+            ComparisonHistory.notes,
+        ),
+        **filters,
+    ).order_by(ComparisonHistory.created_at, ComparisonHistory.id)
+    yield from db.execute(stmt.execution_options(yield_per=batch_size))
@@ -2,38 +2,133 @@ import os
 import time
 import json
 import sys
-import requests
+import asyncio
 import datetime
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
+
+import httpx
+
+from backend.app.config import settings
+from backend.app.odds_store import OddsStore
+from backend.app.upstream import RETRY_STATUSES, create_async_client, http_get
 
 ODDS_API_KEY = os.getenv("ODDS_API_KEY")
-BASE = "https://api.the-odds-api.com/v4/historical/sports/americanfootball_nfl"
+HISTORICAL_PATH = "/v4/historical/sports/americanfootball_nfl"
+
+# Crawl defaults: The Odds API throttles bursts, so requests are paced by a token
+# bucket (CRAWL_RATE per second, bursts up to CRAWL_BURST) rather than fixed sleeps.
+CRAWL_RATE = 5.0
+CRAWL_BURST = 5
+CRAWL_CONCURRENCY = 4
+
+def _base_url() -> str:
+    return settings.ODDS_API_BASE_URL.rstrip("/") + HISTORICAL_PATH
 
-if not ODDS_API_KEY:
-    print("ERROR: ODDS_API_KEY not set in environment.")
-    sys.exit(1)
+def _odds_params(ts: str) -> Dict[str, str]:
+    return {
+        "apiKey": ODDS_API_KEY,
+        "date": ts,
+        "markets": "h2h",
+        "regions": "us",
+        "oddsFormat": "decimal"
+    }
+
+# ------------------ Checkpoint ------------------
+class Checkpoint:
+    """
+    On-disk crawl state, so an interrupted crawl (crash, quota error, Ctrl-C) can
+    be rerun without re-fetching:
+
+      snapshots  requested timestamp -> events snapshot payload (the visited set)
+      odds       event id -> requested timestamp -> odds payload (null = 404)
+      season     requested timestamp -> compact sport-wide snapshot (see
+                 extract_snapshot_h2h); raw payloads would be too large to keep
+
+    Only successful fetches are recorded, so failed timestamps are retried. No
+    separate frontier is kept: snapshot chains are linked lists, so a resumed
+    crawl replays from its origin through the cached snapshots (no requests) and
+    the first uncached link it reaches is where the last run stopped. The file
+    is rewritten atomically every `save_every` new entries and on save().
+    """
 
-def fetch_events_snapshot(ts: str) -> Optional[Dict[str, Any]]:
+    VERSION = 1
+
+    def __init__(self, path: str, save_every: int = 10):
+        self.path = path
+        self.save_every = max(save_every, 1)
+        self.snapshots: Dict[str, Dict[str, Any]] = {}
+        self.odds: Dict[str, Dict[str, Optional[Dict[str, Any]]]] = {}
+        self.season: Dict[str, Dict[str, Any]] = {}
+        self._unsaved = 0
+        if os.path.exists(path):
+            self._load()
+
+    def _load(self) -> None:
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"[checkpoint] {self.path} unreadable ({e}); starting fresh.")
+            return
+        if data.get("version") != self.VERSION:
+            print(f"[checkpoint] {self.path} has version {data.get('version')}; starting fresh.")
+            return
+        self.snapshots = data.get("snapshots") or {}
+        self.odds = data.get("odds") or {}
+        self.season = data.get("season") or {}
+        cached_odds = sum(len(v) for v in self.odds.values())
+        print(f"[checkpoint] Loaded {len(self.snapshots)} snapshots, {cached_odds} odds payloads, "
+              f"{len(self.season)} season snapshots from {self.path}")
+
+    def has_odds(self, event_id: str, ts: str) -> bool:
+        return ts in self.odds.get(event_id, {})
+
+    def put_snapshot(self, ts: str, payload: Dict[str, Any]) -> None:
+        self.snapshots[ts] = payload
+        self._touch()
+
+    def put_odds(self, event_id: str, ts: str, payload: Optional[Dict[str, Any]]) -> None:
+        self.odds.setdefault(event_id, {})[ts] = payload
+        self._touch()
+
+    def put_season(self, ts: str, record: Dict[str, Any]) -> None:
+        self.season[ts] = record
+        self._touch()
+
+    def _touch(self) -> None:
+        self._unsaved += 1
+        if self._unsaved >= self.save_every:
+            self.save()
+
+    def save(self) -> None:
+        data = {"version": self.VERSION, "snapshots": self.snapshots, "odds": self.odds,
+                "season": self.season}
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp, self.path)
+        self._unsaved = 0
+# ------------------------------------------------
+
+def fetch_events_snapshot(ts: str, checkpoint: Optional[Checkpoint] = None) -> Optional[Dict[str, Any]]:
+    if checkpoint is not None and ts in checkpoint.snapshots:
+        return checkpoint.snapshots[ts]
     params = {"apiKey": ODDS_API_KEY, "date": ts}
     try:
-        r = requests.get(f"{BASE}/events", params=params, timeout=10)
+        r = http_get(f"{_base_url()}/events", params=params, timeout=10)
         r.raise_for_status()
-        return r.json()
+        payload = r.json()
     except Exception as e:
         print(f"[events] {ts} error: {e}")
         return None
+    if checkpoint is not None:
+        checkpoint.put_snapshot(ts, payload)
+    return payload
 
 def fetch_single_event_odds(event_id: str, ts: str) -> Optional[Dict[str, Any]]:
-    params = {
-        "apiKey": ODDS_API_KEY,
-        "date": ts,
-        "markets": "h2h",
-        "regions": "us",
-        "oddsFormat": "decimal"
-    }
-    url = f"{BASE}/events/{event_id}/odds"
+    url = f"{_base_url()}/events/{event_id}/odds"
     try:
-        r = requests.get(url, params=params, timeout=10)
+        r = http_get(url, params=_odds_params(ts), timeout=10)
         if r.status_code == 404:
             return None
         r.raise_for_status()
@@ -73,6 +168,29 @@ def extract_best_h2h(odds_payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         "distinct_price_count": len(set(all_prices))
     }
 
+def extract_snapshot_h2h(odds_payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Compact form of a sport-wide /odds snapshot: its timestamp links plus, for
+    every listed event, the teams, kickoff and best h2h price (extract_best_h2h).
+    """
+    events = {}
+    data = odds_payload.get("data")
+    for ev in data if isinstance(data, list) else []:
+        if not isinstance(ev, dict) or not ev.get("id"):
+            continue
+        events[ev["id"]] = {
+            "home_team": ev.get("home_team"),
+            "away_team": ev.get("away_team"),
+            "commence_time": ev.get("commence_time"),
+            "odds": extract_best_h2h({"data": ev}),
+        }
+    return {
+        "timestamp": odds_payload.get("timestamp"),
+        "previous_timestamp": odds_payload.get("previous_timestamp"),
+        "next_timestamp": odds_payload.get("next_timestamp"),
+        "events": events,
+    }
+
 def snapshot_contains_event(snapshot_payload: Dict[str, Any], event_id: str) -> bool:
     data = snapshot_payload.get("data", [])
     if not isinstance(data, list):
@@ -82,7 +200,8 @@ def snapshot_contains_event(snapshot_payload: Dict[str, Any], event_id: str) ->
 # ------------------ ADDED: Previous-day probe ------------------
 def probe_previous_day(event_id: str,
                        start_timestamp: str,
-                       probe_hours: List[int]) -> Optional[str]:
+                       probe_hours: List[int],
+                       checkpoint: Optional[Checkpoint] = None) -> Optional[str]:
     """
     Coarse probe for event presence on the previous UTC day.
     Returns the LATEST probe timestamp (on previous day) that contained the event,
@@ -101,7 +220,7 @@ def probe_previous_day(event_id: str,
         ts = datetime.datetime(prev_day.year, prev_day.month, prev_day.day,
                                hour, 0, 0, tzinfo=datetime.timezone.utc
                                ).isoformat().replace("+00:00", "Z")
-        snap = fetch_events_snapshot(ts)
+        snap = fetch_events_snapshot(ts, checkpoint)
         if not snap:
             print(f"[probe] {ts} -> (no snapshot / error)")
             continue
@@ -120,7 +239,8 @@ def probe_previous_day(event_id: str,
 def deep_probe_previous_days(event_id: str,
                              start_timestamp: str,
                              probe_hours: List[int],
-                             max_days: int) -> str:
+                             max_days: int,
+                             checkpoint: Optional[Checkpoint] = None) -> str:
     """
     Repeatedly probe earlier UTC days (up to max_days) to find the earliest
     day containing the event at any of the probe_hours. Returns the earliest
@@ -129,7 +249,7 @@ def deep_probe_previous_days(event_id: str,
     """
     earliest = start_timestamp
     for _ in range(max_days):
-        found_prev_ts = probe_previous_day(event_id, earliest, probe_hours)
+        found_prev_ts = probe_previous_day(event_id, earliest, probe_hours, checkpoint)
         if not found_prev_ts:
             break  # no earlier day presence
         # Shift to earlier day snapshot and continue probing further back
@@ -138,21 +258,263 @@ def deep_probe_previous_days(event_id: str,
     return earliest
 # -----------------------------------------------------------------------
 
-def crawl_snapshots(event_id: str,
-                    start_timestamp: str,
-                    max_back: int = 15,
-                    max_forward: int = 15,
-                    sleep_sec: float = 0.6) -> List[Dict[str, Any]]:
-    visited = {}
-    queue = [(start_timestamp, "origin")]
-    results = []
+# ------------------ Lifetime discovery ------------------
+def _parse_ts(ts: str) -> datetime.datetime:
+    return datetime.datetime.fromisoformat(ts.replace("Z", "+00:00"))
 
-    def enqueue(ts: Optional[str], direction: str):
-        if ts and ts not in visited:
-            queue.append((ts, direction))
+def _format_ts(dt: datetime.datetime) -> str:
+    return dt.astimezone(datetime.timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
 
-    back_count = 0
-    fwd_count = 0
+def _find_edge(event_id: str,
+               present: Dict[str, Any],
+               direction: str,
+               max_span: datetime.timedelta,
+               first_step: datetime.timedelta,
+               lookup) -> Tuple[Dict[str, Any], bool]:
+    """
+    Outermost snapshot in `direction` that still lists the event, starting from
+    `present` (which does). Gallops outward with doubling steps until it reaches a
+    snapshot without the event (or a date before the first snapshot), then
+    binary-searches between the two. The API returns the snapshot at or before the
+    requested date, so when a probe lands on a bound the adjacent snapshot link is
+    followed instead.
+    lookup(ts) returns the snapshot, {} when there is none at or before ts, or None
+    on error. Returns (edge snapshot, bounded); bounded means max_span or an error
+    stopped the search before the true edge was seen.
+    """
+    backward = direction == "backward"
+    link = "previous_timestamp" if backward else "next_timestamp"
+    sign = -1 if backward else 1
+    anchor = _parse_ts(present["timestamp"])
+
+    def outward(ts: str, ref: str) -> bool:
+        t, r = _parse_ts(ts), _parse_ts(ref)
+        return t < r if backward else t > r
+
+    # gallop: anchor +/- step, 2*step, 4*step, ... up to max_span
+    absent_ts = None  # nearest known point outward of present where the event is not listed
+    offset = first_step
+    while absent_ts is None:
+        if not present.get(link):
+            return present, False  # start/end of the snapshot timeline
+        target = _format_ts(anchor + sign * offset)
+        snap = lookup(target)
+        if snap and not outward(snap["timestamp"], present["timestamp"]):
+            snap = lookup(present[link])  # no snapshot between present and the target
+        if snap is None:
+            return present, True
+        if not snap:
+            absent_ts = target
+        elif snapshot_contains_event(snap, event_id):
+            present = snap
+            if offset >= max_span:
+                return present, True
+            offset = min(offset * 2, max_span)
+        else:
+            absent_ts = snap["timestamp"]
+
+    # binary search between the last snapshot with the event and absent_ts
+    while True:
+        inner = present.get(link)
+        if not inner:
+            return present, False
+        if not outward(absent_ts, inner):
+            return present, False  # nothing lies between present and absent_ts
+        lo, hi = sorted((_parse_ts(present["timestamp"]), _parse_ts(absent_ts)))
+        mid = _format_ts(lo + (hi - lo) / 2)
+        snap = lookup(mid)
+        if snap == {} and mid != absent_ts:
+            absent_ts = mid
+            continue
+        if snap is not None and not (snap and outward(snap["timestamp"], present["timestamp"])
+                                     and outward(absent_ts, snap["timestamp"])):
+            snap = lookup(inner)
+        if snap is None:
+            return present, True
+        if snapshot_contains_event(snap, event_id):
+            present = snap
+        else:
+            absent_ts = snap["timestamp"]
+
+def find_event_lifetime(event_id: str,
+                        anchor_timestamp: str,
+                        max_days: int = 7,
+                        first_step_minutes: int = 60,
+                        checkpoint: Optional[Checkpoint] = None) -> Optional[Dict[str, Any]]:
+    """
+    First and last snapshots listing the event, searched outward from a snapshot
+    that lists it (anchor_timestamp) up to max_days in each direction. Costs
+    O(log n) snapshot lookups per side rather than one per probe hour per day.
+    Assumes the event is listed continuously between its first and last snapshot.
+    """
+    calls = 0
+
+    def lookup(ts: str) -> Optional[Dict[str, Any]]:
+        nonlocal calls
+        calls += 1
+        snap = fetch_events_snapshot(ts, checkpoint)
+        if snap is not None and not snap.get("timestamp"):
+            return {}  # no snapshot at or before ts
+        return snap
+
+    anchor = lookup(anchor_timestamp)
+    if not anchor or not snapshot_contains_event(anchor, event_id):
+        print(f"[discover] Event not listed in the snapshot at {anchor_timestamp}; need an anchor that lists it.")
+        return None
+    max_span = datetime.timedelta(days=max_days)
+    step = datetime.timedelta(minutes=first_step_minutes)
+    first, first_bounded = _find_edge(event_id, anchor, "backward", max_span, step, lookup)
+    last, last_bounded = _find_edge(event_id, anchor, "forward", max_span, step, lookup)
+    result = {
+        "event_id": event_id,
+        "anchor_snapshot": anchor["timestamp"],
+        "first_snapshot": first["timestamp"],
+        "last_snapshot": last["timestamp"],
+        "first_bounded": first_bounded,
+        "last_bounded": last_bounded,
+        "snapshot_lookups": calls,
+    }
+    print(f"[discover] first={result['first_snapshot']}{' (bounded)' if first_bounded else ''} "
+          f"last={result['last_snapshot']}{' (bounded)' if last_bounded else ''} lookups={calls}")
+    return result
+# --------------------------------------------------------
+
+# ------------------ Async crawler ------------------
+class TokenBucket:
+    """
+    Async rate limiter: `rate` acquisitions per second on average, with bursts of
+    up to `capacity`. Waiters are served in arrival order. rate <= 0 disables it.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(self.rate, 1.0))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+class _Crawler:
+    """Shared client, limiter, concurrency cap and (optional) checkpoint and odds store for one crawl."""
+
+    def __init__(self, client: httpx.AsyncClient, limiter: TokenBucket, concurrency: int,
+                 checkpoint: Optional[Checkpoint] = None, store: Optional[OddsStore] = None):
+        self.client = client
+        self.limiter = limiter
+        self.slots = asyncio.Semaphore(max(concurrency, 1))
+        self.checkpoint = checkpoint
+        self.store = store
+
+    async def get(self, url: str, params: Dict[str, Any]) -> httpx.Response:
+        # mirrors the sync session's retry policy on throttling/gateway statuses
+        for attempt in range(settings.UPSTREAM_MAX_RETRIES + 1):
+            await self.limiter.acquire()
+            async with self.slots:
+                r = await self.client.get(url, params=params, timeout=10)
+            if r.status_code not in RETRY_STATUSES or attempt == settings.UPSTREAM_MAX_RETRIES:
+                return r
+            await asyncio.sleep(settings.UPSTREAM_BACKOFF_FACTOR * (2 ** attempt))
+        return r
+
+    async def events_snapshot(self, ts: str) -> Optional[Dict[str, Any]]:
+        cp = self.checkpoint
+        if cp is not None and ts in cp.snapshots:
+            return cp.snapshots[ts]
+        try:
+            r = await self.get(f"{_base_url()}/events", {"apiKey": ODDS_API_KEY, "date": ts})
+            r.raise_for_status()
+            payload = r.json()
+        except Exception as e:
+            print(f"[events] {ts} error: {e}")
+            return None
+        if cp is not None:
+            cp.put_snapshot(ts, payload)
+        return payload
+
+    async def event_odds(self, event_id: str, ts: str) -> Optional[Dict[str, Any]]:
+        cp = self.checkpoint
+        if cp is not None and cp.has_odds(event_id, ts):
+            return cp.odds[event_id][ts]
+        try:
+            r = await self.get(f"{_base_url()}/events/{event_id}/odds", _odds_params(ts))
+            if r.status_code == 404:
+                payload = None
+            else:
+                r.raise_for_status()
+                payload = r.json()
+        except Exception as e:
+            print(f"[odds] {ts} error: {e}")
+            return None
+        if payload and self.store is not None:
+            self.store.write_event_payload(payload)
+        if cp is not None:
+            cp.put_odds(event_id, ts, payload)
+        return payload
+
+    async def season_snapshot(self, ts: str) -> Optional[Dict[str, Any]]:
+        """Sport-wide odds at ts (every listed event, one request), compacted."""
+        cp = self.checkpoint
+        if cp is not None and ts in cp.season:
+            return cp.season[ts]
+        try:
+            r = await self.get(f"{_base_url()}/odds", _odds_params(ts))
+            r.raise_for_status()
+            payload = r.json()
+            record = extract_snapshot_h2h(payload)
+        except Exception as e:
+            print(f"[season] {ts} error: {e}")
+            return None
+        if self.store is not None:
+            self.store.write_sport_payload(payload)
+        if not record["timestamp"]:
+            print(f"[season] {ts} no snapshot")
+            return None
+        if cp is not None:
+            cp.put_season(ts, record)
+        return record
+
+async def crawl_snapshots_async(event_id: str,
+                                start_timestamp: str,
+                                max_back: int = 15,
+                                max_forward: int = 15,
+                                rate: float = CRAWL_RATE,
+                                burst: int = CRAWL_BURST,
+                                concurrency: int = CRAWL_CONCURRENCY,
+                                client: Optional[httpx.AsyncClient] = None,
+                                checkpoint: Optional[Checkpoint] = None,
+                                store: Optional[OddsStore] = None) -> List[Dict[str, Any]]:
+    """
+    Follow previous_timestamp / next_timestamp links from start_timestamp, up to
+    max_back / max_forward hops. After the origin snapshot the backward and forward
+    chains run concurrently, and each snapshot's odds request overlaps the next
+    snapshot fetch; all requests share one token bucket and concurrency cap.
+    Results match a one-at-a-time breadth-first walk, sorted by snapshot timestamp.
+
+    With a checkpoint, snapshots and odds fetched by earlier runs are replayed from
+    it instead of requested again, so a rerun walks the cached part of each chain
+    without requests and resumes fetching at the first uncached link.
+    With a store, every odds payload fetched is also written to the odds store.
+    """
+    own_client = client is None
+    if own_client:
+        client = create_async_client()
+    crawler = _Crawler(client, TokenBucket(rate, burst), concurrency, checkpoint, store)
+    visited = set()
+    # (hop, direction order, result): ties on snapshot timestamp keep breadth-first order
+    rows: List[Tuple[int, int, Dict[str, Any]]] = []
+    odds_tasks = []
 
     try:
         start_day = datetime.datetime.fromisoformat(start_timestamp.replace("Z","+00:00")).date()
@@ -161,21 +523,18 @@ def crawl_snapshots(event_id: str,
 
     crossed_previous_day = False
 
-    while queue:
-        ts, direction = queue.pop(0)
-        if ts in visited:
-            continue
-        snap = fetch_events_snapshot(ts)
-        visited[ts] = True
+    async def odds_for(result: Dict[str, Any], ts: str) -> None:
+        odds_payload = await crawler.event_odds(event_id, ts)
+        result["odds"] = extract_best_h2h(odds_payload) if odds_payload else None
+
+    async def visit(ts: str, direction: str, hop: int) -> Optional[Dict[str, Any]]:
+        nonlocal crossed_previous_day
+        visited.add(ts)
+        snap = await crawler.events_snapshot(ts)
         if snap is None:
-            continue
+            return None
 
         has_event = snapshot_contains_event(snap, event_id)
-        best_block = None
-        if has_event:
-            odds_payload = fetch_single_event_odds(event_id, ts)
-            best_block = extract_best_h2h(odds_payload) if odds_payload else None
-
         snapshot_ts = snap.get("timestamp", ts)
 
         if start_day:
@@ -187,30 +546,215 @@ def crawl_snapshots(event_id: str,
             except Exception:
                 pass
 
-        results.append({
+        result = {
             "snapshot_timestamp": snapshot_ts,
             "requested_timestamp": ts,
             "direction": direction,
             "previous_timestamp": snap.get("previous_timestamp"),
             "next_timestamp": snap.get("next_timestamp"),
             "event_present": has_event,
-            "odds": best_block
-        })
+            "odds": None
+        }
+        if has_event:
+            odds_tasks.append(asyncio.create_task(odds_for(result, ts)))
+        rows.append((hop, 0 if direction == "forward" else 1, result))
+        return snap
+
+    async def chain(ts: Optional[str], direction: str, link: str, limit: int) -> None:
+        hop = 1
+        while ts and hop <= limit and ts not in visited:
+            snap = await visit(ts, direction, hop)
+            if snap is None:
+                return
+            ts = snap.get(link)
+            hop += 1
+
+    try:
+        origin = await visit(start_timestamp, "origin", 0)
+        if origin is not None:
+            await asyncio.gather(
+                chain(origin.get("next_timestamp"), "forward", "next_timestamp", max_forward),
+                chain(origin.get("previous_timestamp"), "backward", "previous_timestamp", max_back),
+            )
+        await asyncio.gather(*odds_tasks)
+    finally:
+        if checkpoint is not None:
+            checkpoint.save()
+        if own_client:
+            await client.aclose()
+
+    rows.sort(key=lambda r: (r[0], r[1]))
+    results = [r[2] for r in rows]
+    results.sort(key=lambda r: r["snapshot_timestamp"])
+    return results
+
+def crawl_snapshots(event_id: str,
+                    start_timestamp: str,
+                    max_back: int = 15,
+                    max_forward: int = 15,
+                    rate: float = CRAWL_RATE,
+                    burst: int = CRAWL_BURST,
+                    concurrency: int = CRAWL_CONCURRENCY,
+                    checkpoint: Optional[Checkpoint] = None,
+                    store: Optional[OddsStore] = None) -> List[Dict[str, Any]]:
+    """Blocking entry point for crawl_snapshots_async (runs its own event loop)."""
+    return asyncio.run(crawl_snapshots_async(event_id, start_timestamp, max_back=max_back,
+                                             max_forward=max_forward, rate=rate, burst=burst,
+                                             concurrency=concurrency, checkpoint=checkpoint,
+                                             store=store))
+# ---------------------------------------------------
+
+# ------------------ Season (multi-event) crawl ------------------
+async def crawl_season_async(start_timestamp: str,
+                             end_timestamp: str,
+                             interval_minutes: int = 60,
+                             rate: float = CRAWL_RATE,
+                             burst: int = CRAWL_BURST,
+                             concurrency: int = CRAWL_CONCURRENCY,
+                             client: Optional[httpx.AsyncClient] = None,
+                             checkpoint: Optional[Checkpoint] = None,
+                             store: Optional[OddsStore] = None) -> List[Dict[str, Any]]:
+    """
+    Best h2h prices for every event across [start, end] from the sport-wide
+    historical /odds endpoint: one request per snapshot instead of an /events
+    call plus one /events/{id}/odds call per event.
+
+    interval_minutes > 0 samples the timeline at that spacing (requests are
+    independent, so they run concurrently under the limiter); 0 follows
+    next_timestamp links through every snapshot, one request after another.
+    Snapshots reached twice (gaps longer than the interval) are kept once.
+    With a store, every bookmaker's h2h prices for every event are written to it.
+    Returns one row per (snapshot, event), sorted by snapshot timestamp then event id.
+    """
+    own_client = client is None
+    if own_client:
+        client = create_async_client()
+    crawler = _Crawler(client, TokenBucket(rate, burst), concurrency, checkpoint, store)
+    end_dt = _parse_ts(end_timestamp)
+    records: List[Dict[str, Any]] = []
+
+    try:
+        if interval_minutes > 0:
+            step = datetime.timedelta(minutes=interval_minutes)
+            targets = []
+            t = _parse_ts(start_timestamp)
+            while t <= end_dt:
+                targets.append(_format_ts(t))
+                t += step
+            fetched = await asyncio.gather(*(crawler.season_snapshot(ts) for ts in targets))
+            records = [r for r in fetched if r is not None]
+        else:
+            ts: Optional[str] = start_timestamp
+            while ts and _parse_ts(ts) <= end_dt:
+                record = await crawler.season_snapshot(ts)
+                if record is None:
+                    break
+                records.append(record)
+                ts = record.get("next_timestamp")
+    finally:
+        if checkpoint is not None:
+            checkpoint.save()
+        if own_client:
+            await client.aclose()
+
+    rows = []
+    seen = set()
+    for record in records:
+        if record["timestamp"] in seen:
+            continue
+        seen.add(record["timestamp"])
+        for event_id, ev in record["events"].items():
+            rows.append({"event_id": event_id, "snapshot_timestamp": record["timestamp"], **ev})
+    rows.sort(key=lambda r: (r["snapshot_timestamp"], r["event_id"]))
+    return rows
+
+def crawl_season(start_timestamp: str,
+                 end_timestamp: str,
+                 interval_minutes: int = 60,
+                 rate: float = CRAWL_RATE,
+                 burst: int = CRAWL_BURST,
+                 concurrency: int = CRAWL_CONCURRENCY,
+                 checkpoint: Optional[Checkpoint] = None,
+                 store: Optional[OddsStore] = None) -> List[Dict[str, Any]]:
+    """Blocking entry point for crawl_season_async."""
+    return asyncio.run(crawl_season_async(start_timestamp, end_timestamp, interval_minutes=interval_minutes,
+                                          rate=rate, burst=burst, concurrency=concurrency,
+                                          checkpoint=checkpoint, store=store))
+
+def summarize_season(rows: List[Dict[str, Any]]):
+    by_event: Dict[str, List[Dict[str, Any]]] = {}
+    for r in rows:
+        by_event.setdefault(r["event_id"], []).append(r)
+    snapshots = {r["snapshot_timestamp"] for r in rows}
+    print("\n=== Season Coverage Summary ===")
+    print(f"Snapshots with events:   {len(snapshots)}")
+    print(f"Events seen:             {len(by_event)}")
+    for event_id, event_rows in sorted(by_event.items(), key=lambda kv: kv[1][0].get("commence_time") or ""):
+        with_odds = [r for r in event_rows if r.get("odds")]
+        prices = sorted({r["odds"]["best_price"] for r in with_odds})
+        first = event_rows[0]
+        print(f"  {event_id} {first.get('away_team')} @ {first.get('home_team')} ({first.get('commence_time')}): "
+              f"{len(event_rows)} snapshots, {len(with_odds)} with odds, {len(prices)} distinct best prices, "
+              f"{event_rows[0]['snapshot_timestamp']} .. {event_rows[-1]['snapshot_timestamp']}")
+
+def season_main(args: List[str]):
+    if len(args) < 2:
+        print("Usage: python -m backend.app.historcal_coverage --season <START_TIMESTAMP> <END_TIMESTAMP> "
+              "[--interval-minutes N] [--json out.json] "
+              "[--rate R] [--burst B] [--concurrency C] [--checkpoint state.json] [--store odds.sqlite3]")
+        print("Example:")
+        print("  python -m backend.app.historcal_coverage --season 2024-09-01T00:00:00Z 2025-02-10T00:00:00Z "
+              "--interval-minutes 360 --checkpoint season.json --json season.json")
+        sys.exit(1)
 
-        prev_ts = snap.get("previous_timestamp")
-        next_ts = snap.get("next_timestamp")
+    start_ts = args[0].strip()
+    end_ts = args[1].strip()
+    interval_minutes = 60
+    out_path = None
+    rate = CRAWL_RATE
+    burst = CRAWL_BURST
+    concurrency = CRAWL_CONCURRENCY
+    checkpoint_path = None
+    store_path = settings.ODDS_STORE_PATH
 
-        if direction in ("origin", "forward") and fwd_count < max_forward and next_ts:
-            enqueue(next_ts, "forward")
-            fwd_count += 1
-        if direction in ("origin", "backward") and back_count < max_back and prev_ts:
-            enqueue(prev_ts, "backward")
-            back_count += 1
+    args = args[2:]
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        if arg == "--interval-minutes" and i + 1 < len(args):
+            interval_minutes = int(args[i+1]); i += 2
+        elif arg == "--json" and i + 1 < len(args):
+            out_path = args[i+1]; i += 2
+        elif arg == "--rate" and i + 1 < len(args):
+            rate = float(args[i+1]); i += 2
+        elif arg == "--burst" and i + 1 < len(args):
+            burst = int(args[i+1]); i += 2
+        elif arg == "--concurrency" and i + 1 < len(args):
+            concurrency = int(args[i+1]); i += 2
+        elif arg == "--checkpoint" and i + 1 < len(args):
+            checkpoint_path = args[i+1]; i += 2
+        elif arg == "--store" and i + 1 < len(args):
+            store_path = args[i+1]; i += 2
+        else:
+            i += 1
 
-        time.sleep(sleep_sec)
+    print(f"[season] start={start_ts} end={end_ts} interval_minutes={interval_minutes}")
+    checkpoint = Checkpoint(checkpoint_path) if checkpoint_path else None
+    store = OddsStore(store_path) if store_path else None
+    try:
+        rows = crawl_season(start_ts, end_ts, interval_minutes=interval_minutes, rate=rate, burst=burst,
+                            concurrency=concurrency, checkpoint=checkpoint, store=store)
+    finally:
+        if checkpoint is not None:
+            checkpoint.save()
+            print(f"[checkpoint] Saved {checkpoint.path}")
+    summarize_season(rows)
 
-    results.sort(key=lambda r: r["snapshot_timestamp"])
-    return results
+    if out_path:
+        with open(out_path, "w") as f:
+            json.dump(rows, f, indent=2)
+        print(f"Wrote JSON: {out_path}")
+# ----------------------------------------------------------------
 
 def summarize(results: List[Dict[str, Any]]):
     present = [r for r in results if r["event_present"]]
@@ -232,14 +776,26 @@ def summarize(results: List[Dict[str, Any]]):
         print(f"  Best price: {last['odds']['best_price']} ({last['odds']['best_team']}) via {last['odds']['best_bookmaker']}")
 
 def main():
+    if not ODDS_API_KEY:
+        print("ERROR: ODDS_API_KEY not set in environment.")
+        sys.exit(1)
+
+    if len(sys.argv) > 1 and sys.argv[1] == "--season":
+        season_main(sys.argv[2:])
+        return
+
     if len(sys.argv) < 3:
-        print("Usage: python historcal_coverage.py <EVENT_ID> <START_SNAPSHOT_TIMESTAMP> "
+        print("Usage: python -m backend.app.historcal_coverage <EVENT_ID> <START_SNAPSHOT_TIMESTAMP> "
               "[--max-back N] [--max-forward N] [--json out.json] "
-              "[--probe-prev] [--probe-hours h1,h2,...] "
+              "[--rate R] [--burst B] [--concurrency C] [--checkpoint state.json] [--store odds.sqlite3] "
+              "[--probe-prev] [--probe-hours h1,h2,...] [--discover] "
               "[--multi-day-prev] [--max-prev-days D]")
+        print("       python -m backend.app.historcal_coverage --season <START_TIMESTAMP> <END_TIMESTAMP> ...")
         print("Example:")
-        print("  python historcal_coverage.py 3fd7cba821568399920fcea4dadad30d 2025-02-09T22:25:38Z "
+        print("  python -m backend.app.historcal_coverage 3fd7cba821568399920fcea4dadad30d 2025-02-09T22:25:38Z "
               "--probe-prev --probe-hours 10,12,14,16,18,20,22 --max-back 120 --json coverage.json")
+        print("  python -m backend.app.historcal_coverage 3fd7cba821568399920fcea4dadad30d 2025-02-09T22:25:38Z "
+              "--discover --max-prev-days 14 --max-forward 0 --checkpoint crawl.json")
         sys.exit(1)
 
     event_id = sys.argv[1].strip()
@@ -249,9 +805,15 @@ def main():
     max_forward = 15
     out_path = None
     do_probe = False
+    discover = False
     multi_day_prev = False        # <-- ADDED
     max_prev_days = 7             # <-- ADDED (limit how many days to chain)
     probe_hours = [12, 16, 18, 20, 22]
+    rate = CRAWL_RATE
+    burst = CRAWL_BURST
+    concurrency = CRAWL_CONCURRENCY
+    checkpoint_path = None
+    store_path = settings.ODDS_STORE_PATH
 
     args = sys.argv[3:]
     i = 0
@@ -265,6 +827,8 @@ def main():
             out_path = args[i+1]; i += 2
         elif arg == "--probe-prev":
             do_probe = True; i += 1
+        elif arg == "--discover":
+            discover = True; i += 1
         elif arg == "--probe-hours" and i + 1 < len(args):
             probe_hours = [int(h.strip()) for h in args[i+1].split(",") if h.strip().isdigit()]
             i += 2
@@ -272,31 +836,57 @@ def main():
             multi_day_prev = True; i += 1
         elif arg == "--max-prev-days" and i + 1 < len(args):  # <-- ADDED
             max_prev_days = int(args[i+1]); i += 2
+        elif arg == "--rate" and i + 1 < len(args):
+            rate = float(args[i+1]); i += 2
+        elif arg == "--burst" and i + 1 < len(args):
+            burst = int(args[i+1]); i += 2
+        elif arg == "--concurrency" and i + 1 < len(args):
+            concurrency = int(args[i+1]); i += 2
+        elif arg == "--checkpoint" and i + 1 < len(args):
+            checkpoint_path = args[i+1]; i += 2
+        elif arg == "--store" and i + 1 < len(args):
+            store_path = args[i+1]; i += 2
         else:
             i += 1
 
     print(f"[run] event_id={event_id} start={start_ts} max_back={max_back} max_forward={max_forward} "
-          f"probe={do_probe} multi_day_prev={multi_day_prev} max_prev_days={max_prev_days}")
-
-    if do_probe:
-        if multi_day_prev:
-            # Continuous multi-day probing
-            earliest = deep_probe_previous_days(event_id, start_ts, probe_hours, max_prev_days)
-            if earliest != start_ts:
-                print(f"[run] Multi-day earliest start identified: {earliest}")
-                start_ts = earliest
-            else:
-                print("[run] No earlier day snapshots discovered via deep probe.")
-        else:
-            # Single previous-day probe only
-            found_prev_ts = probe_previous_day(event_id, start_ts, probe_hours)
-            if found_prev_ts:
-                print(f"[run] Using previous-day found snapshot as new start: {found_prev_ts}")
-                start_ts = found_prev_ts
-            else:
-                print("[run] No previous-day presence detected (continuing with original start).")
+          f"probe={do_probe} discover={discover} multi_day_prev={multi_day_prev} max_prev_days={max_prev_days}")
 
-    results = crawl_snapshots(event_id, start_ts, max_back=max_back, max_forward=max_forward)
+    checkpoint = Checkpoint(checkpoint_path) if checkpoint_path else None
+    store = OddsStore(store_path) if store_path else None
+    try:
+        if discover:
+            # Galloping + binary search for the first snapshot listing the event
+            lifetime = find_event_lifetime(event_id, start_ts, max_prev_days, checkpoint=checkpoint)
+            if lifetime:
+                print(f"[run] Event listed {lifetime['first_snapshot']} .. {lifetime['last_snapshot']}; "
+                      f"starting from the first snapshot.")
+                start_ts = lifetime["first_snapshot"]
+        elif do_probe:
+            if multi_day_prev:
+                # Continuous multi-day probing
+                earliest = deep_probe_previous_days(event_id, start_ts, probe_hours, max_prev_days, checkpoint)
+                if earliest != start_ts:
+                    print(f"[run] Multi-day earliest start identified: {earliest}")
+                    start_ts = earliest
+                else:
+                    print("[run] No earlier day snapshots discovered via deep probe.")
+            else:
+                # Single previous-day probe only
+                found_prev_ts = probe_previous_day(event_id, start_ts, probe_hours, checkpoint)
+                if found_prev_ts:
+                    print(f"[run] Using previous-day found snapshot as new start: {found_prev_ts}")
+                    start_ts = found_prev_ts
+                else:
+                    print("[run] No previous-day presence detected (continuing with original start).")
+
+        results = crawl_snapshots(event_id, start_ts, max_back=max_back, max_forward=max_forward,
+                                  rate=rate, burst=burst, concurrency=concurrency, checkpoint=checkpoint,
+                                  store=store)
+    finally:
+        if checkpoint is not None:
+            checkpoint.save()
+            print(f"[checkpoint] Saved {checkpoint.path}")
     summarize(results)
 
     if out_path:
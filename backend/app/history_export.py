@@ -0,0 +1,176 @@
+"""
+Streaming export of comparison history as NDJSON or CSV.
+
+Rows come from crud.history.iter_history (a server-side cursor read in
+yield_per batches) and are encoded one at a time, so memory use does not grow
+with the table. CSV flattens the nested payload/result documents into fixed
+columns; NDJSON keeps the documents as stored.
+
+Served by GET /api/v1/compare/history/export and usable from the shell for the
+nightly dump:
+
+    python -m backend.app.history_export --format csv --output history.csv
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import io
+import json
+import sys
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator
+
+EXPORT_FORMATS = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+CSV_COLUMNS = [
+    "id",
+    "created_at",
+    "equity_symbol",
+    "equity_weight",
+    "starting_capital",
+    "league",
+    "event_id",
+    "outcome",
+    "stake",
+    "start",
+    "end",
+    "odds_date",
+    "resolved_odds",
+    "fallback_used",
+    "equity_allocated",
+    "equity_pnl",
+    "equity_final",
+    "bet_allocated",
+    "bet_pnl",
+    "bet_final",
+    "combined_final",
+    "roi_pct",
+    "notes",
+]
+
+
+def _iso(value: datetime | None) -> str | None:
+    return value.isoformat() if value is not None else None
+
+
+def flatten_row(row: Any) -> Dict[str, Any]:
+    """One history row -> the flat CSV_COLUMNS mapping (missing fields become None)."""
+    payload = row.payload or {}
+    result = row.result or {}
+    params = row.params or {}
+    bet_in = payload.get("bet") or {}
+    equity = result.get("equity") or {}
+    bet = result.get("bet") or {}
+    meta = result.get("odds_meta") or {}
+    return {
+        "id": str(row.id),
+        "created_at": _iso(row.created_at),
+        "equity_symbol": payload.get("equity_symbol"),
+        "equity_weight": payload.get("equity_weight"),
+        "starting_capital": payload.get("starting_capital"),
+        "league": bet_in.get("league"),
+        "event_id": bet_in.get("event_id"),
+        "outcome": bet_in.get("outcome"),
+        "stake": bet_in.get("stake"),
+        "start": params.get("start"),
+        "end": params.get("end"),
+        "odds_date": params.get("odds_date"),
+        "resolved_odds": meta.get("resolved_odds"),
+        "fallback_used": meta.get("fallback_used"),
+        "equity_allocated": equity.get("allocated"),
+        "equity_pnl": equity.get("pnl"),
+        "equity_final": equity.get("final"),
+        "bet_allocated": bet.get("allocated"),
+        "bet_pnl": bet.get("pnl"),
+        "bet_final": bet.get("final"),
+        "combined_final": result.get("combined_final"),
+        "roi_pct": result.get("roi_pct"),
+        "notes": row.notes,
+    }
+
+
+def iter_ndjson(rows: Iterable[Any]) -> Iterator[str]:
+    for row in rows:
+        yield json.dumps({
+            "id": str(row.id),
+            "created_at": _iso(row.created_at),
+            "payload": row.payload,
+            "result": row.result,
+            "params": row.params,
+            "notes": row.notes,
+        }, separators=(",", ":")) + "\n"
+
+
+def iter_csv(rows: Iterable[Any]) -> Iterator[str]:
+    buf = io.StringIO()
+    writer = csv.DictWriter(buf, fieldnames=CSV_COLUMNS)
+    writer.writeheader()
+    for row in rows:
+        writer.writerow(flatten_row(row))
+        # hand back whatever the writer produced and reuse the buffer
+        yield buf.getvalue()
+        buf.seek(0)
+        buf.truncate()
+    if buf.tell():
+        yield buf.getvalue()
+
+
+def iter_export(rows: Iterable[Any], fmt: str) -> Iterator[str]:
+    if fmt == "ndjson":
+        return iter_ndjson(rows)
+    if fmt == "csv":
+        return iter_csv(rows)
+    raise ValueError(f"unsupported export format: {fmt}")
+
+
+def stream_history(session_factory, fmt: str, batch_size: int = 1000, **filters) -> Iterator[str]:
+    """Encoded export chunks; the session lives exactly as long as the iteration."""
+    from backend.app.crud import history as history_crud
+
+    db = session_factory()
+    try:
+        yield from iter_export(history_crud.iter_history(db, batch_size=batch_size, **filters), fmt)
+    finally:
+        db.close()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Export comparison history as NDJSON or CSV")
+    parser.add_argument("--format", choices=sorted(EXPORT_FORMATS), default="ndjson")
+    parser.add_argument("--output", "-o", default="-", help="file path (default: stdout)")
+    parser.add_argument("--batch-size", type=int, default=1000, help="rows fetched per cursor round trip")
+    parser.add_argument("--symbol")
+    parser.add_argument("--event-id")
+    parser.add_argument("--outcome", choices=["win", "loss"])
+    parser.add_argument("--created-from", type=datetime.fromisoformat, help="inclusive ISO date/time")
+    parser.add_argument("--created-to", type=datetime.fromisoformat, help="exclusive ISO date/time")
+    parser.add_argument("--roi-min", type=float, help="minimum roi_pct (inclusive)")
+    parser.add_argument("--roi-max", type=float, help="maximum roi_pct (inclusive)")
+    args = parser.parse_args(argv)
+
+    from backend.app.db.session import SessionLocal
+
+    chunks = stream_history(
+        SessionLocal,
+        args.format,
+        batch_size=args.batch_size,
+        symbol=args.symbol,
+        event_id=args.event_id,
+        outcome=args.outcome,
+        created_from=args.created_from,
+        created_to=args.created_to,
+        roi_min=args.roi_min,
+        roi_max=args.roi_max,
+    )
+    out = sys.stdout if args.output == "-" else open(args.output, "w", newline="", encoding="utf-8")
+    try:
+        for chunk in chunks:
+            out.write(chunk)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
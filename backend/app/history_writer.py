@@ -0,0 +1,221 @@
+"""
+Background batched writer for comparison history.
+
+/compare handlers enqueue history rows on a bounded in-process queue and return;
+a worker thread drains the queue and writes multi-row INSERTs whenever a batch
+fills up (HISTORY_BATCH_SIZE) or the oldest queued row has waited
+HISTORY_FLUSH_INTERVAL_SEC. When the queue is full, submit() blocks for up to
+HISTORY_ENQUEUE_TIMEOUT_SEC (backpressure) and then drops the row with a
+warning; submit_many() gives the whole batch that one timeout. main.lifespan starts the writer and drains it on shutdown; without a
+running writer callers fall back to writing inline.
+"""
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List
+
+from backend.app.config import settings
+from backend.app.metrics import HISTORY_FLUSH_SECONDS
+from backend.app.tracing import span
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+def _flush_to_db(rows: List[Dict[str, Any]]) -> None:
+    # imported lazily, like the history route: DB settings may be missing
+    from backend.app.db.session import SessionLocal
+    from backend.app.crud import history as history_crud
+
+    db = SessionLocal()
+    try:
+        history_crud.create_history_bulk(db, rows)
+    finally:
+        db.close()
+
+
+class HistoryWriter:
+    def __init__(
+        self,
+        flush_fn: Callable[[List[Dict[str, Any]]], None] = _flush_to_db,
+        maxsize: int = 10000,
+        batch_size: int = 500,
+        flush_interval: float = 0.5,
+        enqueue_timeout: float = 0.5,
+    ):
+        self._flush_fn = flush_fn
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=maxsize)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.enqueue_timeout = enqueue_timeout
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self.enqueued = 0
+        self.dropped = 0
+        self.written = 0
+        self.failed = 0
+        self.flushes = 0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+        self._total_flush_ms = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._thread = threading.Thread(target=self._run, name="history-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, row: Dict[str, Any]) -> bool:
+        """Queue one row; False if it was dropped because the queue stayed full."""
+        try:
+            self._queue.put(row, timeout=self.enqueue_timeout)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            logger.warning("history queue full (%d); row dropped", self._queue.maxsize)
+            return False
+        with self._lock:
+            self.enqueued += 1
+        return True
+
+    def submit_many(self, rows: List[Dict[str, Any]]) -> int:
+        """
+        Queue rows under one shared enqueue_timeout deadline; once it has passed,
+        remaining rows are only queued if there is room right away. Returns the
+        number queued; the rest are counted as dropped.
+        """
+        deadline = time.monotonic() + self.enqueue_timeout
+        queued = 0
+        for row in rows:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining > 0:
+                    self._queue.put(row, timeout=remaining)
+                else:
+                    self._queue.put_nowait(row)
+            except queue.Full:
+                continue
+            queued += 1
+        dropped = len(rows) - queued
+        with self._lock:
+            self.enqueued += queued
+            self.dropped += dropped
+        if dropped:
+            logger.warning("history queue full (%d); %d of %d rows dropped", self._queue.maxsize, dropped, len(rows))
+        return queued
+
+    def stop(self, timeout: float | None = None) -> None:
+        """Flush everything queued so far, then stop the worker."""
+        if not self.running:
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            logger.warning("history writer did not drain within %ss; %d rows pending", timeout, self._queue.qsize())
+        self._thread = None
+
+    def _run(self) -> None:
+        batch: List[Dict[str, Any]] = []
+        deadline = None
+        while True:
+            wait = None if deadline is None else max(deadline - time.monotonic(), 0)
+            try:
+                item = self._queue.get(timeout=wait)
+            except queue.Empty:
+                item = None
+            if item is _STOP:
+                # drain whatever arrived before the stop marker
+                if batch:
+                    self._flush(batch)
+                return
+            if item is not None:
+                batch.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+            if batch and (len(batch) >= self.batch_size or time.monotonic() >= deadline):
+                self._flush(batch)
+                batch = []
+                deadline = None
+
+    def _flush(self, batch: List[Dict[str, Any]]) -> None:
+        t0 = time.perf_counter()
+        try:
+            with span("history.flush", rows=len(batch)):
+                self._flush_fn(batch)
+            ok = True
+        except Exception as e:
+            ok = False
+            logger.warning("history batch save failed (%d rows): %s", len(batch), e)
+        elapsed = time.perf_counter() - t0
+        HISTORY_FLUSH_SECONDS.observe(elapsed)
+        elapsed_ms = elapsed * 1000
+        with self._lock:
+            self.flushes += 1
+            if ok:
+                self.written += len(batch)
+            else:
+                self.failed += len(batch)
+            self.last_flush_ms = elapsed_ms
+            self.max_flush_ms = max(self.max_flush_ms, elapsed_ms)
+            self._total_flush_ms += elapsed_ms
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "running": self.running,
+                "queue_depth": self._queue.qsize(),
+                "queue_maxsize": self._queue.maxsize,
+                "enqueued": self.enqueued,
+                "dropped": self.dropped,
+                "written": self.written,
+                "failed": self.failed,
+                "flushes": self.flushes,
+                "last_flush_ms": round(self.last_flush_ms, 3),
+                "avg_flush_ms": round(self._total_flush_ms / self.flushes, 3) if self.flushes else 0.0,
+                "max_flush_ms": round(self.max_flush_ms, 3),
+            }
+
+
+_writer: HistoryWriter | None = None
+
+
+def get_history_writer() -> HistoryWriter | None:
+    """The running writer, or None (callers then save inline)."""
+    if _writer is not None and _writer.running:
+        return _writer
+    return None
+
+
+def start_history_writer() -> HistoryWriter | None:
+    global _writer
+    if not settings.HISTORY_WRITER_ENABLED:
+        return None
+    _writer = HistoryWriter(
+        maxsize=settings.HISTORY_QUEUE_MAXSIZE,
+        batch_size=settings.HISTORY_BATCH_SIZE,
+        flush_interval=settings.HISTORY_FLUSH_INTERVAL_SEC,
+        enqueue_timeout=settings.HISTORY_ENQUEUE_TIMEOUT_SEC,
+    )
+    _writer.start()
+    return _writer
+
+
+def stop_history_writer() -> None:
+    global _writer
+    if _writer is not None:
+        _writer.stop(timeout=settings.HISTORY_DRAIN_TIMEOUT_SEC)
+        _writer = None
+
+
+def history_writer_stats() -> Dict[str, Any]:
+    if _writer is None:
+        return {"running": False}
+    return _writer.stats()
@@ -2,14 +2,21 @@ from contextlib import asynccontextmanager
 import os
 import socket
 from urllib.parse import urlparse
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
 from backend.app.api.v1.compare import router as compare_router
 from backend.app.api.v1.nfl_events import router as nfl_events_router
+from backend.app.api.v1.stats import router as stats_router
 from .db.init_db import init_db
+from .upstream import open_async_client, close_async_client, close_sessions
+from .history_writer import start_history_writer, stop_history_writer
+from . import metrics, tracing
+from .config import settings
 
 load_dotenv()  # Loads variables from .env
+tracing.configure_logging()  # app log lines carry trace=<id> span=<id> (LOG_FORMAT)
 
 def validate_env(required: list[str]) -> None:
     missing = [k for k in required if not os.getenv(k)]
@@ -38,8 +45,14 @@ async def lifespan(app: FastAPI):
     # Startup: validate env and fail fast if something is wrong
     validate_env(["ALPACA_API_KEY", "ALPACA_API_SECRET", "ALPACA_BASE_URL", "DATABASE_URL"])
     init_db()
+    open_async_client()
+    start_history_writer()
     yield
-    # Shutdown (optional cleanup)
+    # Shutdown: drain queued history rows, release pooled upstream connections
+    await run_in_threadpool(stop_history_writer)
+    await close_async_client()
+    close_sessions()
+    tracing.shutdown()
 
 app = FastAPI(title="Stake N' Shares — MDM", lifespan=lifespan)
 app.add_middleware(
@@ -47,7 +60,20 @@ app.add_middleware(
     allow_origins=["http://localhost:5173"],
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "Link", "X-Trace-Id", "X-Result-Cache"],
 )
 
+if settings.METRICS_ENABLED:
+    app.add_middleware(metrics.MetricsMiddleware)
+
+    @app.get("/metrics", include_in_schema=False)
+    def metrics_endpoint():
+        """Prometheus text exposition: stage latencies, upstream statuses, fallbacks, DB pool."""
+        return Response(metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+# added last = outermost: every request (and the metrics middleware) runs inside its trace
+app.add_middleware(tracing.TracingMiddleware)
+
 app.include_router(compare_router, prefix="/api/v1")
 app.include_router(nfl_events_router, prefix="/api/v1")
+app.include_router(stats_router, prefix="/api/v1")
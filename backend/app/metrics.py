@@ -0,0 +1,273 @@
+"""
+In-process metrics with Prometheus text exposition, served at GET /metrics.
+
+Counters and histograms are plain dicts of label tuples behind one lock each;
+recording is a perf_counter pair, a bisect and a locked increment, so they can
+sit on the /compare hot path. Values that already live elsewhere (DB pool,
+lookup caches, history writer queue) are read at scrape time by collectors
+instead of being mirrored on every request.
+
+    with stage_timer("execute"):
+        result = execute_compare(req)
+"""
+from __future__ import annotations
+
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterator, List, Sequence, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# seconds; upstream calls dominate, in-process stages land in the first buckets
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_registry: List["_Metric"] = []
+_collectors: List[Callable[[], Iterator[str]]] = []
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _fmt(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(n, "")) for n in self.labelnames)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return self.header() + [f"{self.name}{_labels(self.labelnames, k)} {_fmt(v)}" for k, v in items]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # label key -> [per-bucket counts (+Inf last), sum, count]
+        self._values: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        idx = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][idx] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def time(self, **labels: str) -> "_Timer":
+        return _Timer(self, labels)
+
+    def count(self, **labels: str) -> int:
+        with self._lock:
+            entry = self._values.get(self._key(labels))
+            return entry[2] if entry else 0
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted((k, (list(v[0]), v[1], v[2])) for k, v in self._values.items())
+        lines = self.header()
+        for key, (counts, total, n) in items:
+            cumulative = 0
+            for bound, c in zip(self.buckets + (float("inf"),), counts):
+                cumulative += c
+                le = 'le="' + _fmt(bound) + '"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {_fmt(total)}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {n}")
+        return lines
+
+
+class _Timer:
+    # slotted class instead of @contextmanager: no generator frame per timed block
+    __slots__ = ("_hist", "_labels", "_t0")
+
+    def __init__(self, hist: Histogram, labels: Dict[str, str]):
+        self._hist = hist
+        self._labels = labels
+
+    def __enter__(self) -> None:
+        self._t0 = time.perf_counter()
+
+    def __exit__(self, *exc) -> None:
+        self._hist.observe(time.perf_counter() - self._t0, **self._labels)
+
+
+def register_collector(fn: Callable[[], Iterator[str]]) -> Callable[[], Iterator[str]]:
+    """fn yields exposition lines at scrape time; failures are skipped, never raised."""
+    _collectors.append(fn)
+    return fn
+
+
+def gauge_lines(name: str, help: str, samples: Dict[Tuple[Tuple[str, str], ...], float]) -> Iterator[str]:
+    yield f"# HELP {name} {help}"
+    yield f"# TYPE {name} gauge"
+    for labels, value in samples.items():
+        yield f"{name}{_labels([k for k, _ in labels], [v for _, v in labels])} {_fmt(value)}"
+
+
+def render() -> str:
+    lines: List[str] = []
+    for metric in _registry:
+        lines.extend(metric.render())
+    for collector in _collectors:
+        try:
+            lines.extend(list(collector()))
+        except Exception:
+            continue
+    return "\n".join(lines) + "\n"
+
+
+def reset() -> None:
+    for metric in _registry:
+        metric.reset()
+
+
+# --- application metrics ---------------------------------------------------
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds", "API request latency by route template", ["method", "route", "status"]
+)
+COMPARE_STAGE_SECONDS = Histogram(
+    "compare_stage_duration_seconds",
+    "Latency of each /compare stage (validate, cache_lookup, equity_fetch, odds_fetch, execute, history_write)",
+    ["stage"],
+)
+UPSTREAM_RESPONSES = Counter("upstream_responses_total", "Upstream HTTP responses by host and status code", ["host", "status"])
+UPSTREAM_ERRORS = Counter("upstream_errors_total", "Upstream fetches that raised before a usable response", ["kind"])
+FALLBACKS = Counter("compare_fallbacks_total", "Compare legs that fell back to a default value", ["kind"])
+HISTORY_FLUSH_SECONDS = Histogram("history_flush_duration_seconds", "Background history writer batch insert latency")
+
+
+def stage_timer(stage: str):
+    return COMPARE_STAGE_SECONDS.time(stage=stage)
+
+
+def count_upstream_response(host: str, status: int) -> None:
+    UPSTREAM_RESPONSES.inc(host=host, status=str(status))
+
+
+@register_collector
+def _db_pool_lines() -> Iterator[str]:
+    from backend.app.db.session import engine
+
+    pool = engine.pool
+    if not hasattr(pool, "checkedout"):
+        return
+    yield from gauge_lines("db_pool_connections", "SQLAlchemy pool connections by state", {
+        (("state", "checked_out"),): pool.checkedout(),
+        (("state", "checked_in"),): pool.checkedin(),
+        (("state", "overflow"),): pool.overflow(),
+    })
+    yield from gauge_lines("db_pool_size", "Configured SQLAlchemy pool size", {(): pool.size()})
+
+
+@register_collector
+def _cache_lines() -> Iterator[str]:
+    from backend.app.cache import cache_stats
+
+    stats = cache_stats()
+    for field in ("hits", "disk_hits", "misses", "evictions", "size"):
+        yield from gauge_lines(f"lookup_cache_{field}", f"Lookup cache {field} (see /api/v1/stats/cache)", {
+            (("cache", name),): s[field] for name, s in stats.items()
+        })
+
+
+@register_collector
+def _history_writer_lines() -> Iterator[str]:
+    from backend.app.history_writer import history_writer_stats
+
+    stats = history_writer_stats()
+    if not stats.get("running"):
+        return
+    for field in ("queue_depth", "enqueued", "dropped", "written", "failed"):
+        yield from gauge_lines(f"history_writer_{field}", f"History writer {field}", {(): stats[field]})
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware timing each HTTP request into http_request_duration_seconds.
+    Labelled by route template (not raw path) so label cardinality stays bounded.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        status = "500"
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+            await send(message)
+
+        t0 = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            HTTP_REQUEST_SECONDS.observe(
+                time.perf_counter() - t0,
+                method=scope["method"],
+                route=getattr(route, "path", "unmatched"),
+                status=status,
+            )
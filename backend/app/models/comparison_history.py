@@ -1,14 +1,37 @@
 import uuid
-from sqlalchemy import Column, DateTime, JSON, Text, func
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, Computed, DateTime, Float, Index, JSON, Text, func
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 from backend.app.db.base import Base
 
+# JSONB on Postgres (matches the migrations), plain JSON elsewhere (SQLite in tests/dev)
+JSONType = JSON().with_variant(JSONB(), "postgresql")
+
 class ComparisonHistory(Base):
     __tablename__ = "comparison_history"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
-    payload = Column(JSON, nullable=False)
-    result = Column(JSON, nullable=False)
-    params = Column(JSON, nullable=True)
-    notes = Column(Text, nullable=True)
\ No newline at end of file
+    payload = Column(JSONType, nullable=False)
+    result = Column(JSONType, nullable=False)
+    params = Column(JSONType, nullable=True)
+    notes = Column(Text, nullable=True)
+    # content hash of the request (result_cache.request_hash); only set on replayable results
+    request_hash = Column(Text, nullable=True)
+
+    # stored generated columns over the JSON documents so history can be filtered by index
+    # (see db/migrations/0003_history_filter_columns.sql); `->>` works on Postgres and SQLite >= 3.38
+    equity_symbol = Column(Text, Computed("payload ->> 'equity_symbol'", persisted=True))
+    event_id = Column(Text, Computed("payload -> 'bet' ->> 'event_id'", persisted=True))
+    outcome = Column(Text, Computed("payload -> 'bet' ->> 'outcome'", persisted=True))
+    roi_pct = Column(Float, Computed("CAST(result ->> 'roi_pct' AS DOUBLE PRECISION)", persisted=True))
+
+    __table_args__ = (
+        # keyset pagination order (see db/migrations/0002_history_keyset_index.sql)
+        Index("ix_comparison_history_created_at_id", created_at.desc(), id.desc()),
+        # filtered pages keep the keyset order after the equality prefix
+        Index("ix_comparison_history_symbol_created_at", equity_symbol, created_at.desc(), id.desc()),
+        Index("ix_comparison_history_event_created_at", event_id, created_at.desc(), id.desc()),
+        Index("ix_comparison_history_roi_pct", roi_pct),
+        # result cache lookups (see db/migrations/0004_history_request_hash.sql)
+        Index("ix_comparison_history_request_hash", request_hash, created_at.desc()),
+    )
@@ -0,0 +1,249 @@
+"""
+Local odds time-series store.
+
+One SQLite file with a row per (event_id, snapshot_ts, bookmaker, outcome, price),
+snapshot_ts in unix seconds. "Best h2h price for event X as of time T" loads
+the event's timeline once (snapshot times and the best price at each, sorted)
+and answers every later lookup with a bisect over it; the cached timeline is
+dropped when the file changes.
+
+The store is filled by coverage crawls (historcal_coverage --store PATH, per event
+or --season), and fetch_nfl_moneyline_odds consults it first when ODDS_STORE_PATH
+is set. The historical endpoint answers a request for T with the latest snapshot
+at or before T, so a lookup is answered locally only when it would get the same
+snapshot: the event's latest stored snapshot S <= T is exactly T, or S was stored
+with its next_timestamp link and that link is after T. Otherwise the caller goes
+to the network as before. ODDS_STORE_MAX_STALENESS_SEC > 0 additionally accepts
+any S within that many seconds of T, trading exact parity with live lookups (and
+with memoized /compare results) for fewer requests; the default 0 keeps parity.
+
+    python -m backend.app.odds_store stats
+    python -m backend.app.odds_store lookup <EVENT_ID> 2025-02-09T22:25:38Z
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sqlite3
+import threading
+from bisect import bisect_right
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Tuple
+
+from backend.app.cache import NOT_COVERED
+from backend.app.config import settings
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS odds_quotes (
+    event_id    TEXT    NOT NULL,
+    snapshot_ts INTEGER NOT NULL,
+    bookmaker   TEXT    NOT NULL,
+    outcome     TEXT    NOT NULL,
+    price       REAL    NOT NULL,
+    PRIMARY KEY (event_id, snapshot_ts, bookmaker, outcome)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS odds_snapshots (
+    snapshot_ts INTEGER PRIMARY KEY,
+    next_ts     INTEGER
+);
+"""
+
+Quote = Tuple[str, int, str, str, float]
+
+
+def to_epoch(ts: str) -> int:
+    """ISO8601 timestamp (or YYYY-MM-DD, read as midnight UTC) to unix seconds."""
+    dt = datetime.fromisoformat(ts.strip().replace("Z", "+00:00"))
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp())
+
+
+def quotes_from_event(event_id: str, snapshot_ts: str, event_obj: Dict[str, Any]) -> List[Quote]:
+    """h2h rows for one event object (the `data` of an event-odds payload, or one entry of a sport-wide one)."""
+    at = to_epoch(snapshot_ts)
+    rows = []
+    for bk in event_obj.get("bookmakers") or []:
+        for m in bk.get("markets") or []:
+            if m.get("key") != "h2h":
+                continue
+            for o in m.get("outcomes") or []:
+                price = o.get("price")
+                if isinstance(price, (int, float)) and bk.get("key") and o.get("name"):
+                    rows.append((event_id, at, bk["key"], o["name"], float(price)))
+    return rows
+
+
+def _links(payload: Dict[str, Any]) -> List[Tuple[int, int | None]]:
+    """(snapshot_ts, next_ts) for a historical payload; next_ts is None when it has no usable next_timestamp."""
+    try:
+        nxt = to_epoch(payload["next_timestamp"]) if payload.get("next_timestamp") else None
+    except ValueError:
+        nxt = None
+    return [(to_epoch(payload["timestamp"]), nxt)]
+
+
+class OddsStore:
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        # event_id -> (file mtime_ns, snapshot times, best price at each, next snapshot time of each)
+        self._timelines: Dict[str, Tuple[int, List[int], List[float], List[int | None]]] = {}
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path)
+        conn.executescript(SCHEMA)
+        return conn
+
+    def _mtime(self) -> int | None:
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def write(self, rows: Iterable[Quote], links: Iterable[Tuple[int, int | None]] = ()) -> int:
+        """
+        Upsert quote rows (a re-crawled snapshot replaces its prices) and
+        (snapshot_ts, next_ts) timeline links; a known link is never cleared.
+        """
+        rows = list(rows)
+        if not rows:
+            return 0
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self._connect()
+        try:
+            with conn:
+                conn.executemany("INSERT OR REPLACE INTO odds_quotes VALUES (?, ?, ?, ?, ?)", rows)
+                conn.executemany(
+                    "INSERT INTO odds_snapshots VALUES (?, ?) ON CONFLICT (snapshot_ts) "
+                    "DO UPDATE SET next_ts = COALESCE(excluded.next_ts, next_ts)",
+                    list(links),
+                )
+        finally:
+            conn.close()
+        with self._lock:
+            for event_id in {r[0] for r in rows}:
+                self._timelines.pop(event_id, None)
+        return len(rows)
+
+    def write_event_payload(self, payload: Dict[str, Any]) -> int:
+        """Store a single-event historical odds payload (/events/{id}/odds)."""
+        event_obj = payload.get("data")
+        if not isinstance(event_obj, dict) or not event_obj.get("id") or not payload.get("timestamp"):
+            return 0
+        return self.write(quotes_from_event(event_obj["id"], payload["timestamp"], event_obj), _links(payload))
+
+    def write_sport_payload(self, payload: Dict[str, Any]) -> int:
+        """Store every event in a sport-wide historical odds payload (/odds)."""
+        data = payload.get("data")
+        if not isinstance(data, list) or not payload.get("timestamp"):
+            return 0
+        rows: List[Quote] = []
+        for ev in data:
+            if isinstance(ev, dict) and ev.get("id"):
+                rows.extend(quotes_from_event(ev["id"], payload["timestamp"], ev))
+        return self.write(rows, _links(payload))
+
+    def timeline(self, event_id: str) -> Tuple[List[int], List[float], List[int | None]]:
+        """
+        Sorted snapshot times for the event, the best h2h price at each and the
+        upstream next_timestamp of each (None when it was not recorded).
+        """
+        mtime = self._mtime()
+        if mtime is None:
+            return [], [], []
+        with self._lock:
+            entry = self._timelines.get(event_id)
+            if entry is not None and entry[0] == mtime:
+                return entry[1], entry[2], entry[3]
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT q.snapshot_ts, MAX(q.price), s.next_ts FROM odds_quotes q "
+                "LEFT JOIN odds_snapshots s ON s.snapshot_ts = q.snapshot_ts "
+                "WHERE q.event_id = ? GROUP BY q.snapshot_ts ORDER BY q.snapshot_ts",
+                (event_id,),
+            ).fetchall()
+        finally:
+            conn.close()
+        times = [r[0] for r in rows]
+        prices = [r[1] for r in rows]
+        next_times = [r[2] for r in rows]
+        with self._lock:
+            self._timelines[event_id] = (mtime, times, prices, next_times)
+        return times, prices, next_times
+
+    def best_price_as_of(self, event_id: str, snapshot_ts: str, max_staleness_sec: float = 0) -> float | object:
+        """
+        Best h2h price at the latest stored snapshot at or before snapshot_ts when
+        the live endpoint would pick that same snapshot (see the module docstring)
+        or it is within max_staleness_sec of snapshot_ts; NOT_COVERED otherwise.
+        """
+        try:
+            at = to_epoch(snapshot_ts)
+        except ValueError:
+            return NOT_COVERED
+        times, prices, next_times = self.timeline(event_id)
+        i = bisect_right(times, at) - 1
+        if i < 0:
+            return NOT_COVERED
+        same_snapshot = next_times[i] is not None and next_times[i] > at
+        if at - times[i] > max_staleness_sec and not same_snapshot:
+            return NOT_COVERED
+        return prices[i]
+
+    def stats(self) -> Dict[str, Any]:
+        if self._mtime() is None:
+            return {"events": 0, "snapshots": 0, "quotes": 0}
+        conn = self._connect()
+        try:
+            events, snapshots, quotes = conn.execute(
+                "SELECT COUNT(DISTINCT event_id), COUNT(DISTINCT event_id || '@' || snapshot_ts), COUNT(*) "
+                "FROM odds_quotes"
+            ).fetchone()
+        finally:
+            conn.close()
+        return {"events": events, "snapshots": snapshots, "quotes": quotes}
+
+
+_store: OddsStore | None = None
+_store_lock = threading.Lock()
+
+
+def get_odds_store() -> OddsStore | None:
+    """Process-wide store at ODDS_STORE_PATH, or None when the store is disabled."""
+    global _store
+    if not settings.ODDS_STORE_PATH:
+        return None
+    with _store_lock:
+        if _store is None or _store.path != settings.ODDS_STORE_PATH:
+            _store = OddsStore(settings.ODDS_STORE_PATH)
+        return _store
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Inspect the local odds store")
+    parser.add_argument("--path", default=settings.ODDS_STORE_PATH, help="store file (default ODDS_STORE_PATH)")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("stats", help="event, snapshot and quote counts")
+    lk = sub.add_parser("lookup", help="best h2h price for an event as of a timestamp")
+    lk.add_argument("event_id")
+    lk.add_argument("timestamp")
+    lk.add_argument("--max-staleness", type=float, default=settings.ODDS_STORE_MAX_STALENESS_SEC,
+                    help="also accept a stored snapshot this many seconds older (default ODDS_STORE_MAX_STALENESS_SEC)")
+    args = parser.parse_args(argv)
+
+    if not args.path:
+        parser.error("set ODDS_STORE_PATH or pass --path")
+    store = OddsStore(args.path)
+    if args.cmd == "stats":
+        print(store.stats())
+    else:
+        price = store.best_price_as_of(args.event_id, args.timestamp, args.max_staleness)
+        print("not covered" if price is NOT_COVERED else price)
+
+
+if __name__ == "__main__":
+    main()
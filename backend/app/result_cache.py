@@ -0,0 +1,192 @@
+"""
+Memoized /compare results keyed by a content hash of the request.
+
+Once its upstream data is fixed, a compare result is a pure function of
+(payload, start, end, odds_date). request_hash() canonicalizes those into a
+SHA-256 key; results are only stored when they are safe to replay:
+
+  - the equity window is closed (end before today, same rule as the equity cache)
+  - neither leg fell back (live equity return and fixed or fetched odds)
+
+Backends (RESULT_CACHE_BACKEND):
+  memory  process-local LRU (a cache.TTLCache, so CACHE_DIR adds the disk tier)
+  db      comparison_history itself: rows carry request_hash only when their
+          result is replayable, so the newest row with the hash is the answer
+  off     no memoization
+
+A hit is returned as-is and no new history row is written, so identical
+requests no longer pile up duplicate rows.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import threading
+from typing import Any, Dict, List
+
+from backend.app.cache import MISSING, TTLCache, disk_path
+from backend.app.config import settings
+from backend.app.schemas import CompareRequest
+from backend.app.services import equity_window_closed
+
+logger = logging.getLogger(__name__)
+
+# bump when the result shape or compare arithmetic changes so old entries stop matching
+RESULT_VERSION = 1
+
+
+def request_hash(payload: Dict[str, Any], start: str, end: str, odds_date: str | None) -> str:
+    """Stable key for a compare request (payload as stored in history, snapshot already normalized)."""
+    doc = {"v": RESULT_VERSION, "payload": payload, "start": start, "end": end, "odds_date": odds_date}
+    raw = json.dumps(doc, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def is_replayable(req: CompareRequest, end: str) -> bool:
+    if getattr(req.bet, "_fallback", False) or getattr(req, "_equity_fallback", False):
+        return False
+    return equity_window_closed(end)
+
+
+class _Counters:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+
+    def count(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def stored(self) -> None:
+        with self._lock:
+            self.stores += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "stores": self.stores}
+
+
+class MemoryResultCache(_Counters):
+    backend = "memory"
+    # lookups are in-process; handlers may call get() on the event loop
+    blocking = False
+
+    def __init__(self, maxsize: int):
+        super().__init__()
+        self._cache = TTLCache("compare_result", maxsize=maxsize,
+                               disk_path=disk_path("compare_result", settings.CACHE_DIR))
+
+    def get(self, key: str) -> Dict[str, Any] | None:
+        value = self._cache.get((key,))
+        self.count(value is not MISSING)
+        return None if value is MISSING else value
+
+    def get_many(self, keys: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Cached results for the keys that hit; misses are absent."""
+        found = {}
+        for key in dict.fromkeys(keys):
+            result = self.get(key)
+            if result is not None:
+                found[key] = result
+        return found
+
+    def set(self, key: str, result: Dict[str, Any]) -> None:
+        self._cache.set((key,), result)
+        self.stored()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": self.backend, **super().stats(), "size": self._cache.stats().get("size")}
+
+
+class DbResultCache(_Counters):
+    backend = "db"
+    blocking = True
+
+    def __init__(self, session_factory=None):
+        super().__init__()
+        self._session_factory = session_factory
+
+    def _session(self):
+        if self._session_factory is None:
+            # imported lazily, like the history route: DB settings may be missing
+            from backend.app.db.session import SessionLocal
+            self._session_factory = SessionLocal
+        return self._session_factory()
+
+    def get(self, key: str) -> Dict[str, Any] | None:
+        from backend.app.crud import history as history_crud
+
+        try:
+            db = self._session()
+        except Exception as e:
+            logger.warning("result cache lookup skipped (db unavailable): %s", e)
+            return None
+        try:
+            result = history_crud.get_result_by_hash(db, key)
+        except Exception as e:
+            logger.warning("result cache lookup failed: %s", e)
+            result = None
+        finally:
+            db.close()
+        self.count(result is not None)
+        return result
+
+    def get_many(self, keys: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Bulk get: one session and one request_hash IN (...) query for the whole batch."""
+        from backend.app.crud import history as history_crud
+
+        unique = list(dict.fromkeys(keys))
+        if not unique:
+            return {}
+        try:
+            db = self._session()
+        except Exception as e:
+            logger.warning("result cache lookup skipped (db unavailable): %s", e)
+            return {}
+        try:
+            found = history_crud.get_results_by_hashes(db, unique)
+        except Exception as e:
+            logger.warning("result cache lookup failed: %s", e)
+            found = {}
+        finally:
+            db.close()
+        for key in unique:
+            self.count(key in found)
+        return found
+
+    def set(self, key: str, result: Dict[str, Any]) -> None:
+        # the history row written with request_hash is the stored entry
+        self.stored()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": self.backend, **super().stats()}
+
+
+_result_cache: MemoryResultCache | DbResultCache | None = None
+_result_cache_lock = threading.Lock()
+
+
+def get_result_cache() -> MemoryResultCache | DbResultCache | None:
+    """Configured result cache, or None when RESULT_CACHE_BACKEND is off."""
+    global _result_cache
+    backend = settings.RESULT_CACHE_BACKEND
+    if backend == "off":
+        return None
+    with _result_cache_lock:
+        if _result_cache is None or _result_cache.backend != backend:
+            if backend == "db":
+                _result_cache = DbResultCache()
+            else:
+                _result_cache = MemoryResultCache(settings.RESULT_CACHE_MAXSIZE)
+        return _result_cache
+
+
+def result_cache_stats() -> Dict[str, Any]:
+    cache = get_result_cache()
+    return cache.stats() if cache is not None else {"backend": "off"}
@@ -4,10 +4,12 @@ from datetime import datetime
 from uuid import UUID
 import re
 
-from pydantic import BaseModel, Field, field_validator, ConfigDict
+from pydantic import BaseModel, Field, field_validator, model_validator, ConfigDict
 
 HEX32_RE = re.compile(r"^[0-9a-f]{32}$", re.IGNORECASE)
 SUPPORTED_LEAGUES = {"nfl"}
+MAX_BATCH_SCENARIOS = 5000
+MAX_SWEEP_POINTS = 10001
 
 
 class Bet(BaseModel):
@@ -54,6 +56,39 @@ class CompareRequestInput(BaseModel):
         return v.strip().upper()
 
 
+class CompareScenario(CompareRequestInput):
+    """One batch entry: a compare input plus its own equity window and odds snapshot."""
+    start: str = Field(..., description="Equity start date YYYY-MM-DD")
+    end: str = Field(..., description="Equity end date YYYY-MM-DD")
+    odds_date: str | None = Field(None, description="Historical odds snapshot ISO timestamp or YYYY-MM-DD")
+
+
+class BatchCompareInput(BaseModel):
+    scenarios: list[CompareScenario] = Field(..., min_length=1, max_length=MAX_BATCH_SCENARIOS)
+
+
+class SweepRequestInput(BaseModel):
+    """Equity-weight sweep input: a compare input with a weight range instead of one weight."""
+    starting_capital: float = Field(..., gt=0, description="Total starting capital (>0)")
+    equity_symbol: str = Field(..., min_length=1, description="Equity ticker symbol")
+    bet: Bet
+    weight_min: float = Field(0.0, ge=0, le=1, description="First equity weight of the sweep")
+    weight_max: float = Field(1.0, ge=0, le=1, description="Last equity weight of the sweep (inclusive)")
+    weight_step: float = Field(0.05, gt=0, le=1, description="Weight increment")
+
+    @field_validator("equity_symbol")
+    def symbol_trim(cls, v: str) -> str:
+        return v.strip().upper()
+
+    @model_validator(mode="after")
+    def weight_range(self) -> "SweepRequestInput":
+        if self.weight_min > self.weight_max:
+            raise ValueError("weight_min must be <= weight_max")
+        if (self.weight_max - self.weight_min) / self.weight_step + 1 > MAX_SWEEP_POINTS:
+            raise ValueError(f"sweep exceeds {MAX_SWEEP_POINTS} points")
+        return self
+
+
 class HistoryOut(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
@@ -1,15 +1,49 @@
 import os
-import requests
+import asyncio
 import logging
-from typing import Dict, Any
+from datetime import date, datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Tuple
+import numpy as np
+from fastapi.concurrency import run_in_threadpool
 from backend.app.schemas import CompareRequest, Bet
 from backend.app.config import settings
+from backend.app.upstream import get_async_client, http_get
+from backend.app.cache import TTLCache, MISSING, NOT_COVERED, disk_path
+from backend.app.singleflight import SingleFlight
+from backend.app.bar_store import get_bar_store
+from backend.app.odds_store import get_odds_store
+from backend.app.bars import aggregate_bars, aggregate_bars_async, alpaca_headers
+from backend.app.vector_compare import execute_compare_vectorized
+from backend.app.metrics import FALLBACKS, UPSTREAM_ERRORS, stage_timer
+from backend.app.tracing import span, submit_in_context
 
 logger = logging.getLogger(__name__)
 
 FALLBACK_ODDS = 2.0
 FALLBACK_EQUITY_RETURN = 0.0
 
+# Equity and odds legs are independent upstream calls; resolving them on this
+# bounded pool makes request latency the max of the two instead of the sum.
+_upstream_pool = ThreadPoolExecutor(max_workers=settings.UPSTREAM_MAX_WORKERS, thread_name_prefix="upstream")
+
+# Equity returns keyed by (symbol, start, end). Closed windows never change and are
+# kept until evicted; windows that reach today expire after EQUITY_CACHE_OPEN_TTL_SEC.
+_equity_cache = TTLCache(
+    "equity_return",
+    maxsize=settings.EQUITY_CACHE_MAXSIZE,
+    disk_path=disk_path("equity_return", settings.CACHE_DIR),
+)
+# Full event-odds payloads keyed by (event_id, snapshot_ts); historical snapshots are immutable.
+_odds_cache = TTLCache(
+    "event_odds",
+    maxsize=settings.ODDS_CACHE_MAXSIZE,
+    disk_path=disk_path("event_odds", settings.CACHE_DIR),
+)
+# Concurrent identical cache misses share one in-flight upstream call.
+_equity_flight = SingleFlight("equity_return")
+_odds_flight = SingleFlight("event_odds")
+
 def execute_compare(req: CompareRequest) -> Dict[str, Any]:
     """
     Core comparison calculation.
@@ -54,118 +88,312 @@ def execute_compare(req: CompareRequest) -> Dict[str, Any]:
         "roi_pct": round(roi_pct, 2)
     }
 
+ODDS_HISTORICAL_PATH = "/v4/historical/sports/americanfootball_nfl"
+
+def _odds_request(event_id: str, snapshot_ts: str) -> Tuple[str, Dict[str, Any]] | None:
+    """(url, params) for the historical event-odds call, or None when ODDS_API_KEY is missing."""
+    api_key = os.getenv("ODDS_API_KEY")
+    if not api_key:
+        return None
+    params = {
+        "apiKey": api_key,
+        "date": snapshot_ts,
+        "markets": "h2h",
+        "regions": "us",
+        "oddsFormat": "decimal"
+    }
+    base = settings.ODDS_API_BASE_URL.rstrip("/") + ODDS_HISTORICAL_PATH
+    return f"{base}/events/{event_id}/odds", params
+
+def best_h2h_quote(payload: Dict[str, Any]) -> Dict[str, Any] | None:
+    """Best (max) h2h price in an event-odds payload, with the team and bookmaker offering it."""
+    event_obj = payload.get("data")
+    if not isinstance(event_obj, dict):
+        return None
+    best = None
+    for bk in event_obj.get("bookmakers", []):
+        for m in bk.get("markets", []):
+            if m.get("key") == "h2h":
+                for o in m.get("outcomes", []):
+                    price = o.get("price")
+                    if isinstance(price, (int, float)):
+                        if best is None or price > best["best_price"]:
+                            best = {
+                                "best_price": float(price),
+                                "best_team": o.get("name"),
+                                "best_bookmaker": bk.get("key"),
+                            }
+    return best
+
+def equity_window_closed(end: str) -> bool:
+    """True when the equity window ends before today (UTC), so its bars can no longer change."""
+    try:
+        end_d = date.fromisoformat(end[:10])
+    except ValueError:
+        return False
+    return end_d < datetime.now(timezone.utc).date()
+
+def _equity_cache_ttl(end: str) -> float | None:
+    if equity_window_closed(end):
+        return None
+    return settings.EQUITY_CACHE_OPEN_TTL_SEC
+
+def _fetch_equity_return_pct_uncached(symbol: str, start: str, end: str) -> float | None:
+    headers = alpaca_headers()
+    if headers is None:
+        return None
+    with span("equity.fetch", symbol=symbol, start=start, end=end) as sp:
+        try:
+            agg = aggregate_bars(symbol, start, end, headers)
+        except Exception as e:
+            UPSTREAM_ERRORS.inc(kind="equity_bars")
+            sp.set(error=str(e))
+            return None
+        sp.set(bars=agg.count)
+        return agg.equity_return()
+
+def _fetch_equity_return_pct_into_cache(symbol: str, start: str, end: str) -> float | None:
+    value = _fetch_equity_return_pct_uncached(symbol, start, end)
+    if value is not None:
+        _equity_cache.set((symbol, start, end), value, ttl=_equity_cache_ttl(end))
+    return value
+
+def _equity_return_from_store(symbol: str, start: str, end: str) -> float | None | object:
+    store = get_bar_store()
+    if store is None:
+        return NOT_COVERED
+    try:
+        return store.window_return(symbol, start, end)
+    except Exception as e:
+        logger.warning("bar_store_read_failed symbol=%s error=%s", symbol, e)
+        return NOT_COVERED
+
+def _equity_return_local(symbol: str, start: str, end: str) -> float | None | object:
+    """Bar store, then the equity cache (memory and disk tier); MISSING when neither answers."""
+    stored = _equity_return_from_store(symbol, start, end)
+    if stored is not NOT_COVERED:
+        return stored
+    return _equity_cache.get((symbol, start, end))
+
 def fetch_equity_return_pct(symbol: str, start: str, end: str) -> float | None:
     """
     Fetch daily bars (Alpaca) and compute (last_close - first_open)/first_open
+    Every page of the window is walked (no 100-bar truncation) and streamed into
+    running aggregates; windows covered by the local bar store are answered from it without network.
+    Successful lookups are cached per (symbol, start, end); failures are not.
     """
-    ALPACA_API_KEY = os.getenv("ALPACA_API_KEY")
-    ALPACA_API_SECRET = os.getenv("ALPACA_API_SECRET")
-    DATA_URL = "https://data.alpaca.markets/v2/stocks"
-    if not (ALPACA_API_KEY and ALPACA_API_SECRET):
-        return None
+    local = _equity_return_local(symbol, start, end)
+    if local is not MISSING:
+        return local
+    return _equity_flight.do((symbol, start, end), _fetch_equity_return_pct_into_cache, symbol, start, end)
 
-    headers = {
-        "APCA-API-KEY-ID": ALPACA_API_KEY,
-        "APCA-API-SECRET-KEY": ALPACA_API_SECRET,
-    }
-    params = {
-        "start": start,
-        "end": end,
-        "timeframe": "1Day",
-        "limit": 100,
-    }
-    url = f"{DATA_URL}/{symbol}/bars"
+def fetch_equity_window_stats(symbol: str, start: str, end: str) -> Dict[str, Any] | None:
+    """Return, max drawdown and daily-return volatility over the window, streamed page by page (uncached)."""
+    headers = alpaca_headers()
+    if headers is None:
+        return None
     try:
-        resp = requests.get(url, headers=headers, params=params, timeout=10)
-        resp.raise_for_status()
-        bars = resp.json().get("bars", [])
-        if len(bars) < 2:
-            return None
-        first_open = bars[0]["o"]
-        last_close = bars[-1]["c"]
-        return (last_close - first_open) / first_open
+        return aggregate_bars(symbol, start, end, headers).stats()
     except Exception:
         return None
 
+def _fetch_nfl_event_odds_uncached(event_id: str, snapshot_ts: str) -> Dict[str, Any] | None:
+    spec = _odds_request(event_id, snapshot_ts)
+    if spec is None:
+        return None
+    url, params = spec
+    with span("odds.fetch", event_id=event_id, snapshot=snapshot_ts) as sp:
+        try:
+            r = http_get(url, params=params, timeout=8)
+            sp.set(status_code=r.status_code)
+            if r.status_code != 200:
+                return None
+            payload = r.json()
+            return payload if isinstance(payload.get("data"), dict) else None
+        except Exception as e:
+            UPSTREAM_ERRORS.inc(kind="event_odds")
+            sp.set(error=str(e))
+            return None
+
+def _fetch_nfl_event_odds_into_cache(event_id: str, snapshot_ts: str) -> Dict[str, Any] | None:
+    payload = _fetch_nfl_event_odds_uncached(event_id, snapshot_ts)
+    if payload is not None:
+        _odds_cache.set((event_id, snapshot_ts), payload)
+    return payload
+
+def fetch_nfl_event_odds(event_id: str, snapshot_ts: str) -> Dict[str, Any] | None:
+    """
+    Full historical odds payload (all bookmakers) for one NFL event at a snapshot.
+    Historical snapshots never change, so payloads are cached write-through
+    (memory, plus SQLite under CACHE_DIR) keyed by (event_id, snapshot_ts).
+    """
+    key = (event_id, snapshot_ts)
+    cached = _odds_cache.get(key)
+    if cached is not MISSING:
+        return cached
+    return _odds_flight.do(key, _fetch_nfl_event_odds_into_cache, event_id, snapshot_ts)
+
+def _odds_from_store(event_id: str, snapshot_ts: str) -> float | object:
+    store = get_odds_store()
+    if store is None:
+        return NOT_COVERED
+    try:
+        return store.best_price_as_of(event_id, snapshot_ts, settings.ODDS_STORE_MAX_STALENESS_SEC)
+    except Exception as e:
+        logger.warning("odds_store_read_failed event=%s error=%s", event_id, e)
+        return NOT_COVERED
+
 def fetch_nfl_moneyline_odds(event_id: str, snapshot_ts: str) -> float | None:
     """
     Historical best (max) h2h moneyline decimal odds for one NFL event at a snapshot.
     Uses: /v4/historical/sports/americanfootball_nfl/events/{event_id}/odds
     snapshot_ts: ISO8601 timestamp (preferred) or YYYY-MM-DD.
+    Snapshots covered by the local odds store are answered from it without network.
     """
-    api_key = os.getenv("ODDS_API_KEY")
-    if not api_key:
+    stored = _odds_from_store(event_id, snapshot_ts)
+    if stored is not NOT_COVERED:
+        return stored
+    payload = fetch_nfl_event_odds(event_id, snapshot_ts)
+    quote = best_h2h_quote(payload) if payload else None
+    return quote["best_price"] if quote else None
+
+async def _fetch_equity_return_pct_uncached_async(symbol: str, start: str, end: str) -> float | None:
+    headers = alpaca_headers()
+    if headers is None:
         return None
-    url = f"https://api.the-odds-api.com/v4/historical/sports/americanfootball_nfl/events/{event_id}/odds"
-    params = {
-        "apiKey": api_key,
-        "date": snapshot_ts,
-        "markets": "h2h",
-        "regions": "us",
-        "oddsFormat": "decimal"
-    }
-    try:
-        r = requests.get(url, params=params, timeout=8)
-        if r.status_code != 200:
-            return None
-        payload = r.json()
-        event_obj = payload.get("data")
-        if not isinstance(event_obj, dict):
+    with span("equity.fetch", symbol=symbol, start=start, end=end) as sp:
+        try:
+            agg = await aggregate_bars_async(get_async_client(), symbol, start, end, headers)
+        except Exception as e:
+            UPSTREAM_ERRORS.inc(kind="equity_bars")
+            sp.set(error=str(e))
             return None
-        best = None
-        for bk in event_obj.get("bookmakers", []):
-            for m in bk.get("markets", []):
-                if m.get("key") == "h2h":
-                    for o in m.get("outcomes", []):
-                        price = o.get("price")
-                        if isinstance(price, (int, float)):
-                            if best is None or price > best:
-                                best = float(price)
-        return best
-    except Exception:
+        sp.set(bars=agg.count)
+        return agg.equity_return()
+
+async def _fetch_equity_return_pct_into_cache_async(symbol: str, start: str, end: str) -> float | None:
+    value = await _fetch_equity_return_pct_uncached_async(symbol, start, end)
+    if value is not None:
+        _equity_cache.set((symbol, start, end), value, ttl=_equity_cache_ttl(end))
+    return value
+
+async def fetch_equity_return_pct_async(symbol: str, start: str, end: str) -> float | None:
+    """Async fetch_equity_return_pct on the shared pooled client (same store and cache)."""
+    # the store can load a sidecar and memmap and the cache can hit its SQLite tier; keep both off the event loop
+    local = await run_in_threadpool(_equity_return_local, symbol, start, end)
+    if local is not MISSING:
+        return local
+    return await _equity_flight.do_async(
+        (symbol, start, end), _fetch_equity_return_pct_into_cache_async, symbol, start, end
+    )
+
+async def _fetch_nfl_event_odds_uncached_async(event_id: str, snapshot_ts: str) -> Dict[str, Any] | None:
+    spec = _odds_request(event_id, snapshot_ts)
+    if spec is None:
         return None
+    url, params = spec
+    with span("odds.fetch", event_id=event_id, snapshot=snapshot_ts) as sp:
+        try:
+            r = await get_async_client().get(url, params=params, timeout=8)
+            sp.set(status_code=r.status_code)
+            if r.status_code != 200:
+                return None
+            payload = r.json()
+            return payload if isinstance(payload.get("data"), dict) else None
+        except Exception as e:
+            UPSTREAM_ERRORS.inc(kind="event_odds")
+            sp.set(error=str(e))
+            return None
 
-def build_compare_request_with_live_data(
+async def _fetch_nfl_event_odds_into_cache_async(event_id: str, snapshot_ts: str) -> Dict[str, Any] | None:
+    payload = await _fetch_nfl_event_odds_uncached_async(event_id, snapshot_ts)
+    if payload is not None:
+        _odds_cache.set((event_id, snapshot_ts), payload)
+    return payload
+
+async def fetch_nfl_event_odds_async(event_id: str, snapshot_ts: str) -> Dict[str, Any] | None:
+    """Async fetch_nfl_event_odds on the shared pooled client (same cache)."""
+    key = (event_id, snapshot_ts)
+    cached = _odds_cache.get(key)
+    if cached is not MISSING:
+        return cached
+    return await _odds_flight.do_async(key, _fetch_nfl_event_odds_into_cache_async, event_id, snapshot_ts)
+
+async def fetch_nfl_moneyline_odds_async(event_id: str, snapshot_ts: str) -> float | None:
+    """Async fetch_nfl_moneyline_odds on the shared pooled client (same store and cache)."""
+    # a store lookup can open SQLite and query on a timeline miss; keep it off the event loop
+    stored = await run_in_threadpool(_odds_from_store, event_id, snapshot_ts)
+    if stored is not NOT_COVERED:
+        return stored
+    payload = await fetch_nfl_event_odds_async(event_id, snapshot_ts)
+    quote = best_h2h_quote(payload) if payload else None
+    return quote["best_price"] if quote else None
+
+def _resolve_equity_return(symbol: str, start: str, end: str) -> float | None:
+    """Live equity return for the window; None means the caller applies FALLBACK_EQUITY_RETURN."""
+    with stage_timer("equity_fetch"), span("equity.resolve", symbol=symbol, start=start, end=end) as sp:
+        eq_ret = fetch_equity_return_pct(symbol, start, end)
+        sp.set(fallback=eq_ret is None)
+    if eq_ret is not None:
+        return eq_ret
+    FALLBACKS.inc(kind="equity_return")
+    logger.info("equity_return_fallback symbol=%s start=%s end=%s", symbol, start, end)
+    return None
+
+def _resolve_odds(event_id: str, odds_date: str | None) -> float | None:
+    """Historical best moneyline for the snapshot; None means the caller applies FALLBACK_ODDS."""
+    fetched_odds = None
+    if odds_date:
+        with stage_timer("odds_fetch"), span("odds.resolve", event_id=event_id, snapshot=odds_date) as sp:
+            fetched_odds = fetch_nfl_moneyline_odds(event_id, odds_date)
+            sp.set(price=fetched_odds)
+
+    if fetched_odds is not None:
+        logger.info("odds_resolved event=%s snapshot=%s price=%s", event_id, odds_date, fetched_odds)
+    else:
+        FALLBACKS.inc(kind="odds")
+        logger.info("odds_fallback event=%s snapshot=%s", event_id, odds_date)
+    return fetched_odds
+
+async def _resolve_equity_return_async(symbol: str, start: str, end: str) -> float | None:
+    with stage_timer("equity_fetch"), span("equity.resolve", symbol=symbol, start=start, end=end) as sp:
+        eq_ret = await fetch_equity_return_pct_async(symbol, start, end)
+        sp.set(fallback=eq_ret is None)
+    if eq_ret is not None:
+        return eq_ret
+    FALLBACKS.inc(kind="equity_return")
+    logger.info("equity_return_fallback symbol=%s start=%s end=%s", symbol, start, end)
+    return None
+
+async def _resolve_odds_async(event_id: str, odds_date: str | None) -> float | None:
+    fetched_odds = None
+    if odds_date:
+        with stage_timer("odds_fetch"), span("odds.resolve", event_id=event_id, snapshot=odds_date) as sp:
+            fetched_odds = await fetch_nfl_moneyline_odds_async(event_id, odds_date)
+            sp.set(price=fetched_odds)
+
+    if fetched_odds is not None:
+        logger.info("odds_resolved event=%s snapshot=%s price=%s", event_id, odds_date, fetched_odds)
+    else:
+        FALLBACKS.inc(kind="odds")
+        logger.info("odds_fallback event=%s snapshot=%s", event_id, odds_date)
+    return fetched_odds
+
+def _assemble_compare_request(
     starting_capital: float,
     equity_symbol: str,
     equity_weight: float,
     bet_data: Dict[str, Any],
-    start: str,
-    end: str,
-    odds_date: str | None
+    odds_date: str | None,
+    equity_return_pct: float | None,
+    fetched_odds: float | None,
 ) -> CompareRequest:
-    user_supplied_odds = bet_data.get("odds", None)
-    resolved_odds = user_supplied_odds
-    used_fallback = False
-
-    # Default equity return
-    equity_return_pct = FALLBACK_EQUITY_RETURN
-
-    if settings.USE_EXTERNAL_APIS:
-        # Equity return attempt
-        eq_ret = fetch_equity_return_pct(equity_symbol, start, end)
-        if eq_ret is not None:
-            equity_return_pct = eq_ret
-        else:
-            logger.info("equity_return_fallback symbol=%s start=%s end=%s", equity_symbol, start, end)
-
-        # Only fetch odds if user did not supply fixed odds
-        if resolved_odds is None:
-            fetched_odds = None
-            if odds_date:
-                fetched_odds = fetch_nfl_moneyline_odds(bet_data["event_id"], odds_date)
-            else:
-                # (Optional) implement live odds endpoint; for now reuse historical if you want
-                # fetched_odds = fetch_live_moneyline_odds(...)
-                fetched_odds = None
-
-            if fetched_odds is not None:
-                resolved_odds = fetched_odds
-                logger.info("odds_resolved event=%s snapshot=%s price=%s", bet_data["event_id"], odds_date, resolved_odds)
-            else:
-                logger.info("odds_fallback event=%s snapshot=%s", bet_data["event_id"], odds_date)
+    resolved_odds = bet_data.get("odds", None)
+    if resolved_odds is None:
+        resolved_odds = fetched_odds
 
     # Apply fallback if still None
+    used_fallback = False
     if resolved_odds is None:
         resolved_odds = FALLBACK_ODDS
         used_fallback = True
@@ -174,12 +402,148 @@ def build_compare_request_with_live_data(
     if used_fallback:
         setattr(bet, "_fallback", True)
 
+    equity_fallback = equity_return_pct is None
     req = CompareRequest(
         starting_capital=starting_capital,
         equity_symbol=equity_symbol,
         equity_weight=equity_weight,
-        equity_return_pct=equity_return_pct,
+        equity_return_pct=FALLBACK_EQUITY_RETURN if equity_fallback else equity_return_pct,
         bet=bet,
         snapshot_timestamp=odds_date
     )
+    if equity_fallback:
+        setattr(req, "_equity_fallback", True)
     return req
+
+def build_compare_request_with_live_data(
+    starting_capital: float,
+    equity_symbol: str,
+    equity_weight: float,
+    bet_data: Dict[str, Any],
+    start: str,
+    end: str,
+    odds_date: str | None
+) -> CompareRequest:
+    # None -> FALLBACK_EQUITY_RETURN (applied in _assemble_compare_request)
+    equity_return_pct = None
+    fetched_odds = None
+
+    if settings.USE_EXTERNAL_APIS:
+        with span("compare.build", symbol=equity_symbol, event_id=bet_data.get("event_id")):
+            equity_future = submit_in_context(_upstream_pool, _resolve_equity_return, equity_symbol, start, end)
+            # Only fetch odds if user did not supply fixed odds (runs here while the equity leg is in flight)
+            if bet_data.get("odds", None) is None:
+                fetched_odds = _resolve_odds(bet_data["event_id"], odds_date)
+            equity_return_pct = equity_future.result()
+
+    return _assemble_compare_request(
+        starting_capital, equity_symbol, equity_weight, bet_data, odds_date, equity_return_pct, fetched_odds
+    )
+
+async def build_compare_request_with_live_data_async(
+    starting_capital: float,
+    equity_symbol: str,
+    equity_weight: float,
+    bet_data: Dict[str, Any],
+    start: str,
+    end: str,
+    odds_date: str | None
+) -> CompareRequest:
+    """Async build_compare_request_with_live_data: both upstream legs are awaited together."""
+    equity_return_pct = None
+    fetched_odds = None
+
+    if settings.USE_EXTERNAL_APIS:
+        with span("compare.build", symbol=equity_symbol, event_id=bet_data.get("event_id")):
+            if bet_data.get("odds", None) is None:
+                equity_return_pct, fetched_odds = await asyncio.gather(
+                    _resolve_equity_return_async(equity_symbol, start, end),
+                    _resolve_odds_async(bet_data["event_id"], odds_date),
+                )
+            else:
+                equity_return_pct = await _resolve_equity_return_async(equity_symbol, start, end)
+
+    return _assemble_compare_request(
+        starting_capital, equity_symbol, equity_weight, bet_data, odds_date, equity_return_pct, fetched_odds
+    )
+
+def build_compare_requests_batch(scenarios: List[Dict[str, Any]]) -> List[CompareRequest]:
+    """
+    Batch variant of build_compare_request_with_live_data.
+    Each scenario dict carries the same keyword arguments as the single-request builder.
+    Upstream lookups shared between scenarios are resolved once:
+      - equity return per (symbol, start, end)
+      - odds per (event_id, odds_date), only for scenarios without fixed odds
+    """
+    equity_returns: Dict[Tuple[str, str, str], float | None] = {}
+    odds: Dict[Tuple[str, str | None], float | None] = {}
+
+    if settings.USE_EXTERNAL_APIS:
+        with span("compare.build_batch", scenarios=len(scenarios)):
+            equity_futures = {}
+            odds_futures = {}
+            for sc in scenarios:
+                eq_key = (sc["equity_symbol"], sc["start"], sc["end"])
+                if eq_key not in equity_futures:
+                    equity_futures[eq_key] = submit_in_context(_upstream_pool, _resolve_equity_return, *eq_key)
+                if sc["bet_data"].get("odds", None) is None:
+                    odds_key = (sc["bet_data"]["event_id"], sc["odds_date"])
+                    if odds_key not in odds_futures:
+                        odds_futures[odds_key] = submit_in_context(_upstream_pool, _resolve_odds, *odds_key)
+            equity_returns = {k: f.result() for k, f in equity_futures.items()}
+            odds = {k: f.result() for k, f in odds_futures.items()}
+
+    requests_out = []
+    for sc in scenarios:
+        requests_out.append(_assemble_compare_request(
+            sc["starting_capital"],
+            sc["equity_symbol"],
+            sc["equity_weight"],
+            sc["bet_data"],
+            sc["odds_date"],
+            equity_returns.get((sc["equity_symbol"], sc["start"], sc["end"])),
+            odds.get((sc["bet_data"]["event_id"], sc["odds_date"])),
+        ))
+    return requests_out
+
+def sweep_weight_grid(weight_min: float, weight_max: float, weight_step: float) -> np.ndarray:
+    """Inclusive weight grid; rounded so 0.1 + 0.2 style drift doesn't leak into the response."""
+    n = int(np.floor((weight_max - weight_min) / weight_step + 1e-9)) + 1
+    return np.round(weight_min + weight_step * np.arange(n), 10)
+
+def sweep_equity_weights(req: CompareRequest, weights: np.ndarray) -> Dict[str, Any]:
+    """
+    Evaluate one resolved CompareRequest over many equity weights, for both bet outcomes.
+    req.equity_weight and req.bet.outcome are ignored; upstream data is taken as resolved.
+    Returns the per-weight curve and the best (max roi) weight for each branch.
+    """
+    win = np.array([True, False])[None, :]
+    cols = execute_compare_vectorized(
+        req.starting_capital, weights[:, None], req.bet.stake, req.bet.odds, win, req.equity_return_pct
+    )
+    combined = cols["combined_final"]
+    roi = cols["roi_pct"]
+
+    curve = [
+        {
+            "equity_weight": float(w),
+            "win": {"combined_final": float(combined[i, 0]), "roi_pct": float(roi[i, 0])},
+            "loss": {"combined_final": float(combined[i, 1]), "roi_pct": float(roi[i, 1])},
+        }
+        for i, w in enumerate(weights)
+    ]
+    best = {}
+    for j, branch in enumerate(("win", "loss")):
+        i = int(np.argmax(roi[:, j]))
+        best[branch] = {
+            "equity_weight": float(weights[i]),
+            "combined_final": float(combined[i, j]),
+            "roi_pct": float(roi[i, j]),
+        }
+    return {
+        "starting_capital": req.starting_capital,
+        "equity_symbol": req.equity_symbol,
+        "equity_return_pct": req.equity_return_pct,
+        "curve": curve,
+        "best": best,
+    }
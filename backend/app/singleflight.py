@@ -0,0 +1,122 @@
+"""
+Singleflight: coalesce concurrent identical upstream fetches.
+
+While a call for a key is in flight, other callers asking for the same key wait
+for it and share its result (or its exception) instead of issuing their own
+request. do() coalesces across threads, do_async() across tasks on the event
+loop; both feed the same counters. If the task leading an async call is
+cancelled (its client went away), waiters are not cancelled with it: one of them
+retries as the new leader and the rest coalesce onto that.
+"""
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+_registry: Dict[str, "SingleFlight"] = {}
+
+
+class _LeaderCancelled(Exception):
+    """Set on a shared future when its leader was cancelled; waiters retry."""
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._futures: Dict[Hashable, asyncio.Future] = {}
+        self.calls = 0
+        self.executions = 0
+        self.coalesced = 0
+        _registry[name] = self
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args: Any) -> Any:
+        with self._lock:
+            self.calls += 1
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executions += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            call.value = fn(*args)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.value
+
+    async def do_async(self, key: Hashable, fn: Callable[..., Awaitable[Any]], *args: Any) -> Any:
+        with self._lock:
+            self.calls += 1
+        while True:
+            with self._lock:
+                fut = self._futures.get(key)
+                leader = fut is None
+                if leader:
+                    fut = self._futures[key] = asyncio.get_running_loop().create_future()
+                    self.executions += 1
+                else:
+                    self.coalesced += 1
+
+            if not leader:
+                try:
+                    # shield: a cancelled waiter must not cancel the shared call
+                    return await asyncio.shield(fut)
+                except _LeaderCancelled:
+                    continue
+
+            try:
+                value = await fn(*args)
+            except asyncio.CancelledError:
+                fut.set_exception(_LeaderCancelled())
+                fut.exception()  # mark retrieved when nobody is waiting
+                raise
+            except BaseException as e:
+                fut.set_exception(e)
+                fut.exception()  # mark retrieved; waiters re-raise it themselves
+                raise
+            else:
+                fut.set_result(value)
+                return value
+            finally:
+                with self._lock:
+                    del self._futures[key]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "executions": self.executions,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._calls) + len(self._futures),
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self.calls = self.executions = self.coalesced = 0
+
+
+def singleflight_stats() -> Dict[str, Dict[str, int]]:
+    return {name: g.stats() for name, g in _registry.items()}
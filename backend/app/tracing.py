@@ -0,0 +1,289 @@
+"""
+Lightweight request tracing.
+
+Each HTTP request gets a trace id (taken from an incoming W3C `traceparent`
+header when present) and a root span; code on the request path opens child
+spans with
+
+    with span("odds.fetch", event_id=event_id):
+        ...
+
+The current span lives in a contextvar, so nesting follows the call stack
+across `await`s, and into worker threads when work is submitted through
+submit_in_context() (run_in_threadpool already copies the context).
+
+Every log record carries `trace_id` and `span_id` attributes (see
+install_log_context), and configure_logging() gives the app's loggers a
+handler formatted with LOG_FORMAT (which includes them by default), so each
+app log line names its request. Finished spans go to the configured exporter
+as JSON lines:
+
+    TRACE_EXPORTER=stdout                     # one JSON object per span on stdout
+    TRACE_EXPORTER=file TRACE_FILE=traces.jsonl
+
+With TRACE_EXPORTER=off (the default) trace ids still reach the logs and the
+X-Trace-Id response header, but spans are not recorded.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from concurrent.futures import Executor, Future
+from contextvars import ContextVar, copy_context
+from typing import Any, Callable, Dict, TextIO
+
+from backend.app.config import settings
+
+TRACEPARENT_RE = re.compile(r"^[0-9a-f]{2}-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$")
+
+_trace_id: ContextVar[str | None] = ContextVar("trace_id", default=None)
+_current: ContextVar["Span | None"] = ContextVar("current_span", default=None)
+
+
+def new_trace_id() -> str:
+    return os.urandom(16).hex()
+
+
+def new_span_id() -> str:
+    return os.urandom(8).hex()
+
+
+def current_trace_id() -> str | None:
+    return _trace_id.get()
+
+
+def current_span() -> "Span | None":
+    return _current.get()
+
+
+class Span:
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "attrs", "status", "_start_wall", "_t0", "duration_ms", "_token")
+
+    def __init__(self, name: str, trace_id: str, parent_id: str | None, attrs: Dict[str, Any]):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = new_span_id()
+        self.parent_id = parent_id
+        self.attrs = attrs
+        self.status = "ok"
+        self.duration_ms: float | None = None
+
+    def set(self, **attrs: Any) -> None:
+        self.attrs.update(attrs)
+
+    def __enter__(self) -> "Span":
+        self._start_wall = time.time()
+        self._t0 = time.perf_counter()
+        self._token = _current.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.duration_ms = (time.perf_counter() - self._t0) * 1000
+        _current.reset(self._token)
+        if exc is not None:
+            self.status = "error"
+            self.attrs["error"] = f"{exc_type.__name__}: {exc}"
+        exporter = get_exporter()
+        if exporter is not None:
+            exporter.export(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start": round(self._start_wall, 6),
+            "duration_ms": round(self.duration_ms, 3) if self.duration_ms is not None else None,
+            "status": self.status,
+            "attrs": self.attrs,
+        }
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def set(self, **attrs: Any) -> None:
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        pass
+
+
+_NOOP = _NoopSpan()
+
+
+def span(name: str, **attrs: Any) -> Span | _NoopSpan:
+    """Child of the current span (or a new trace root); a shared no-op when tracing is off."""
+    if get_exporter() is None:
+        return _NOOP
+    parent = _current.get()
+    if parent is not None:
+        return Span(name, parent.trace_id, parent.span_id, attrs)
+    trace_id = _trace_id.get() or new_trace_id()
+    return Span(name, trace_id, None, attrs)
+
+
+def submit_in_context(pool: Executor, fn: Callable[..., Any], *args: Any) -> Future:
+    """pool.submit that runs fn inside a copy of the caller's context (trace id, current span)."""
+    return pool.submit(copy_context().run, fn, *args)
+
+
+# --- exporters -------------------------------------------------------------
+
+class JsonLinesExporter:
+    """Writes one JSON object per finished span; thread-safe, line-buffered."""
+
+    def __init__(self, stream: TextIO, close: bool = False):
+        self._stream = stream
+        self._close = close
+        self._lock = threading.Lock()
+        self.exported = 0
+
+    def export(self, s: Span) -> None:
+        line = json.dumps(s.to_dict(), default=str, separators=(",", ":"))
+        with self._lock:
+            self._stream.write(line + "\n")
+            self._stream.flush()
+            self.exported += 1
+
+    def close(self) -> None:
+        if self._close:
+            with self._lock:
+                self._stream.close()
+
+
+_exporter: JsonLinesExporter | None = None
+_exporter_configured = False
+_exporter_lock = threading.Lock()
+
+
+def set_exporter(exporter: JsonLinesExporter | None) -> JsonLinesExporter | None:
+    """Install an exporter (None disables span recording); returns the previous one."""
+    global _exporter, _exporter_configured
+    with _exporter_lock:
+        previous = _exporter
+        _exporter = exporter
+        _exporter_configured = True
+        return previous
+
+
+def get_exporter() -> JsonLinesExporter | None:
+    global _exporter, _exporter_configured
+    if _exporter_configured:
+        return _exporter
+    with _exporter_lock:
+        if not _exporter_configured:
+            if settings.TRACE_EXPORTER == "stdout":
+                _exporter = JsonLinesExporter(sys.stdout)
+            elif settings.TRACE_EXPORTER == "file":
+                path = settings.TRACE_FILE or "traces.jsonl"
+                _exporter = JsonLinesExporter(open(path, "a", encoding="utf-8"), close=True)
+            _exporter_configured = True
+        return _exporter
+
+
+def shutdown() -> None:
+    previous = set_exporter(None)
+    if previous is not None:
+        previous.close()
+
+
+# --- logging ---------------------------------------------------------------
+
+_log_context_installed = False
+
+
+def install_log_context() -> None:
+    """Give every LogRecord trace_id/span_id attributes ("-" outside a request)."""
+    global _log_context_installed
+    if _log_context_installed:
+        return
+    base_factory = logging.getLogRecordFactory()
+
+    def factory(*args: Any, **kwargs: Any) -> logging.LogRecord:
+        record = base_factory(*args, **kwargs)
+        current = _current.get()
+        record.trace_id = _trace_id.get() or "-"
+        record.span_id = current.span_id if isinstance(current, Span) else "-"
+        return record
+
+    logging.setLogRecordFactory(factory)
+    _log_context_installed = True
+
+
+def configure_logging(stream: TextIO | None = None) -> logging.Handler:
+    """
+    Install the log context and one LOG_FORMAT handler on the "backend" logger
+    (idempotent; returns the handler). Records still propagate, so uvicorn or
+    test capture handlers keep working.
+    """
+    install_log_context()
+    logger = logging.getLogger("backend")
+    for handler in logger.handlers:
+        if getattr(handler, "_trace_format", False):
+            break
+    else:
+        handler = logging.StreamHandler(stream or sys.stderr)
+        handler._trace_format = True
+        logger.addHandler(handler)
+    handler.setFormatter(logging.Formatter(settings.LOG_FORMAT))
+    logger.setLevel(settings.LOG_LEVEL.upper())
+    return handler
+
+
+# --- ASGI ------------------------------------------------------------------
+
+class TracingMiddleware:
+    """
+    Pure ASGI middleware: binds a trace id for the request (continuing an incoming
+    traceparent), opens the root span and returns the id as X-Trace-Id.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        trace_id, parent_id = None, None
+        for key, value in scope.get("headers") or ():
+            if key == b"traceparent":
+                m = TRACEPARENT_RE.match(value.decode("latin-1").strip().lower())
+                if m:
+                    trace_id, parent_id = m.group(1), m.group(2)
+                break
+        trace_id = trace_id or new_trace_id()
+        token = _trace_id.set(trace_id)
+        root = None
+        if get_exporter() is not None:
+            root = Span(f"{scope['method']} {scope['path']}", trace_id, parent_id, {})
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [(b"x-trace-id", trace_id.encode())]
+                if root is not None:
+                    root.set(status_code=message["status"])
+            await send(message)
+
+        try:
+            if root is None:
+                await self.app(scope, receive, send_wrapper)
+            else:
+                with root:
+                    await self.app(scope, receive, send_wrapper)
+                    route = scope.get("route")
+                    if route is not None:
+                        root.name = f"{scope['method']} {route.path}"
+        finally:
+            _trace_id.reset(token)
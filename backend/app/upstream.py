@@ -0,0 +1,176 @@
+"""
+Shared upstream HTTP clients (Alpaca data API, The Odds API).
+
+Sync callers use http_get(), which routes through one keep-alive requests.Session
+per upstream host, so repeated calls reuse pooled TCP+TLS connections instead of
+handshaking every time. Pool size and retry policy come from settings.
+
+The async client is long-lived and connection-pooled: main.lifespan opens it on
+startup and closes it on shutdown. Code paths that run without the lifespan
+(scripts, TestClient used outside a `with` block) get one created lazily.
+"""
+from __future__ import annotations
+
+import threading
+from typing import Any, Dict
+from urllib.parse import urlsplit
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from backend.app.config import settings
+from backend.app.metrics import count_upstream_response
+from backend.app.tracing import span
+
+RETRY_STATUSES = (429, 502, 503, 504)
+
+_sessions: Dict[str, requests.Session] = {}
+_sessions_lock = threading.Lock()
+_async_client: httpx.AsyncClient | None = None
+
+
+def _host_key(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def _count_response(resp: requests.Response, *args: Any, **kwargs: Any) -> None:
+    count_upstream_response(_host_key(resp.url), resp.status_code)
+
+
+async def _count_response_async(resp: httpx.Response) -> None:
+    count_upstream_response(_host_key(str(resp.request.url)), resp.status_code)
+
+
+def _build_session() -> requests.Session:
+    # Connect errors and throttling/gateway statuses are retried; read timeouts are
+    # not, so a slow upstream still costs at most one timeout per call.
+    retry = Retry(
+        total=settings.UPSTREAM_MAX_RETRIES,
+        connect=settings.UPSTREAM_MAX_RETRIES,
+        read=0,
+        status=settings.UPSTREAM_MAX_RETRIES,
+        backoff_factor=settings.UPSTREAM_BACKOFF_FACTOR,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset({"GET"}),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=settings.UPSTREAM_POOL_MAXSIZE, max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.hooks["response"].append(_count_response)
+    return session
+
+
+def get_session(url: str) -> requests.Session:
+    """Keep-alive session for the url's host (created on first use)."""
+    key = _host_key(url)
+    session = _sessions.get(key)
+    if session is None:
+        with _sessions_lock:
+            session = _sessions.get(key)
+            if session is None:
+                session = _sessions[key] = _build_session()
+    return session
+
+
+def http_get(url: str, **kwargs: Any) -> requests.Response:
+    """Drop-in for requests.get on the pooled per-host session."""
+    parts = urlsplit(url)
+    with span("http.get", host=parts.netloc, path=parts.path) as sp:
+        resp = get_session(url).get(url, **kwargs)
+        sp.set(status_code=resp.status_code)
+        return resp
+
+
+def close_sessions() -> None:
+    with _sessions_lock:
+        sessions = list(_sessions.values())
+        _sessions.clear()
+    for session in sessions:
+        session.close()
+
+
+def connection_stats() -> Dict[str, Dict[str, int]]:
+    """
+    Per-host connection reuse counters from the urllib3 pools behind each session.
+    requests counts every attempt (retries included); reused = requests - connections_opened.
+    """
+    stats: Dict[str, Dict[str, int]] = {}
+    with _sessions_lock:
+        items = list(_sessions.items())
+    for host, session in items:
+        requests_made = 0
+        opened = 0
+        # the same adapter is mounted for http:// and https://
+        for adapter in {id(a): a for a in session.adapters.values()}.values():
+            pools = adapter.poolmanager.pools
+            for key in list(pools.keys()):
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                requests_made += pool.num_requests
+                opened += pool.num_connections
+        entry = stats.setdefault(host, {"requests": 0, "connections_opened": 0, "connections_reused": 0})
+        entry["requests"] += requests_made
+        entry["connections_opened"] += opened
+        entry["connections_reused"] += max(requests_made - opened, 0)
+    return stats
+
+
+class _TracedTransport(httpx.AsyncBaseTransport):
+    """Wraps the real transport so every async upstream request gets an http.* span."""
+
+    def __init__(self, inner: httpx.AsyncBaseTransport):
+        self._inner = inner
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        with span(f"http.{request.method.lower()}", host=request.url.host, path=request.url.path) as sp:
+            response = await self._inner.handle_async_request(request)
+            sp.set(status_code=response.status_code)
+            return response
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
+
+
+def create_async_client(transport: httpx.AsyncBaseTransport | None = None) -> httpx.AsyncClient:
+    limits = httpx.Limits(
+        max_connections=settings.UPSTREAM_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.UPSTREAM_POOL_MAXSIZE,
+    )
+    # limits apply to the pooled transport itself since the client receives a wrapper
+    inner = transport or httpx.AsyncHTTPTransport(limits=limits)
+    return httpx.AsyncClient(
+        transport=_TracedTransport(inner), event_hooks={"response": [_count_response_async]}
+    )
+
+
+def set_async_client(client: httpx.AsyncClient | None) -> httpx.AsyncClient | None:
+    """Install the process-wide async client; returns the previous one."""
+    global _async_client
+    previous = _async_client
+    _async_client = client
+    return previous
+
+
+def open_async_client() -> httpx.AsyncClient:
+    client = create_async_client()
+    set_async_client(client)
+    return client
+
+
+async def close_async_client() -> None:
+    client = set_async_client(None)
+    if client is not None:
+        await client.aclose()
+
+
+def get_async_client() -> httpx.AsyncClient:
+    global _async_client
+    if _async_client is None:
+        _async_client = create_async_client()
+    return _async_client
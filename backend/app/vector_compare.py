@@ -0,0 +1,104 @@
+"""
+Vectorized (NumPy) counterpart of services.execute_compare.
+
+Every input may be a scalar or an array; inputs are broadcast against each other,
+so a grid sweep is just a set of arrays with compatible shapes, e.g.
+
+    weights = np.linspace(0, 1, 1001)[:, None]
+    returns = np.linspace(-0.2, 0.2, 1000)[None, :]
+    cols = execute_compare_vectorized(1000, weights, 100, 2.5, "win", returns)
+
+The arithmetic is performed in the same order as the scalar function and the
+rounding reproduces Python's round(x, 2), so every column matches
+execute_compare to the cent (bit for bit).
+"""
+from typing import Dict
+
+import numpy as np
+
+RESULT_COLUMNS = (
+    "equity_allocated",
+    "equity_pnl",
+    "equity_final",
+    "bet_allocated",
+    "bet_pnl",
+    "bet_final",
+    "combined_final",
+    "roi_pct",
+)
+
+
+def round2(values: np.ndarray) -> np.ndarray:
+    """
+    Python-compatible round(x, 2) for float64 arrays.
+    np.round scales by 100 and rounds, which can disagree with Python's correctly
+    rounded decimal result when x*100 lands (almost) exactly on a .5 boundary.
+    Those near-ties are rare, so they are re-rounded with the builtin.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    shape = values.shape
+    values = values.reshape(-1)
+    scaled = values * 100.0
+    out = np.rint(scaled) / 100.0
+    frac = np.abs(scaled - np.floor(scaled) - 0.5)
+    near_tie = frac <= (np.abs(scaled) * 1e-12 + 1e-9)
+    if near_tie.any():
+        idx = np.nonzero(near_tie)
+        out[idx] = [round(float(v), 2) for v in values[idx]]
+    return out.reshape(shape)
+
+
+def _as_win_mask(outcome) -> np.ndarray:
+    arr = np.asarray(outcome)
+    if arr.dtype == np.bool_:
+        return arr
+    if arr.dtype.kind in ("U", "S", "O"):
+        return arr == "win"
+    raise ValueError("outcome must be 'win'/'loss' strings or a boolean win mask")
+
+
+def execute_compare_vectorized(
+    starting_capital,
+    equity_weight,
+    stake,
+    odds,
+    outcome,
+    equity_return_pct,
+) -> Dict[str, np.ndarray]:
+    """
+    Columnar execute_compare.
+    outcome: 'win'/'loss' (scalar or array) or a boolean array where True means win.
+    Returns a dict of rounded float64 arrays keyed by RESULT_COLUMNS, all with the
+    broadcast shape of the inputs.
+    """
+    starting_capital, equity_weight, stake, odds, win, equity_return_pct = np.broadcast_arrays(
+        np.asarray(starting_capital, dtype=np.float64),
+        np.asarray(equity_weight, dtype=np.float64),
+        np.asarray(stake, dtype=np.float64),
+        np.asarray(odds, dtype=np.float64),
+        _as_win_mask(outcome),
+        np.asarray(equity_return_pct, dtype=np.float64),
+    )
+
+    equity_alloc = starting_capital * equity_weight
+    bet_alloc = starting_capital - equity_alloc
+
+    equity_final = equity_alloc * (1 + equity_return_pct)
+    equity_pnl = equity_final - equity_alloc
+
+    bet_pnl = np.where(win, stake * (odds - 1), 0.0)
+    bet_final = bet_alloc + bet_pnl
+
+    combined_final = equity_final + bet_final
+    roi_pct = (combined_final - starting_capital) / starting_capital * 100
+
+    return {
+        "equity_allocated": round2(equity_alloc),
+        "equity_pnl": round2(equity_pnl),
+        "equity_final": round2(equity_final),
+        "bet_allocated": round2(bet_alloc),
+        "bet_pnl": round2(bet_pnl),
+        "bet_final": round2(bet_final),
+        "combined_final": round2(combined_final),
+        "roi_pct": round2(roi_pct),
+    }
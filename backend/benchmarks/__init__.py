@@ -0,0 +1,12 @@
+"""
+Benchmarks for the /compare hot path.
+
+    python -m backend.benchmarks.run                        # run, print, write results JSON
+    python -m backend.benchmarks.run --baseline backend/benchmarks/baseline.json
+    python -m backend.benchmarks.run --only execute_compare --quick
+
+Results are machine-readable JSON (see harness.write_results). With --baseline
+each benchmark's median is compared to the stored one and the run exits
+non-zero when any is slower by more than --threshold. Baselines are only
+comparable on the same machine; refresh with --save-baseline.
+"""
@@ -0,0 +1,100 @@
+"""Timing, result files and baseline comparison for backend.benchmarks."""
+from __future__ import annotations
+
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List
+
+
+def measure(fn: Callable[[], Any], number: int, repeat: int, warmup: int = 1) -> Dict[str, Any]:
+    """
+    Time `number` calls of fn, `repeat` times; stats are per call, in seconds.
+    The median of the repeats is the figure compared against baselines.
+    """
+    for _ in range(warmup):
+        fn()
+    per_call: List[float] = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        per_call.append((time.perf_counter() - t0) / number)
+    per_call.sort()
+    median = statistics.median(per_call)
+    return {
+        "unit": "s/op",
+        "number": number,
+        "repeat": repeat,
+        "min": per_call[0],
+        "median": median,
+        "p95": per_call[min(len(per_call) - 1, int(round(0.95 * (len(per_call) - 1))))],
+        "max": per_call[-1],
+        "ops_per_sec": 1.0 / median if median else None,
+    }
+
+
+def _git_rev() -> str | None:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5)
+        return out.stdout.strip() or None
+    except Exception:
+        return None
+
+
+def environment() -> Dict[str, Any]:
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git_rev": _git_rev(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def write_results(path: str, results: Dict[str, Dict[str, Any]]) -> None:
+    doc = {"meta": environment(), "benchmarks": results}
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(doc, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def load_results(path: str) -> Dict[str, Dict[str, Any]]:
+    with open(path) as f:
+        return json.load(f)["benchmarks"]
+
+
+def compare(current: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]], threshold: float) -> List[Dict[str, Any]]:
+    """
+    Per-benchmark median ratio (current / baseline). A ratio above 1 + threshold is a
+    regression; benchmarks missing from either side are reported but never fail.
+    """
+    rows = []
+    for name in sorted(set(current) | set(baseline)):
+        cur, base = current.get(name), baseline.get(name)
+        if cur is None or base is None or not base.get("median"):
+            rows.append({"name": name, "ratio": None, "status": "new" if base is None else "missing"})
+            continue
+        ratio = cur["median"] / base["median"]
+        if ratio > 1 + threshold:
+            status = "regression"
+        elif ratio < 1 - threshold:
+            status = "improvement"
+        else:
+            status = "ok"
+        rows.append({"name": name, "ratio": ratio, "status": status,
+                     "baseline": base["median"], "current": cur["median"]})
+    return rows
+
+
+def format_seconds(value: float) -> str:
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if value >= scale:
+            return f"{value / scale:.2f} {unit}"
+    return f"{value / 1e-9:.0f} ns"
@@ -0,0 +1,325 @@
+"""
+Benchmark runner: python -m backend.benchmarks.run [--quick] [--only NAME ...] [--baseline FILE]
+
+Upstreams are stubbed with the in-process FakeUpstream (no network); the history
+benchmarks run against --db-url (default: a throwaway SQLite file), so pointing it
+at Postgres measures the real database path.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+from contextlib import ExitStack, contextmanager
+from typing import Any, Callable, Dict, Iterator, List
+
+import numpy as np
+
+from backend.benchmarks.harness import compare, format_seconds, load_results, measure, write_results
+
+EVENT_ID = "3fd7cba821568399920fcea4dadad30d"
+SNAP = "2025-02-09T22:25:38Z"
+COMPARE_BODY = {
+    "starting_capital": 1000,
+    "equity_symbol": "AAPL",
+    "equity_weight": 0.7,
+    "bet": {"league": "NFL", "event_id": EVENT_ID, "stake": 100, "odds": None, "outcome": "win"},
+}
+COMPARE_URL = f"/api/v1/compare?start=2025-01-02&end=2025-12-31&odds_date={SNAP}"
+
+DEFAULT_RESULTS = os.path.join("backend", "benchmarks", "results", "latest.json")
+DEFAULT_BASELINE = os.path.join("backend", "benchmarks", "baseline.json")
+
+BENCHMARKS: Dict[str, Callable[["Context"], Dict[str, Any]]] = {}
+
+
+def benchmark(name: str):
+    def register(fn):
+        BENCHMARKS[name] = fn
+        return fn
+    return register
+
+
+class Context:
+    def __init__(self, quick: bool, db_url: str):
+        self.quick = quick
+        self.db_url = db_url
+
+    def scale(self, number: int) -> int:
+        return max(number // 10, 1) if self.quick else number
+
+    @property
+    def repeat(self) -> int:
+        return 3 if self.quick else 7
+
+
+@contextmanager
+def _patched(obj: Any, attr: str, value: Any) -> Iterator[None]:
+    previous = getattr(obj, attr)
+    setattr(obj, attr, value)
+    try:
+        yield
+    finally:
+        setattr(obj, attr, previous)
+
+
+def _compare_request():
+    from backend.app.schemas import Bet, CompareRequest
+
+    return CompareRequest(
+        starting_capital=1000,
+        equity_symbol="SPY",
+        equity_weight=0.7,
+        equity_return_pct=0.05,
+        bet=Bet(league="NFL", event_id=EVENT_ID, stake=100, odds=2.4, outcome="win"),
+    )
+
+
+# --- pure compute ----------------------------------------------------------
+
+@benchmark("execute_compare")
+def bench_execute_compare(ctx: Context) -> Dict[str, Any]:
+    from backend.app.services import execute_compare
+
+    req = _compare_request()
+    return measure(lambda: execute_compare(req), number=ctx.scale(20000), repeat=ctx.repeat)
+
+
+@benchmark("execute_compare_vectorized_10k")
+def bench_execute_compare_vectorized(ctx: Context) -> Dict[str, Any]:
+    from backend.app.vector_compare import execute_compare_vectorized
+
+    rng = np.random.default_rng(0)
+    n = 10_000
+    cols = dict(
+        starting_capital=np.full(n, 1000.0),
+        equity_weight=rng.uniform(0, 1, n),
+        stake=rng.uniform(1, 200, n),
+        odds=rng.uniform(1.1, 5, n),
+        outcome=rng.random(n) < 0.5,
+        equity_return_pct=rng.normal(0, 0.1, n),
+    )
+    return measure(lambda: execute_compare_vectorized(**cols), number=ctx.scale(50), repeat=ctx.repeat)
+
+
+# --- validation ------------------------------------------------------------
+
+@benchmark("validate_compare_input")
+def bench_validate_compare_input(ctx: Context) -> Dict[str, Any]:
+    from backend.app.schemas import CompareRequestInput
+
+    return measure(lambda: CompareRequestInput.model_validate(COMPARE_BODY), number=ctx.scale(20000), repeat=ctx.repeat)
+
+
+@benchmark("validate_bet")
+def bench_validate_bet(ctx: Context) -> Dict[str, Any]:
+    from backend.app.schemas import Bet
+
+    bet = {**COMPARE_BODY["bet"], "odds": 2.4}
+    return measure(lambda: Bet.model_validate(bet), number=ctx.scale(20000), repeat=ctx.repeat)
+
+
+# --- full /compare through the app ------------------------------------------
+
+@contextmanager
+def _stubbed_app(result_cache: str) -> Iterator[Any]:
+    """TestClient with FakeUpstream behind the async client, history saves dropped."""
+    from fastapi.testclient import TestClient
+
+    from backend.app import upstream
+    from backend.app.api.v1 import compare as compare_api
+    from backend.app.config import settings
+    from backend.app.main import app
+    from backend.tests.fake_upstream import FakeUpstream, make_bars, make_event_odds
+
+    fake = FakeUpstream()
+    fake.bars["AAPL"] = make_bars([(100.0 + i * 0.1, 100.2 + i * 0.1) for i in range(250)], start="2025-01-02")
+    fake.event_odds[EVENT_ID] = make_event_odds(
+        EVENT_ID, {"draftkings": {"Chiefs": 1.8, "Eagles": 2.2}, "fanduel": {"Chiefs": 1.75, "Eagles": 2.4}}, SNAP
+    )
+    with ExitStack() as stack:
+        for key in ("ALPACA_API_KEY", "ALPACA_API_SECRET", "ODDS_API_KEY"):
+            stack.enter_context(_patched_env(key, "bench"))
+        stack.enter_context(_patched(settings, "USE_EXTERNAL_APIS", True))
+        stack.enter_context(_patched(settings, "RESULT_CACHE_BACKEND", result_cache))
+        stack.enter_context(_patched(compare_api, "_save_history", lambda *a: None))
+        previous = upstream.set_async_client(upstream.create_async_client(transport=fake.transport()))
+        stack.callback(upstream.set_async_client, previous)
+        yield TestClient(app)
+
+
+@contextmanager
+def _patched_env(key: str, value: str) -> Iterator[None]:
+    previous = os.environ.get(key)
+    os.environ[key] = value
+    try:
+        yield
+    finally:
+        if previous is None:
+            os.environ.pop(key, None)
+        else:
+            os.environ[key] = previous
+
+
+def _post_compare(client) -> None:
+    r = client.post(COMPARE_URL, json=COMPARE_BODY)
+    if r.status_code != 200:
+        raise RuntimeError(f"/compare returned {r.status_code}: {r.text}")
+
+
+@benchmark("compare_endpoint_cold")
+def bench_compare_cold(ctx: Context) -> Dict[str, Any]:
+    """Every call misses the lookup caches: bars and odds go through the (stubbed) client."""
+    from backend.app import cache
+
+    with _stubbed_app("off") as client:
+        def call():
+            cache.clear_all(disk=False)
+            _post_compare(client)
+        return measure(call, number=ctx.scale(200), repeat=ctx.repeat)
+
+
+@benchmark("compare_endpoint_warm")
+def bench_compare_warm(ctx: Context) -> Dict[str, Any]:
+    """Lookup caches warm, result cache off: validation, assembly, execute and response."""
+    with _stubbed_app("off") as client:
+        return measure(lambda: _post_compare(client), number=ctx.scale(500), repeat=ctx.repeat)
+
+
+@benchmark("compare_endpoint_memoized")
+def bench_compare_memoized(ctx: Context) -> Dict[str, Any]:
+    with _stubbed_app("memory") as client:
+        return measure(lambda: _post_compare(client), number=ctx.scale(500), repeat=ctx.repeat)
+
+
+# --- history persistence ------------------------------------------------------
+
+def _history_rows(n: int, offset: int = 0) -> List[Dict[str, Any]]:
+    from backend.app.services import execute_compare
+
+    result = execute_compare(_compare_request())
+    return [
+        {
+            "payload": {**COMPARE_BODY, "equity_symbol": ("AAPL", "SPY", "MSFT")[(offset + i) % 3]},
+            "result": result,
+            "params": {"start": "2025-01-02", "end": "2025-12-31", "odds_date": SNAP},
+            "notes": None,
+            "request_hash": None,
+        }
+        for i in range(n)
+    ]
+
+
+@contextmanager
+def _history_db(db_url: str) -> Iterator[Any]:
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from backend.app.db.base import Base
+    from backend.app.models import ComparisonHistory
+
+    engine = create_engine(db_url)
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+    try:
+        yield Session
+    finally:
+        with Session() as db:
+            db.query(ComparisonHistory).delete()
+            db.commit()
+        engine.dispose()
+
+
+@benchmark("history_insert_bulk_1000")
+def bench_history_insert(ctx: Context) -> Dict[str, Any]:
+    from backend.app.crud.history import create_history_bulk
+
+    rows = _history_rows(1000)
+    with _history_db(ctx.db_url) as Session:
+        def call():
+            with Session() as db:
+                create_history_bulk(db, rows)
+        return measure(call, number=ctx.scale(20), repeat=ctx.repeat)
+
+
+@benchmark("history_list_page_deep")
+def bench_history_list(ctx: Context) -> Dict[str, Any]:
+    """50-row keyset page starting 5000 rows deep, filtered by symbol."""
+    from backend.app.crud.history import create_history_bulk, list_history_page
+
+    with _history_db(ctx.db_url) as Session:
+        with Session() as db:
+            create_history_bulk(db, _history_rows(20000))
+            cursor = None
+            for _ in range(10):
+                _, cursor = list_history_page(db, limit=500, cursor=cursor, symbol="AAPL")
+
+        def call():
+            with Session() as db:
+                list_history_page(db, limit=50, cursor=cursor, symbol="AAPL")
+        return measure(call, number=ctx.scale(500), repeat=ctx.repeat)
+
+
+@benchmark("history_export_20k")
+def bench_history_export(ctx: Context) -> Dict[str, Any]:
+    from backend.app.crud.history import create_history_bulk, iter_history
+    from backend.app.history_export import iter_csv
+
+    with _history_db(ctx.db_url) as Session:
+        with Session() as db:
+            create_history_bulk(db, _history_rows(20000))
+
+        def call():
+            with Session() as db:
+                for _ in iter_csv(iter_history(db)):
+                    pass
+        return measure(call, number=1, repeat=ctx.repeat)
+
+
+# --- CLI -----------------------------------------------------------------------
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the compare hot path")
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), help="run a subset")
+    parser.add_argument("--quick", action="store_true", help="a tenth of the iterations (smoke run)")
+    parser.add_argument("--db-url", default=None, help="history benchmarks database (default: temp SQLite)")
+    parser.add_argument("--out", default=DEFAULT_RESULTS, help=f"results JSON (default {DEFAULT_RESULTS})")
+    parser.add_argument("--baseline", default=None, help="compare medians against this results file")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown ratio (default 0.2 = 20%%)")
+    parser.add_argument("--save-baseline", action="store_true", help=f"also write results to {DEFAULT_BASELINE}")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        ctx = Context(args.quick, args.db_url or f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        results: Dict[str, Dict[str, Any]] = {}
+        for name in args.only or list(BENCHMARKS):
+            results[name] = BENCHMARKS[name](ctx)
+            r = results[name]
+            print(f"{name:34s} median {format_seconds(r['median']):>10s}  p95 {format_seconds(r['p95']):>10s}"
+                  f"  {r['ops_per_sec']:>12,.1f} ops/s")
+
+    write_results(args.out, results)
+    print(f"results written to {args.out}")
+    if args.save_baseline:
+        write_results(DEFAULT_BASELINE, results)
+        print(f"baseline written to {DEFAULT_BASELINE}")
+
+    if not args.baseline:
+        return 0
+    baseline = load_results(args.baseline)
+    if args.only:
+        baseline = {name: b for name, b in baseline.items() if name in results}
+    rows = compare(results, baseline, args.threshold)
+    regressions = [row for row in rows if row["status"] == "regression"]
+    for row in rows:
+        ratio = f"{row['ratio']:.2f}x" if row["ratio"] is not None else "-"
+        print(f"{row['name']:34s} {ratio:>8s}  {row['status']}")
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) slower than baseline by more than {args.threshold:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,7 @@
+-- Keyset pagination for /compare/history walks (created_at, id) in descending order.
+-- created_at must be non-null for the row comparison to be total.
+UPDATE comparison_history SET created_at = now() WHERE created_at IS NULL;
+ALTER TABLE comparison_history ALTER COLUMN created_at SET NOT NULL;
+
+CREATE INDEX IF NOT EXISTS ix_comparison_history_created_at_id
+  ON comparison_history (created_at DESC, id DESC);
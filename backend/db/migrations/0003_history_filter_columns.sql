@@ -0,0 +1,25 @@
+-- Filterable history: stored generated columns extracted from the JSONB documents,
+-- btree indexes for the /compare/history filters, and a GIN index for ad-hoc
+-- containment queries (payload @> '{"bet": {"outcome": "win"}}').
+
+ALTER TABLE comparison_history
+  ADD COLUMN IF NOT EXISTS equity_symbol TEXT
+    GENERATED ALWAYS AS (payload ->> 'equity_symbol') STORED,
+  ADD COLUMN IF NOT EXISTS event_id TEXT
+    GENERATED ALWAYS AS (payload -> 'bet' ->> 'event_id') STORED,
+  ADD COLUMN IF NOT EXISTS outcome TEXT
+    GENERATED ALWAYS AS (payload -> 'bet' ->> 'outcome') STORED,
+  ADD COLUMN IF NOT EXISTS roi_pct DOUBLE PRECISION
+    GENERATED ALWAYS AS (CAST(result ->> 'roi_pct' AS DOUBLE PRECISION)) STORED;
+
+CREATE INDEX IF NOT EXISTS ix_comparison_history_symbol_created_at
+  ON comparison_history (equity_symbol, created_at DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS ix_comparison_history_event_created_at
+  ON comparison_history (event_id, created_at DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS ix_comparison_history_roi_pct
+  ON comparison_history (roi_pct);
+
+CREATE INDEX IF NOT EXISTS ix_comparison_history_payload_gin
+  ON comparison_history USING GIN (payload jsonb_path_ops);
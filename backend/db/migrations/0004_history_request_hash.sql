@@ -0,0 +1,7 @@
+-- Result memoization: content hash of the compare request, set only on rows whose
+-- result is replayable (closed equity window, no fallback). Lookups take the newest row.
+
+ALTER TABLE comparison_history ADD COLUMN IF NOT EXISTS request_hash TEXT;
+
+CREATE INDEX IF NOT EXISTS ix_comparison_history_request_hash
+  ON comparison_history (request_hash, created_at DESC);
@@ -0,0 +1,18 @@
+"""
+Offline load testing for /api/v1/compare.
+
+1. Start the stand-in upstream (Alpaca bars + Odds API):
+
+       python -m backend.loadtest.mock_upstream --port 9100 --latency-ms 80 --error-rate 0.01
+
+2. Run the API against it:
+
+       ALPACA_DATA_BASE_URL=http://127.0.0.1:9100 ODDS_API_BASE_URL=http://127.0.0.1:9100 \
+       USE_EXTERNAL_APIS=true python -m uvicorn backend.app.main:app --port 8000
+
+3. Drive it at a fixed rate and read p50/p95/p99 and throughput:
+
+       python -m backend.loadtest.loadgen --url http://127.0.0.1:8000 --rps 50 --duration 30
+
+No real API quota is used; the mock accepts any credentials.
+"""
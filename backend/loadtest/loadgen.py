@@ -0,0 +1,177 @@
+"""
+Open-loop load generator for POST /api/v1/compare.
+
+Requests are scheduled at a fixed rate (--rps) regardless of how fast earlier
+ones finish, and latency is measured from each request's scheduled start, so a
+saturated server shows up as growing latency instead of a silently lower send
+rate. --concurrency caps requests in flight; time spent waiting for a slot
+counts towards latency.
+
+Scenarios cycle through --symbols, --events and --windows random windows
+(seeded), which sets how often the upstream caches and the result cache hit.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Any, Dict, List, Tuple
+
+import httpx
+
+COMPARE_PATH = "/api/v1/compare"
+DEFAULT_SYMBOLS = ["SPY", "AAPL", "MSFT", "NVDA", "QQQ"]
+
+
+@dataclass
+class LoadResult:
+    scheduled: int = 0
+    latencies_ms: List[float] = field(default_factory=list)
+    statuses: Counter = field(default_factory=Counter)
+    elapsed_s: float = 0.0
+
+    @property
+    def completed(self) -> int:
+        return sum(self.statuses.values())
+
+    @property
+    def ok(self) -> int:
+        return self.statuses.get("200", 0)
+
+    def percentile(self, q: float) -> float | None:
+        """Nearest-rank percentile of latency in ms (q in 0..100)."""
+        if not self.latencies_ms:
+            return None
+        ordered = sorted(self.latencies_ms)
+        rank = max(math.ceil(q * len(ordered) / 100), 1)
+        return ordered[min(rank, len(ordered)) - 1]
+
+    def summary(self) -> Dict[str, Any]:
+        lat = self.latencies_ms
+        return {
+            "scheduled": self.scheduled,
+            "completed": self.completed,
+            "ok": self.ok,
+            "error_rate": round(1 - self.ok / self.completed, 4) if self.completed else None,
+            "statuses": dict(sorted(self.statuses.items())),
+            "elapsed_s": round(self.elapsed_s, 3),
+            "throughput_rps": round(self.completed / self.elapsed_s, 2) if self.elapsed_s else None,
+            "latency_ms": {
+                "mean": round(sum(lat) / len(lat), 2) if lat else None,
+                "p50": _r(self.percentile(50)),
+                "p95": _r(self.percentile(95)),
+                "p99": _r(self.percentile(99)),
+                "max": _r(max(lat) if lat else None),
+            },
+        }
+
+
+def _r(value: float | None) -> float | None:
+    return round(value, 2) if value is not None else None
+
+
+def build_scenarios(
+    symbols: List[str], events: int, windows: int, seed: int = 0
+) -> List[Tuple[Dict[str, str], Dict[str, Any]]]:
+    """(query params, body) pairs; every combination of symbol x event x window."""
+    rng = random.Random(seed)
+    spans = []
+    for _ in range(max(windows, 1)):
+        start = date(2023, 1, 2) + timedelta(days=rng.randrange(0, 600))
+        spans.append((start, start + timedelta(days=rng.randrange(5, 180))))
+    out = []
+    for symbol in symbols:
+        for e in range(1, max(events, 1) + 1):
+            for start, end in spans:
+                params = {"start": start.isoformat(), "end": end.isoformat(), "odds_date": f"{end.isoformat()}T18:00:00Z"}
+                body = {
+                    "starting_capital": 1000,
+                    "equity_symbol": symbol,
+                    "equity_weight": round(rng.uniform(0.1, 0.9), 2),
+                    "bet": {"league": "NFL", "event_id": f"{e:032x}", "stake": 100, "outcome": rng.choice(["win", "loss"])},
+                }
+                out.append((params, body))
+    rng.shuffle(out)
+    return out
+
+
+async def run_load(
+    base_url: str,
+    rps: float,
+    duration_s: float,
+    scenarios: List[Tuple[Dict[str, str], Dict[str, Any]]],
+    concurrency: int = 256,
+    timeout_s: float = 30.0,
+    transport: httpx.AsyncBaseTransport | None = None,
+) -> LoadResult:
+    """Fire int(rps * duration_s) requests on schedule; transport lets tests target an ASGI app."""
+    result = LoadResult(scheduled=max(int(rps * duration_s), 1))
+    slots = asyncio.Semaphore(max(concurrency, 1))
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout_s, limits=limits, transport=transport) as client:
+        async def one(i: int, scheduled_at: float) -> None:
+            params, body = scenarios[i % len(scenarios)]
+            async with slots:
+                try:
+                    r = await client.post(COMPARE_PATH, params=params, json=body)
+                    status = str(r.status_code)
+                except httpx.TimeoutException:
+                    status = "timeout"
+                except httpx.HTTPError as e:
+                    status = type(e).__name__
+            result.latencies_ms.append((time.perf_counter() - scheduled_at) * 1000)
+            result.statuses[status] += 1
+
+        t0 = time.perf_counter()
+        tasks = []
+        for i in range(result.scheduled):
+            scheduled_at = t0 + i / rps
+            delay = scheduled_at - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(one(i, scheduled_at)))
+        await asyncio.gather(*tasks)
+        result.elapsed_s = time.perf_counter() - t0
+    return result
+
+
+def _print_summary(s: Dict[str, Any], rps: float) -> None:
+    lat = s["latency_ms"]
+    print(f"target {rps:g} rps  achieved {s['throughput_rps']} rps  over {s['elapsed_s']}s")
+    print(f"requests {s['completed']}/{s['scheduled']}  ok {s['ok']}  error rate {s['error_rate']}  statuses {s['statuses']}")
+    print(f"latency ms  p50 {lat['p50']}  p95 {lat['p95']}  p99 {lat['p99']}  max {lat['max']}  mean {lat['mean']}")
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Drive /api/v1/compare at a target request rate")
+    parser.add_argument("--url", default="http://127.0.0.1:8000", help="API base URL")
+    parser.add_argument("--rps", type=float, default=20.0)
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds")
+    parser.add_argument("--concurrency", type=int, default=256, help="max requests in flight")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--symbols", nargs="+", default=DEFAULT_SYMBOLS)
+    parser.add_argument("--events", type=int, default=16, help="distinct event ids")
+    parser.add_argument("--windows", type=int, default=8, help="distinct date windows")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", dest="json_path", default=None, help="also write the summary here")
+    args = parser.parse_args(argv)
+
+    scenarios = build_scenarios(args.symbols, args.events, args.windows, args.seed)
+    result = asyncio.run(run_load(args.url, args.rps, args.duration, scenarios, args.concurrency, args.timeout))
+    summary = {"target_rps": args.rps, "concurrency": args.concurrency, **result.summary()}
+    _print_summary(summary, args.rps)
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(summary, f, indent=2)
+            f.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+"""
+Stand-in HTTP server for the upstream APIs services.py calls:
+
+    GET /v2/stocks/{symbol}/bars                                        Alpaca daily bars (paged)
+    GET /v4/historical/sports/americanfootball_nfl/events/{id}/odds     Odds API historical event odds
+    GET /v4/sports/americanfootball_nfl/events                          Odds API event list
+
+Data is synthetic but deterministic (the same symbol/day or event always gives
+the same numbers), so results are stable across runs and pages. Latency,
+jitter, injected error rate/status and payload sizes (bars per page,
+bookmakers per event) are configurable. Credentials are accepted and ignored.
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+BARS_RE = re.compile(r"^/v2/stocks/(?P<symbol>[^/]+)/bars$")
+EVENT_ODDS_RE = re.compile(r"^/v4/historical/sports/americanfootball_nfl/events/(?P<event_id>[^/]+)/odds$")
+EVENTS_PATH = "/v4/sports/americanfootball_nfl/events"
+
+BOOKMAKERS = ["draftkings", "fanduel", "betmgm", "caesars", "pointsbetus", "bovada", "betrivers", "unibet_us",
+              "wynnbet", "superbook", "bet365", "espnbet"]
+TEAMS = ["Chiefs", "Eagles", "Bills", "49ers", "Ravens", "Lions", "Cowboys", "Packers"]
+
+# keep a malformed start/end from generating unbounded series
+MAX_BAR_DAYS = 366 * 30
+
+
+@dataclass
+class MockConfig:
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    error_status: int = 503
+    bars_page_size: int = 1000
+    bookmakers: int = 4
+    seed: int = 0
+
+
+def _unit(*parts: Any) -> float:
+    """Deterministic value in [0, 1) from the parts."""
+    digest = hashlib.blake2b("|".join(map(str, parts)).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big") / 2 ** 64
+
+
+def synthetic_bars(symbol: str, start: str, end: str) -> List[Dict[str, Any]]:
+    """One bar per weekday in [start, end]; prices are a smooth function of (symbol, day)."""
+    try:
+        s, e = date.fromisoformat(start[:10]), date.fromisoformat(end[:10])
+    except ValueError:
+        return []
+    e = min(e, s + timedelta(days=MAX_BAR_DAYS))
+    base = 20 + 480 * _unit("base", symbol)
+    phase = 6.28 * _unit("phase", symbol)
+    out = []
+    day = s
+    while day <= e:
+        if day.weekday() < 5:
+            n = day.toordinal()
+            o = base * (1 + 0.25 * math.sin(n / 40 + phase)) * (1 + 0.00005 * (n - 738000))
+            c = o * (1 + 0.02 * (_unit("ret", symbol, n) - 0.5))
+            out.append({
+                "t": f"{day.isoformat()}T05:00:00Z",
+                "o": round(o, 4), "h": round(max(o, c) * 1.005, 4), "l": round(min(o, c) * 0.995, 4),
+                "c": round(c, 4), "v": int(1e6 * (0.5 + _unit("vol", symbol, n))), "n": 1000, "vw": round((o + c) / 2, 4),
+            })
+        day += timedelta(days=1)
+    return out
+
+
+def synthetic_event_odds(event_id: str, snapshot: str, bookmakers: int) -> Dict[str, Any]:
+    home, away = TEAMS[int(_unit("home", event_id) * len(TEAMS))], TEAMS[int(_unit("away", event_id) * len(TEAMS))]
+    if home == away:
+        away = TEAMS[(TEAMS.index(home) + 1) % len(TEAMS)]
+    books = []
+    for i in range(max(bookmakers, 0)):
+        key = BOOKMAKERS[i % len(BOOKMAKERS)] + ("" if i < len(BOOKMAKERS) else f"_{i}")
+        p_home = 0.35 + 0.3 * _unit("p", event_id)
+        margin = 1.04 + 0.03 * _unit("m", event_id, key)
+        books.append({
+            "key": key,
+            "title": key,
+            "last_update": snapshot,
+            "markets": [{
+                "key": "h2h",
+                "last_update": snapshot,
+                "outcomes": [
+                    {"name": home, "price": round(1 / (p_home * margin), 2)},
+                    {"name": away, "price": round(1 / ((1 - p_home) * margin), 2)},
+                ],
+            }],
+        })
+    return {
+        "timestamp": snapshot,
+        "previous_timestamp": None,
+        "next_timestamp": None,
+        "data": {
+            "id": event_id,
+            "sport_key": "americanfootball_nfl",
+            "commence_time": snapshot,
+            "home_team": home,
+            "away_team": away,
+            "bookmakers": books,
+        },
+    }
+
+
+class MockUpstreamServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], config: MockConfig):
+        super().__init__(address, _Handler)
+        self.config = config
+        self._rng = random.Random(config.seed)
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.errors_injected = 0
+
+    def should_fail(self) -> bool:
+        with self._lock:
+            self.requests += 1
+            fail = self.config.error_rate > 0 and self._rng.random() < self.config.error_rate
+            if fail:
+                self.errors_injected += 1
+            return fail
+
+    def delay(self) -> float:
+        cfg = self.config
+        with self._lock:
+            jitter = self._rng.uniform(-cfg.jitter_ms, cfg.jitter_ms) if cfg.jitter_ms else 0.0
+        return max(cfg.latency_ms + jitter, 0.0) / 1000
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real upstreams
+    server: MockUpstreamServer
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def _send(self, status: int, body: Any) -> None:
+        raw = json.dumps(body, separators=(",", ":")).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(raw)))
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def do_GET(self) -> None:
+        delay = self.server.delay()
+        if delay:
+            time.sleep(delay)
+        if self.server.should_fail():
+            self._send(self.server.config.error_status, {"message": "injected error"})
+            return
+        url = urlsplit(self.path)
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+
+        m = BARS_RE.match(url.path)
+        if m:
+            bars = synthetic_bars(m.group("symbol"), query.get("start", ""), query.get("end", ""))
+            offset = int(query.get("page_token") or 0)
+            size = max(min(self.server.config.bars_page_size, int(query.get("limit") or 10000)), 1)
+            page = bars[offset:offset + size]
+            token = str(offset + size) if offset + size < len(bars) else None
+            self._send(200, {"bars": page, "symbol": m.group("symbol"), "next_page_token": token})
+            return
+        m = EVENT_ODDS_RE.match(url.path)
+        if m:
+            snapshot = query.get("date") or "2025-01-01T00:00:00Z"
+            self._send(200, synthetic_event_odds(m.group("event_id"), snapshot, self.server.config.bookmakers))
+            return
+        if url.path == EVENTS_PATH:
+            self._send(200, [
+                {"id": f"{i:032x}", "sport_key": "americanfootball_nfl", "home_team": TEAMS[i % len(TEAMS)],
+                 "away_team": TEAMS[(i + 1) % len(TEAMS)]}
+                for i in range(1, 17)
+            ])
+            return
+        self._send(404, {"message": "unknown route"})
+
+
+def start_in_thread(config: MockConfig | None = None, host: str = "127.0.0.1", port: int = 0) -> MockUpstreamServer:
+    """Serve on a daemon thread (port 0 picks a free port); stop with server.shutdown()."""
+    server = MockUpstreamServer((host, port), config or MockConfig())
+    threading.Thread(target=server.serve_forever, name="mock-upstream", daemon=True).start()
+    return server
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Local stand-in for the Alpaca bars and Odds API endpoints")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="added to every response")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="uniform +/- around latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with --error-status")
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--bars-page-size", type=int, default=1000, help="max bars per page (payload size)")
+    parser.add_argument("--bookmakers", type=int, default=4, help="bookmakers per event odds payload")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    config = MockConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        bars_page_size=args.bars_page_size,
+        bookmakers=args.bookmakers,
+        seed=args.seed,
+    )
+    server = MockUpstreamServer((args.host, args.port), config)
+    print(f"mock upstream on {server.base_url} "
+          f"(latency {config.latency_ms}ms +/- {config.jitter_ms}ms, error rate {config.error_rate})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"served {server.requests} requests, {server.errors_injected} injected errors")
+
+
+if __name__ == "__main__":
+    main()
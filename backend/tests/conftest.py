@@ -21,4 +21,30 @@ def disable_external_apis(monkeypatch):
         from backend.app.config import settings
         monkeypatch.setattr(settings, "USE_EXTERNAL_APIS", False)
     except Exception:
-        pass
\ No newline at end of file
+        pass
+
+@pytest.fixture(autouse=True)
+def reset_caches():
+    """Upstream lookup caches are process-wide; start every test cold."""
+    from backend.app import cache
+    cache.clear_all(disk=False)
+    yield
+    cache.clear_all(disk=False)
+
+@pytest.fixture
+def fake_upstream(monkeypatch):
+    """
+    Route the shared async upstream client to an in-process FakeUpstream
+    and enable external APIs with dummy credentials.
+    """
+    from backend.app import config, upstream
+    from backend.tests.fake_upstream import FakeUpstream
+
+    fake = FakeUpstream()
+    monkeypatch.setattr(config.settings, "USE_EXTERNAL_APIS", True)
+    monkeypatch.setenv("ALPACA_API_KEY", "test")
+    monkeypatch.setenv("ALPACA_API_SECRET", "test")
+    monkeypatch.setenv("ODDS_API_KEY", "test")
+    previous = upstream.set_async_client(upstream.create_async_client(transport=fake.transport()))
+    yield fake
+    upstream.set_async_client(previous)
@@ -0,0 +1,78 @@
+"""
+In-process stand-in for the Alpaca bars and Odds API endpoints used by services.py.
+Plugs into httpx via MockTransport, so the async pipeline runs end to end without network.
+"""
+import asyncio
+import re
+from datetime import date, timedelta
+from typing import Any, Dict, List, Tuple
+
+import httpx
+
+BARS_RE = re.compile(r"^/v2/stocks/(?P<symbol>[^/]+)/bars$")
+EVENT_ODDS_RE = re.compile(r"^/v4/historical/sports/americanfootball_nfl/events/(?P<event_id>[^/]+)/odds$")
+
+
+def make_bars(opens_closes: List[Tuple[float, float]], start: str = "2025-02-03") -> List[Dict[str, Any]]:
+    """One bar per calendar day from start."""
+    day = date.fromisoformat(start)
+    return [
+        {"t": f"{day + timedelta(days=i)}T05:00:00Z", "o": o, "h": max(o, c), "l": min(o, c), "c": c, "v": 1000}
+        for i, (o, c) in enumerate(opens_closes)
+    ]
+
+
+def make_event_odds(event_id: str, prices: Dict[str, Dict[str, float]], timestamp: str) -> Dict[str, Any]:
+    """prices: {bookmaker_key: {team_name: decimal_price}}"""
+    return {
+        "timestamp": timestamp,
+        "previous_timestamp": None,
+        "next_timestamp": None,
+        "data": {
+            "id": event_id,
+            "sport_key": "americanfootball_nfl",
+            "bookmakers": [
+                {
+                    "key": bk,
+                    "markets": [{"key": "h2h", "outcomes": [{"name": n, "price": p} for n, p in outcomes.items()]}],
+                }
+                for bk, outcomes in prices.items()
+            ],
+        },
+    }
+
+
+class FakeUpstream:
+    def __init__(self, latency: float = 0.0, page_size: int | None = None):
+        self.latency = latency
+        self.page_size = page_size
+        self.bars: Dict[str, List[Dict[str, Any]]] = {}
+        self.event_odds: Dict[str, Dict[str, Any]] = {}
+        self.calls: List[str] = []
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        self.calls.append(request.url.path)
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        m = BARS_RE.match(request.url.path)
+        if m:
+            bars = self.bars.get(m.group("symbol"))
+            if bars is None:
+                return httpx.Response(404, json={"message": "not found"})
+            q = request.url.params
+            bars = [b for b in bars if q.get("start", "") <= b["t"][:10] <= q.get("end", "9999")]
+            offset = int(q.get("page_token", 0))
+            size = min(self.page_size or len(bars) or 1, int(q.get("limit", 10000)))
+            page = bars[offset:offset + size]
+            token = str(offset + size) if offset + size < len(bars) else None
+            return httpx.Response(200, json={"bars": page, "symbol": m.group("symbol"), "next_page_token": token})
+        m = EVENT_ODDS_RE.match(request.url.path)
+        if m:
+            payload = self.event_odds.get(m.group("event_id"))
+            if payload is None:
+                return httpx.Response(404, json={"message": "Event not found"})
+            return httpx.Response(200, json=payload)
+        return httpx.Response(404, json={"message": "unknown route"})
+
+    def transport(self) -> httpx.MockTransport:
+        return httpx.MockTransport(self.handler)
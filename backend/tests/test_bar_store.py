@@ -0,0 +1,144 @@
+import asyncio
+import threading
+import time
+from datetime import date, timedelta
+
+import pytest
+
+from backend.app import bar_store, bars, services
+from backend.app.bar_store import BarStore, NOT_COVERED
+
+
+class _Resp:
+    def __init__(self, body):
+        self._body = body
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self._body
+
+
+def _bars(start: date, n: int):
+    out = []
+    day = start
+    while len(out) < n:
+        if day.weekday() < 5:
+            price = 100.0 + len(out)
+            out.append({"t": f"{day.isoformat()}T05:00:00Z", "o": price, "c": price + 0.5})
+        day += timedelta(days=1)
+    return out
+
+
+@pytest.fixture
+def paged_alpaca(monkeypatch):
+    """Serve a fixed bar series two bars per page, honouring start/end/page_token."""
+    monkeypatch.setenv("ALPACA_API_KEY", "test")
+    monkeypatch.setenv("ALPACA_API_SECRET", "test")
+    series = _bars(date(2024, 1, 1), 300)
+    requests_seen = []
+
+    def fake_get(url, headers=None, params=None, timeout=None):
+        requests_seen.append(params)
+        window = [b for b in series if params["start"] <= b["t"][:10] <= params["end"]]
+        offset = int(params.get("page_token", 0))
+        page = window[offset:offset + 2]
+        token = str(offset + 2) if offset + 2 < len(window) else None
+        return _Resp({"bars": page, "next_page_token": token})
+
+    monkeypatch.setattr(bars, "http_get", fake_get)
+    return series, requests_seen
+
+
+def test_backfill_walks_pages_and_answers_windows(tmp_path, paged_alpaca):
+    series, requests_seen = paged_alpaca
+    store = BarStore(str(tmp_path))
+    assert store.backfill("spy", "2024-01-01", "2024-03-31") == 65
+    assert len(requests_seen) == 33
+
+    in_window = [b for b in series if "2024-02-05" <= b["t"][:10] <= "2024-03-15"]
+    expected = (in_window[-1]["c"] - in_window[0]["o"]) / in_window[0]["o"]
+    assert store.window_return("SPY", "2024-02-05", "2024-03-15") == pytest.approx(expected)
+    # weekend-only window: fewer than two bars
+    assert store.window_return("SPY", "2024-01-06", "2024-01-07") is None
+    # outside the backfilled range
+    assert store.window_return("SPY", "2023-12-01", "2024-01-10") is NOT_COVERED
+    assert store.window_return("SPY", "2024-03-01", "2024-04-10") is NOT_COVERED
+    assert store.window_return("QQQ", "2024-02-01", "2024-02-10") is NOT_COVERED
+
+
+def test_topup_extends_range(tmp_path, paged_alpaca, monkeypatch):
+    monkeypatch.setattr(bar_store, "_last_closed_day", lambda: date(2024, 5, 31))
+    store = BarStore(str(tmp_path))
+    store.backfill("SPY", "2024-01-01", "2024-03-31")
+    assert store.window_return("SPY", "2024-03-01", "2024-05-15") is NOT_COVERED
+    store.topup("SPY")
+    bars, meta = store.load("SPY")
+    assert meta == {"first_day": "2024-01-01", "synced_through": "2024-05-31", "covered": [["2024-01-01", "2024-05-31"]]}
+    assert list(bars["day"]) == sorted(set(bars["day"]))
+    assert store.window_return("SPY", "2024-03-01", "2024-05-15") is not NOT_COVERED
+
+
+def test_disjoint_backfills_leave_the_gap_uncovered(tmp_path, paged_alpaca):
+    store = BarStore(str(tmp_path))
+    store.backfill("SPY", "2024-01-01", "2024-03-31")
+    store.backfill("SPY", "2024-06-01", "2024-06-30")
+
+    assert store.load("SPY")[1]["covered"] == [["2024-01-01", "2024-03-31"], ["2024-06-01", "2024-06-30"]]
+    assert store.window_return("SPY", "2024-04-01", "2024-05-15") is NOT_COVERED
+    assert store.window_return("SPY", "2024-03-01", "2024-06-15") is NOT_COVERED
+    assert store.window_return("SPY", "2024-06-03", "2024-06-28") is not NOT_COVERED
+
+    # filling the gap joins the ranges
+    store.backfill("SPY", "2024-04-01", "2024-05-31")
+    assert store.load("SPY")[1]["covered"] == [["2024-01-01", "2024-06-30"]]
+    assert store.window_return("SPY", "2024-03-01", "2024-06-15") is not NOT_COVERED
+
+
+def test_fetch_equity_return_reads_store_without_network(tmp_path, paged_alpaca, monkeypatch):
+    BarStore(str(tmp_path)).backfill("SPY", "2024-01-01", "2024-03-31")
+    monkeypatch.setattr(services.settings, "BAR_STORE_DIR", str(tmp_path))
+    monkeypatch.setattr(services, "_fetch_equity_return_pct_uncached",
+                        lambda *a: pytest.fail("network fetch for a stored window"))
+    # 2024-01-02 is the second weekday bar (open 101), 2024-01-31 the 23rd (close 122.5)
+    assert services.fetch_equity_return_pct("SPY", "2024-01-02", "2024-01-31") == pytest.approx(
+        (122.5 - 101.0) / 101.0
+    )
+
+
+def test_async_equity_return_reads_store_and_cache_off_the_event_loop(monkeypatch):
+    readers = []
+
+    class SlowStore:
+        def window_return(self, symbol, start, end):
+            readers.append(threading.get_ident())
+            time.sleep(0.2)
+            return NOT_COVERED
+
+    monkeypatch.setattr(services, "get_bar_store", lambda: SlowStore())
+
+    async def fetch(*args):
+        return 0.05
+
+    monkeypatch.setattr(services, "_fetch_equity_return_pct_uncached_async", fetch)
+
+    async def run():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        task = asyncio.create_task(ticker())
+        value = await services.fetch_equity_return_pct_async("SPY", "2024-01-02", "2024-01-31")
+        task.cancel()
+        return threading.get_ident(), value, ticks
+
+    loop_thread, value, ticks = asyncio.run(run())
+    assert value == 0.05
+    assert readers and loop_thread not in readers
+    # the loop kept running while the store miss was being read
+    assert ticks >= 5
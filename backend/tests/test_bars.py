@@ -0,0 +1,87 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from backend.app import bars, services
+from backend.app.bars import BarAggregate, chunk_windows
+from backend.tests.fake_upstream import make_bars
+
+
+def _series(n: int, seed: int = 3):
+    rng = np.random.default_rng(seed)
+    closes = 100 * np.cumprod(1 + rng.normal(0, 0.01, n))
+    opens = np.concatenate([[100.0], closes[:-1]])
+    return [(float(o), float(c)) for o, c in zip(opens, closes)]
+
+
+def test_aggregate_matches_full_series():
+    series = _series(500)
+    bars = make_bars(series, start="2020-01-01")
+    agg = BarAggregate()
+    for i in range(0, len(bars), 37):  # arbitrary page size
+        agg.add_page(bars[i:i + 37])
+
+    closes = np.array([c for _, c in series])
+    returns = closes[1:] / closes[:-1] - 1
+    peak = np.maximum.accumulate(closes)
+    assert agg.count == 500
+    assert agg.equity_return() == pytest.approx((closes[-1] - series[0][0]) / series[0][0])
+    assert agg.volatility() == pytest.approx(float(np.std(returns, ddof=1)))
+    assert agg.max_drawdown == pytest.approx(float(np.max((peak - closes) / peak)))
+
+
+def test_single_bar_has_no_return():
+    agg = BarAggregate()
+    agg.add({"o": 10.0, "c": 11.0})
+    assert agg.equity_return() is None
+    assert agg.stats()["volatility"] is None
+
+
+def test_chunk_windows_cover_range():
+    chunks = chunk_windows("2020-01-01", "2022-03-01", 365)
+    assert chunks[0] == ("2020-01-01", "2020-12-30")
+    assert chunks[-1][1] == "2022-03-01"
+    assert len(chunks) == 3
+    assert chunk_windows("2020-01-01", "2020-01-01", 365) == [("2020-01-01", "2020-01-01")]
+
+
+def test_long_window_walks_every_page(fake_upstream, monkeypatch):
+    """Multi-year window: more bars than one page; the old single request capped at 100."""
+    monkeypatch.setattr(services.settings, "BARS_CHUNK_DAYS", 200)
+    fake_upstream.page_size = 50
+    series = _series(900)
+    fake_upstream.bars["SPY"] = make_bars(series, start="2021-01-01")
+    expected = (series[-1][1] - series[0][0]) / series[0][0]
+
+    got = asyncio.run(services.fetch_equity_return_pct_async("SPY", "2021-01-01", "2023-12-31"))
+    assert got == pytest.approx(expected)
+    assert len(fake_upstream.calls) > 900 // 50
+
+
+def test_sync_reader_prefetches_chunks_in_order(monkeypatch):
+    monkeypatch.setenv("ALPACA_API_KEY", "test")
+    monkeypatch.setenv("ALPACA_API_SECRET", "test")
+    monkeypatch.setattr(services.settings, "BARS_CHUNK_DAYS", 90)
+    series = _series(400)
+    all_bars = make_bars(series, start="2021-01-01")
+
+    class _Resp:
+        def __init__(self, body):
+            self._body = body
+
+        def raise_for_status(self):
+            pass
+
+        def json(self):
+            return self._body
+
+    def fake_get(url, headers=None, params=None, timeout=None):
+        window = [b for b in all_bars if params["start"] <= b["t"][:10] <= params["end"]]
+        return _Resp({"bars": window, "next_page_token": None})
+
+    monkeypatch.setattr(bars, "http_get", fake_get)
+    pages = list(bars.iter_bar_pages("SPY", "2021-01-01", "2022-02-04", {}))
+    assert len(pages) == 5
+    assert [b["t"] for page in pages for b in page] == [b["t"] for b in all_bars]
+    assert services.fetch_equity_window_stats("SPY", "2021-01-01", "2022-02-04")["bars"] == 400
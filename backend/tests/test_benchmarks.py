@@ -0,0 +1,27 @@
+from backend.benchmarks import harness, run
+
+
+def test_measure_reports_per_call_stats():
+    calls = []
+    stats = harness.measure(lambda: calls.append(1), number=10, repeat=3, warmup=2)
+    assert len(calls) == 32
+    assert stats["min"] <= stats["median"] <= stats["p95"] <= stats["max"]
+    assert stats["ops_per_sec"] > 0
+
+
+def test_compare_flags_regressions_beyond_threshold():
+    baseline = {"a": {"median": 1.0}, "b": {"median": 1.0}, "c": {"median": 1.0}, "gone": {"median": 1.0}}
+    current = {"a": {"median": 1.1}, "b": {"median": 1.5}, "c": {"median": 0.5}, "new": {"median": 1.0}}
+    status = {row["name"]: row["status"] for row in harness.compare(current, baseline, threshold=0.2)}
+    assert status == {"a": "ok", "b": "regression", "c": "improvement", "gone": "missing", "new": "new"}
+
+
+def test_runner_quick_subset_writes_results(tmp_path):
+    out = tmp_path / "results.json"
+    baseline = tmp_path / "baseline.json"
+    harness.write_results(str(baseline), {"execute_compare": {"median": 1e-9}})
+    # a 1ns baseline is unbeatable: the run must report a regression
+    code = run.main(["--quick", "--only", "execute_compare", "validate_bet", "--out", str(out),
+                     "--baseline", str(baseline)])
+    assert code == 1
+    assert set(harness.load_results(str(out))) == {"execute_compare", "validate_bet"}
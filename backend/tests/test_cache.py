@@ -0,0 +1,77 @@
+import time
+
+from backend.app import services
+from backend.app.cache import TTLCache, MISSING
+
+
+def test_lru_eviction_and_stats():
+    c = TTLCache("test_lru", maxsize=2)
+    c.set(("a",), 1)
+    c.set(("b",), 2)
+    assert c.get(("a",)) == 1      # a becomes most recent
+    c.set(("c",), 3)               # evicts b
+    assert c.get(("b",)) is MISSING
+    assert c.get(("c",)) == 3
+    stats = c.stats()
+    assert stats["hits"] == 2 and stats["misses"] == 1 and stats["evictions"] == 1
+    assert stats["size"] == 2
+
+
+def test_ttl_expiry(monkeypatch):
+    c = TTLCache("test_ttl", maxsize=10)
+    now = time.time()
+    c.set(("open",), 0.5, ttl=60)
+    c.set(("closed",), 0.1, ttl=None)
+    monkeypatch.setattr(time, "time", lambda: now + 61)
+    assert c.get(("open",)) is MISSING
+    assert c.get(("closed",)) == 0.1
+
+
+def test_disk_tier_survives_restart(tmp_path):
+    path = str(tmp_path / "equity_return.sqlite3")
+    TTLCache("test_disk", maxsize=10, disk_path=path).set(("SPY", "2024-01-02", "2024-02-01"), 0.042)
+    fresh = TTLCache("test_disk", maxsize=10, disk_path=path)
+    assert fresh.get(("SPY", "2024-01-02", "2024-02-01")) == 0.042
+    assert fresh.stats()["disk_hits"] == 1
+
+
+def test_equity_return_cached_per_window(monkeypatch):
+    calls = []
+    monkeypatch.setattr(services, "_fetch_equity_return_pct_uncached",
+                        lambda s, a, b: calls.append((s, a, b)) or 0.05)
+    assert services.fetch_equity_return_pct("SPY", "2024-01-02", "2024-02-01") == 0.05
+    assert services.fetch_equity_return_pct("SPY", "2024-01-02", "2024-02-01") == 0.05
+    assert services.fetch_equity_return_pct("SPY", "2024-01-02", "2024-03-01") == 0.05
+    assert len(calls) == 2
+
+
+def test_equity_failures_not_cached(monkeypatch):
+    calls = []
+    monkeypatch.setattr(services, "_fetch_equity_return_pct_uncached", lambda *a: calls.append(a))
+    assert services.fetch_equity_return_pct("SPY", "2024-01-02", "2024-02-01") is None
+    assert services.fetch_equity_return_pct("SPY", "2024-01-02", "2024-02-01") is None
+    assert len(calls) == 2
+
+
+def test_equity_cache_ttl_policy():
+    assert services._equity_cache_ttl("2024-02-01") is None
+    assert services._equity_cache_ttl("2999-01-01") == services.settings.EQUITY_CACHE_OPEN_TTL_SEC
+    assert services.equity_window_closed("2024-02-01")
+    assert not services.equity_window_closed("2999-01-01")
+    assert not services.equity_window_closed("not a date")
+
+
+def test_event_odds_payload_cached_and_reused(monkeypatch):
+    payload = {"data": {"id": "e1", "bookmakers": [
+        {"key": "draftkings", "markets": [{"key": "h2h", "outcomes": [
+            {"name": "Chiefs", "price": 1.8}, {"name": "Eagles", "price": 2.2}]}]},
+        {"key": "fanduel", "markets": [{"key": "h2h", "outcomes": [
+            {"name": "Chiefs", "price": 1.75}, {"name": "Eagles", "price": 2.4}]}]},
+    ]}}
+    calls = []
+    monkeypatch.setattr(services, "_fetch_nfl_event_odds_uncached", lambda e, ts: calls.append((e, ts)) or payload)
+
+    assert services.fetch_nfl_moneyline_odds("e1", "2025-02-09T22:25:38Z") == 2.4
+    cached = services.fetch_nfl_event_odds("e1", "2025-02-09T22:25:38Z")
+    assert services.best_h2h_quote(cached) == {"best_price": 2.4, "best_team": "Eagles", "best_bookmaker": "fanduel"}
+    assert len(calls) == 1
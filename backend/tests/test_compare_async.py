@@ -0,0 +1,73 @@
+import asyncio
+import time
+
+from fastapi.testclient import TestClient
+from backend.app.main import app
+from backend.app import services
+from backend.app.api.v1 import compare as compare_api
+from backend.tests.fake_upstream import make_bars, make_event_odds
+
+client = TestClient(app)
+
+EVENT_ID = "3fd7cba821568399920fcea4dadad30d"
+SNAP = "2025-02-09T22:25:38Z"
+BODY = {
+    "starting_capital": 1000,
+    "equity_symbol": "AAPL",
+    "equity_weight": 0.7,
+    "bet": {"league": "NFL", "event_id": EVENT_ID, "stake": 100, "odds": None, "outcome": "win"}
+}
+
+
+def _seed(fake):
+    fake.bars["AAPL"] = make_bars([(100.0, 101.0), (101.0, 104.0), (104.0, 110.0)])
+    fake.event_odds[EVENT_ID] = make_event_odds(
+        EVENT_ID, {"draftkings": {"Chiefs": 1.8, "Eagles": 2.2}, "fanduel": {"Chiefs": 1.75, "Eagles": 2.4}}, SNAP
+    )
+
+
+def test_compare_uses_async_upstream(fake_upstream, monkeypatch):
+    monkeypatch.setattr(compare_api, "_save_history", lambda *a: None)
+    _seed(fake_upstream)
+    r = client.post(f"/api/v1/compare?start=2025-02-02&end=2025-02-10&odds_date={SNAP}", json=BODY)
+    assert r.status_code == 200
+    data = r.json()
+    assert data["equity"]["pnl"] == 70.0  # 700 * (110 - 100) / 100
+    assert data["bet"]["pnl"] == 140.0    # best price 2.4
+    assert data["odds_meta"] == {"snapshot_timestamp": SNAP, "resolved_odds": 2.4, "fallback_used": False}
+    assert sorted(fake_upstream.calls) == [
+        "/v2/stocks/AAPL/bars",
+        f"/v4/historical/sports/americanfootball_nfl/events/{EVENT_ID}/odds",
+    ]
+
+
+def test_compare_async_falls_back_on_upstream_404(fake_upstream, monkeypatch):
+    monkeypatch.setattr(compare_api, "_save_history", lambda *a: None)
+    r = client.post(f"/api/v1/compare?start=2025-02-02&end=2025-02-10&odds_date={SNAP}", json=BODY)
+    assert r.status_code == 200
+    data = r.json()
+    assert data["equity"]["pnl"] == 0.0
+    assert data["odds_meta"]["fallback_used"] is True
+    assert data["odds_meta"]["resolved_odds"] == services.FALLBACK_ODDS
+
+
+def test_async_legs_are_awaited_together(fake_upstream):
+    _seed(fake_upstream)
+    fake_upstream.latency = 0.3
+
+    async def run():
+        return await services.build_compare_request_with_live_data_async(
+            starting_capital=1000,
+            equity_symbol="AAPL",
+            equity_weight=0.5,
+            bet_data=BODY["bet"],
+            start="2025-02-02",
+            end="2025-02-10",
+            odds_date=SNAP,
+        )
+
+    t0 = time.perf_counter()
+    req = asyncio.run(run())
+    assert time.perf_counter() - t0 < 0.55
+    assert req.equity_return_pct == 0.1
+    assert req.bet.odds == 2.4
@@ -0,0 +1,77 @@
+from fastapi.testclient import TestClient
+from backend.app.main import app
+from backend.app import config, services
+from backend.app.api.v1 import compare as compare_api
+
+client = TestClient(app)
+
+EVENT_A = "3fd7cba821568399920fcea4dadad30d"
+EVENT_B = "aaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa"
+
+
+def _scenario(symbol="AAPL", weight=0.7, event_id=EVENT_A, odds=None, outcome="win",
+              start="2025-02-02", end="2025-02-10", odds_date="2025-02-09T22:25:38Z"):
+    return {
+        "starting_capital": 1000,
+        "equity_symbol": symbol,
+        "equity_weight": weight,
+        "start": start,
+        "end": end,
+        "odds_date": odds_date,
+        "bet": {"league": "NFL", "event_id": event_id, "stake": 100, "odds": odds, "outcome": outcome},
+    }
+
+
+def test_batch_dedupes_upstream_lookups_and_bulk_saves(monkeypatch):
+    monkeypatch.setattr(config.settings, "USE_EXTERNAL_APIS", True)
+    equity_calls, odds_calls, saved = [], [], []
+    monkeypatch.setattr(services, "fetch_equity_return_pct",
+                        lambda s, a, b: equity_calls.append((s, a, b)) or 0.1)
+    monkeypatch.setattr(services, "fetch_nfl_moneyline_odds",
+                        lambda e, d: odds_calls.append((e, d)) or 2.5)
+    monkeypatch.setattr(compare_api, "_save_history_bulk", lambda rows: saved.append(rows))
+
+    body = {"scenarios": [
+        _scenario(weight=0.7),
+        _scenario(weight=0.5, outcome="loss"),
+        _scenario(symbol="spy", weight=0.3),
+        _scenario(event_id=EVENT_B),
+        _scenario(odds=3.0),  # fixed odds: no odds lookup
+    ]}
+    r = client.post("/api/v1/compare/batch", json=body)
+    assert r.status_code == 200
+    data = r.json()
+    assert data["count"] == 5
+    assert sorted(equity_calls) == [("AAPL", "2025-02-02", "2025-02-10"), ("SPY", "2025-02-02", "2025-02-10")]
+    assert sorted(odds_calls) == sorted([(EVENT_A, "2025-02-09T22:25:38Z"), (EVENT_B, "2025-02-09T22:25:38Z")])
+
+    first = data["results"][0]
+    assert first["equity"]["pnl"] == 70.0
+    assert first["bet"]["pnl"] == 150.0
+    assert first["odds_meta"]["resolved_odds"] == 2.5
+    assert data["results"][4]["odds_meta"]["resolved_odds"] == 3.0
+
+    assert len(saved) == 1 and len(saved[0]) == 5
+    assert saved[0][2]["payload"]["equity_symbol"] == "SPY"
+
+
+def test_batch_matches_single_compare(monkeypatch):
+    monkeypatch.setattr(compare_api, "_save_history", lambda *a: None)
+    monkeypatch.setattr(compare_api, "_save_history_bulk", lambda rows: None)
+    sc = _scenario(odds_date=None)
+    single_body = {k: v for k, v in sc.items() if k not in ("start", "end", "odds_date")}
+    single = client.post("/api/v1/compare?start=2025-02-02&end=2025-02-10", json=single_body).json()
+    batch = client.post("/api/v1/compare/batch", json={"scenarios": [sc]}).json()
+    assert batch["results"][0] == single
+
+
+def test_batch_reports_invalid_scenario_index():
+    body = {"scenarios": [_scenario(), _scenario(start="2025-03-05", end="2025-03-01")]}
+    r = client.post("/api/v1/compare/batch", json=body)
+    assert r.status_code == 422
+    assert "scenarios[1]: start must be <= end" in r.text
+
+
+def test_batch_rejects_empty():
+    r = client.post("/api/v1/compare/batch", json={"scenarios": []})
+    assert r.status_code == 422
@@ -0,0 +1,62 @@
+from fastapi.testclient import TestClient
+from backend.app.main import app
+from backend.app import config, services
+from backend.app.schemas import CompareRequest, Bet
+
+client = TestClient(app)
+
+BODY = {
+    "starting_capital": 1000,
+    "equity_symbol": "AAPL",
+    "bet": {
+        "league": "NFL",
+        "event_id": "3fd7cba821568399920fcea4dadad30d",
+        "stake": 100,
+        "odds": None,
+        "outcome": "win"
+    }
+}
+URL = "/api/v1/compare/sweep?start=2025-02-02&end=2025-02-10&odds_date=2025-02-09T22:25:38Z"
+
+
+def test_sweep_fetches_once_and_matches_compare(monkeypatch):
+    monkeypatch.setattr(config.settings, "USE_EXTERNAL_APIS", True)
+    calls = []
+    monkeypatch.setattr(services, "fetch_equity_return_pct", lambda *a: calls.append("eq") or 0.1)
+    monkeypatch.setattr(services, "fetch_nfl_moneyline_odds", lambda *a: calls.append("odds") or 2.5)
+
+    r = client.post(URL, json=BODY)
+    assert r.status_code == 200
+    data = r.json()
+    assert sorted(calls) == ["eq", "odds"]
+    assert len(data["curve"]) == 21
+    assert data["curve"][6]["equity_weight"] == 0.3
+    assert data["odds_meta"]["resolved_odds"] == 2.5
+
+    for point in (data["curve"][0], data["curve"][14], data["curve"][20]):
+        for outcome in ("win", "loss"):
+            single = services.execute_compare(CompareRequest(
+                starting_capital=1000,
+                equity_symbol="AAPL",
+                equity_weight=point["equity_weight"],
+                equity_return_pct=0.1,
+                bet=Bet(**{**BODY["bet"], "odds": 2.5, "outcome": outcome}),
+            ))
+            assert point[outcome] == {"combined_final": single["combined_final"], "roi_pct": single["roi_pct"]}
+
+    # positive equity return and a fixed stake: both branches peak fully invested
+    assert data["best"]["loss"]["equity_weight"] == 1.0
+    assert data["best"]["win"]["equity_weight"] == 1.0
+    assert data["best"]["win"]["roi_pct"] == max(p["win"]["roi_pct"] for p in data["curve"])
+
+
+def test_sweep_custom_range():
+    body = {**BODY, "weight_min": 0.2, "weight_max": 0.5, "weight_step": 0.1}
+    data = client.post(URL, json=body).json()
+    assert [p["equity_weight"] for p in data["curve"]] == [0.2, 0.3, 0.4, 0.5]
+
+
+def test_sweep_rejects_inverted_range():
+    r = client.post(URL, json={**BODY, "weight_min": 0.8, "weight_max": 0.2})
+    assert r.status_code == 422
+    assert "weight_min must be <= weight_max" in r.text
@@ -0,0 +1,330 @@
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import pytest
+
+from backend.app import historcal_coverage as hc
+
+EVENT_ID = "3fd7cba821568399920fcea4dadad30d"
+BASE = datetime(2025, 2, 9, 18, 0, tzinfo=timezone.utc)
+# 5-minute snapshots; the event is listed in 10..40 and priced in 10..35
+STAMPS = [(BASE + timedelta(minutes=5 * i)).isoformat().replace("+00:00", "Z") for i in range(60)]
+
+
+def _snapshot(i):
+    return {
+        "timestamp": STAMPS[i],
+        "previous_timestamp": STAMPS[i - 1] if i > 0 else None,
+        "next_timestamp": STAMPS[i + 1] if i + 1 < len(STAMPS) else None,
+        "data": [{"id": EVENT_ID}] if 10 <= i <= 40 else [{"id": "other"}],
+    }
+
+
+def _odds(i):
+    if i > 35:
+        return None
+    price = 1.5 + 0.01 * i
+    return {
+        "timestamp": STAMPS[i],
+        "data": {"id": EVENT_ID, "bookmakers": [
+            {"key": "draftkings", "markets": [{"key": "h2h", "outcomes": [{"name": "Chiefs", "price": price}]}]},
+        ]},
+    }
+
+
+def _lookup(path, ts):
+    i = STAMPS.index(ts)
+    if path.endswith("/events"):
+        return _snapshot(i)
+    return _odds(i)
+
+
+class _Upstream:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = 0
+        self.requested = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def handler(self, request):
+        self.calls += 1
+        self.requested.append((request.url.path.rsplit("/", 1)[-1], request.url.params["date"]))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self.delay:
+                await asyncio.sleep(self.delay)
+            body = _lookup(request.url.path, request.url.params["date"])
+            return httpx.Response(404 if body is None else 200, json=body or {})
+        finally:
+            self.in_flight -= 1
+
+
+def _sequential_crawl(start, max_back, max_forward):
+    """The original one-at-a-time FIFO walk, against the same fake data."""
+    visited, queue, results = set(), [(start, "origin")], []
+    back_count = fwd_count = 0
+    while queue:
+        ts, direction = queue.pop(0)
+        if ts in visited:
+            continue
+        visited.add(ts)
+        snap = _lookup("/events", ts)
+        has_event = hc.snapshot_contains_event(snap, EVENT_ID)
+        odds = _lookup("/odds", ts) if has_event else None
+        results.append({
+            "snapshot_timestamp": snap["timestamp"],
+            "requested_timestamp": ts,
+            "direction": direction,
+            "previous_timestamp": snap["previous_timestamp"],
+            "next_timestamp": snap["next_timestamp"],
+            "event_present": has_event,
+            "odds": hc.extract_best_h2h(odds) if odds else None,
+        })
+        if direction in ("origin", "forward") and fwd_count < max_forward and snap["next_timestamp"]:
+            if snap["next_timestamp"] not in visited:
+                queue.append((snap["next_timestamp"], "forward"))
+            fwd_count += 1
+        if direction in ("origin", "backward") and back_count < max_back and snap["previous_timestamp"]:
+            if snap["previous_timestamp"] not in visited:
+                queue.append((snap["previous_timestamp"], "backward"))
+            back_count += 1
+    results.sort(key=lambda r: r["snapshot_timestamp"])
+    return results
+
+
+def _crawl(upstream, start, max_back, max_forward, **kwargs):
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(upstream.handler)) as client:
+            return await hc.crawl_snapshots_async(
+                EVENT_ID, start, max_back=max_back, max_forward=max_forward, client=client, **kwargs
+            )
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize("start_index,max_back,max_forward", [(30, 15, 15), (30, 40, 40), (5, 0, 3), (58, 3, 10)])
+def test_async_crawl_matches_sequential_walk(start_index, max_back, max_forward):
+    start = STAMPS[start_index]
+    got = _crawl(_Upstream(), start, max_back, max_forward, rate=0)
+    assert got == _sequential_crawl(start, max_back, max_forward)
+
+
+def test_chains_and_odds_requests_overlap():
+    upstream = _Upstream(delay=0.02)
+    results = _crawl(upstream, STAMPS[30], 10, 10, rate=0, concurrency=4)
+
+    assert len(results) == 21
+    assert upstream.max_in_flight > 1
+    assert upstream.max_in_flight <= 4
+
+
+class _Flaky(_Upstream):
+    """Fails the events snapshot at STAMPS[27], like a quota error mid-crawl."""
+
+    async def handler(self, request):
+        if request.url.params["date"] == STAMPS[27] and request.url.path.endswith("/events"):
+            return httpx.Response(429, json={})
+        return await super().handler(request)
+
+
+def test_missing_snapshot_ends_chain(monkeypatch):
+    monkeypatch.setattr(hc.settings, "UPSTREAM_MAX_RETRIES", 0)
+    results = _crawl(_Flaky(), STAMPS[30], 10, 2, rate=0)
+
+    assert [r["direction"] for r in results] == ["backward", "backward", "origin", "forward", "forward"]
+
+
+def test_token_bucket_paces_after_burst():
+    async def run():
+        bucket = hc.TokenBucket(rate=50, capacity=2)
+        t0 = time.monotonic()
+        for _ in range(6):
+            await bucket.acquire()
+        return time.monotonic() - t0
+
+    # 2 from the burst, then 4 more at 50/s
+    assert asyncio.run(run()) >= 0.07
+
+
+def test_main_requires_api_key(monkeypatch):
+    monkeypatch.setattr(hc, "ODDS_API_KEY", None)
+    monkeypatch.setattr(hc.sys, "argv", ["historcal_coverage", EVENT_ID, STAMPS[0]])
+
+    with pytest.raises(SystemExit):
+        hc.main()
+
+
+def test_checkpoint_resumes_without_refetching(tmp_path, monkeypatch):
+    monkeypatch.setattr(hc.settings, "UPSTREAM_MAX_RETRIES", 0)
+    path = str(tmp_path / "crawl.json")
+
+    _crawl(_Flaky(), STAMPS[30], 10, 5, rate=0, checkpoint=hc.Checkpoint(path))
+    saved = hc.Checkpoint(path)
+    # the backward chain stopped at the failed link; everything before it is cached
+    assert STAMPS[28] in saved.snapshots and STAMPS[27] not in saved.snapshots
+
+    upstream = _Upstream()
+    results = _crawl(upstream, STAMPS[30], 10, 5, rate=0, checkpoint=hc.Checkpoint(path))
+
+    assert results == _sequential_crawl(STAMPS[30], 10, 5)
+    fetched_before = {("events", ts) for ts in saved.snapshots}
+    assert upstream.requested and not fetched_before & set(upstream.requested)
+    assert min(ts for _, ts in upstream.requested) == STAMPS[20]
+    assert ("events", STAMPS[27]) in upstream.requested
+
+    rerun = _Upstream()
+    assert _crawl(rerun, STAMPS[30], 10, 5, rate=0, checkpoint=hc.Checkpoint(path)) == results
+    assert rerun.calls == 0
+
+
+def test_sync_probe_reads_checkpoint(tmp_path, monkeypatch):
+    cp = hc.Checkpoint(str(tmp_path / "crawl.json"))
+    cp.put_snapshot(STAMPS[0], _snapshot(0))
+
+    def offline(*args, **kwargs):
+        raise AssertionError("should not hit the network")
+
+    monkeypatch.setattr(hc, "http_get", offline)
+    assert hc.fetch_events_snapshot(STAMPS[0], cp) == _snapshot(0)
+
+
+def test_checkpoint_ignores_other_versions(tmp_path):
+    path = tmp_path / "crawl.json"
+    path.write_text('{"version": 0, "snapshots": {"x": {}}}')
+
+    assert hc.Checkpoint(str(path)).snapshots == {}
+
+
+class _Timeline:
+    """Sync stand-in for http_get: 5-minute snapshots, returning the one at or before `date`."""
+
+    def __init__(self, count, listed):
+        start = datetime(2025, 2, 1, tzinfo=timezone.utc)
+        self.stamps = [(start + timedelta(minutes=5 * i)).isoformat().replace("+00:00", "Z") for i in range(count)]
+        self.listed = listed
+        self.calls = 0
+
+    def __call__(self, url, params=None, timeout=None):
+        self.calls += 1
+        date = datetime.fromisoformat(params["date"].replace("Z", "+00:00"))
+        i = sum(1 for ts in self.stamps if datetime.fromisoformat(ts.replace("Z", "+00:00")) <= date) - 1
+        body = {} if i < 0 else {
+            "timestamp": self.stamps[i],
+            "previous_timestamp": self.stamps[i - 1] if i > 0 else None,
+            "next_timestamp": self.stamps[i + 1] if i + 1 < len(self.stamps) else None,
+            "data": [{"id": EVENT_ID}] if i in self.listed else [],
+        }
+        return httpx.Response(200, json=body, request=httpx.Request("GET", url))
+
+
+@pytest.mark.parametrize("first,last,anchor", [(400, 2300, 1000), (0, 50, 10), (1234, 1234, 1234), (2000, 2879, 2500)])
+def test_find_event_lifetime(monkeypatch, first, last, anchor):
+    timeline = _Timeline(2880, range(first, last + 1))  # 10 days
+    monkeypatch.setattr(hc, "http_get", timeline)
+
+    found = hc.find_event_lifetime(EVENT_ID, timeline.stamps[anchor], max_days=10)
+
+    assert (found["first_snapshot"], found["last_snapshot"]) == (timeline.stamps[first], timeline.stamps[last])
+    assert not found["first_bounded"] and not found["last_bounded"]
+    assert found["snapshot_lookups"] == timeline.calls <= 50
+
+
+def test_find_event_lifetime_stops_at_max_days(monkeypatch):
+    timeline = _Timeline(2880, range(0, 2880))
+    monkeypatch.setattr(hc, "http_get", timeline)
+
+    found = hc.find_event_lifetime(EVENT_ID, timeline.stamps[1440], max_days=1)
+
+    assert found["first_bounded"] and found["last_bounded"]
+    assert found["first_snapshot"] == timeline.stamps[1440 - 288]
+    assert found["last_snapshot"] == timeline.stamps[1440 + 288]
+
+
+def test_find_event_lifetime_needs_listed_anchor(monkeypatch):
+    timeline = _Timeline(100, range(50, 60))
+    monkeypatch.setattr(hc, "http_get", timeline)
+
+    assert hc.find_event_lifetime(EVENT_ID, timeline.stamps[10]) is None
+
+
+def _season_handler(calls, stamps, games):
+    """Sport-wide /odds: snapshot at or before `date`; games maps event id -> (first, last) index listed."""
+
+    async def handler(request):
+        assert request.url.path.endswith("/americanfootball_nfl/odds")
+        date = request.url.params["date"]
+        i = max(j for j, ts in enumerate(stamps) if ts <= date)
+        calls.append(date)
+        data = [
+            {"id": event_id, "home_team": "Chiefs", "away_team": "Eagles", "commence_time": stamps[last],
+             "bookmakers": [{"key": "fanduel", "markets": [{"key": "h2h", "outcomes": [
+                 {"name": "Chiefs", "price": 1.8 + 0.01 * i}, {"name": "Eagles", "price": 2.0}]}]}]}
+            for event_id, (first, last) in games.items() if first <= i <= last
+        ]
+        return httpx.Response(200, json={
+            "timestamp": stamps[i],
+            "previous_timestamp": stamps[i - 1] if i > 0 else None,
+            "next_timestamp": stamps[i + 1] if i + 1 < len(stamps) else None,
+            "data": data,
+        })
+    return handler
+
+
+def _season(calls, games, start, end, **kwargs):
+    async def run():
+        transport = httpx.MockTransport(_season_handler(calls, STAMPS, games))
+        async with httpx.AsyncClient(transport=transport) as client:
+            return await hc.crawl_season_async(start, end, client=client, rate=0, **kwargs)
+    return asyncio.run(run())
+
+
+GAMES = {"a" * 32: (0, 30), "b" * 32: (10, 59), "c" * 32: (25, 40)}
+
+
+def test_season_crawl_one_request_per_snapshot():
+    calls = []
+    rows = _season(calls, GAMES, STAMPS[0], STAMPS[59], interval_minutes=0)
+
+    assert len(calls) == 60
+    assert len(rows) == 31 + 50 + 16
+    assert [r["snapshot_timestamp"] for r in rows] == sorted(r["snapshot_timestamp"] for r in rows)
+    row = next(r for r in rows if r["event_id"] == "c" * 32 and r["snapshot_timestamp"] == STAMPS[30])
+    assert row["odds"] == {"best_price": 2.1, "best_team": "Chiefs", "best_bookmaker": "fanduel", "distinct_price_count": 2}
+    assert row["commence_time"] == STAMPS[40]
+
+
+def test_season_crawl_samples_at_interval_and_dedupes():
+    calls = []
+    rows = _season(calls, GAMES, STAMPS[0], STAMPS[59], interval_minutes=15)
+    assert len(calls) == 20
+    assert {r["snapshot_timestamp"] for r in rows} == set(STAMPS[::3])
+
+    # a 2-minute interval lands on each 5-minute snapshot two or three times
+    calls = []
+    rows = _season(calls, {"a" * 32: (0, 59)}, STAMPS[0], STAMPS[10], interval_minutes=2)
+    assert len(calls) == 26
+    assert [r["snapshot_timestamp"] for r in rows] == STAMPS[:11]
+
+
+def test_season_crawl_reuses_checkpoint(tmp_path):
+    path = str(tmp_path / "season.json")
+    first = _season([], GAMES, STAMPS[0], STAMPS[59], interval_minutes=30, checkpoint=hc.Checkpoint(path))
+
+    calls = []
+    again = _season(calls, GAMES, STAMPS[0], STAMPS[59], interval_minutes=30, checkpoint=hc.Checkpoint(path))
+    assert again == first
+    assert calls == []
+
+
+def test_crawls_write_the_odds_store(tmp_path):
+    store = hc.OddsStore(str(tmp_path / "odds.sqlite3"))
+
+    _season([], GAMES, STAMPS[0], STAMPS[59], interval_minutes=30, store=store)
+    assert store.stats() == {"events": 3, "snapshots": 6 + 8 + 2, "quotes": 2 * 16}
+    assert store.best_price_as_of("c" * 32, STAMPS[31], 300) == pytest.approx(1.8 + 0.01 * 30)
+
+    _crawl(_Upstream(), STAMPS[30], 2, 2, rate=0, store=store)
+    assert store.best_price_as_of(EVENT_ID, STAMPS[32], 0) == pytest.approx(1.5 + 0.01 * 32)
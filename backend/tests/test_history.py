@@ -0,0 +1,169 @@
+import csv
+import io
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from backend.app.main import app
+from backend.app import history_export
+from backend.app.api.v1 import compare as compare_api
+from backend.app.crud import history as history_crud
+from backend.app.db.base import Base
+from backend.app.models import ComparisonHistory
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def history_db(monkeypatch):
+    """In-memory SQLite history table wired into the compare router."""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+    monkeypatch.setattr(compare_api, "_try_history_imports", lambda: (Session, history_crud))
+    yield Session
+    engine.dispose()
+
+
+def _seed(Session, n, ties_every=3):
+    base = datetime(2025, 2, 1, tzinfo=timezone.utc)
+    with Session() as db:
+        for i in range(n):
+            # several rows share a timestamp so the id tiebreak is exercised
+            db.add(ComparisonHistory(
+                created_at=base + timedelta(minutes=i // ties_every),
+                payload={"i": i}, result={"roi_pct": float(i)}, params={},
+            ))
+        db.commit()
+        return [
+            str(r.id) for r in db.query(ComparisonHistory)
+            .order_by(ComparisonHistory.created_at.desc(), ComparisonHistory.id.desc())
+        ]
+
+
+def test_keyset_pages_cover_every_row_once(history_db):
+    expected = _seed(history_db, 23)
+    seen = []
+    cursor = None
+    with history_db() as db:
+        while True:
+            rows, cursor = history_crud.list_history_page(db, limit=5, cursor=cursor)
+            seen.extend(str(r.id) for r in rows)
+            if cursor is None:
+                break
+    assert seen == expected
+
+
+def test_history_route_follows_next_cursor_header(history_db):
+    expected = _seed(history_db, 7)
+    r1 = client.get("/api/v1/compare/history?limit=4")
+    assert r1.status_code == 200
+    assert [h["id"] for h in r1.json()] == expected[:4]
+    cursor = r1.headers["X-Next-Cursor"]
+    assert 'rel="next"' in r1.headers["Link"]
+
+    r2 = client.get(f"/api/v1/compare/history?limit=4&cursor={cursor}")
+    assert [h["id"] for h in r2.json()] == expected[4:]
+    assert "X-Next-Cursor" not in r2.headers
+
+
+def test_history_route_legacy_offset(history_db):
+    expected = _seed(history_db, 6)
+    r = client.get("/api/v1/compare/history?limit=2&offset=2")
+    assert [h["id"] for h in r.json()] == expected[2:4]
+
+
+def test_history_route_rejects_bad_cursor(history_db):
+    r = client.get("/api/v1/compare/history?cursor=not-a-cursor")
+    assert r.status_code == 422
+
+
+def _seed_mixed(Session):
+    base = datetime(2025, 3, 1, tzinfo=timezone.utc)
+    specs = [
+        ("AAPL", "a" * 32, "win", 12.5),
+        ("AAPL", "b" * 32, "loss", -8.0),
+        ("SPY", "a" * 32, "win", 25.0),
+        ("SPY", "b" * 32, "loss", -3.0),
+        ("AAPL", "a" * 32, "win", 31.0),
+    ]
+    with Session() as db:
+        history_crud.create_history_bulk(db, [
+            {
+                "created_at": base + timedelta(days=i),
+                "payload": {"equity_symbol": sym, "bet": {"event_id": ev, "outcome": out}},
+                "result": {"roi_pct": roi},
+                "params": {},
+            }
+            for i, (sym, ev, out, roi) in enumerate(specs)
+        ])
+
+
+def _rois(resp):
+    assert resp.status_code == 200
+    return sorted(h["result"]["roi_pct"] for h in resp.json())
+
+
+def test_history_filters_on_generated_columns(history_db):
+    _seed_mixed(history_db)
+    url = "/api/v1/compare/history"
+    assert _rois(client.get(url, params={"symbol": "aapl"})) == [-8.0, 12.5, 31.0]
+    assert _rois(client.get(url, params={"event_id": "B" * 32})) == [-8.0, -3.0]
+    assert _rois(client.get(url, params={"outcome": "win", "roi_min": 20})) == [25.0, 31.0]
+    assert _rois(client.get(url, params={"roi_max": 0})) == [-8.0, -3.0]
+    assert _rois(client.get(url, params={"created_from": "2025-03-02", "created_to": "2025-03-04"})) == [-8.0, 25.0]
+
+
+def test_filtered_keyset_pages_keep_filters(history_db):
+    _seed_mixed(history_db)
+    r1 = client.get("/api/v1/compare/history", params={"symbol": "AAPL", "limit": 2})
+    assert _rois(r1) == [-8.0, 31.0]
+    assert "symbol=AAPL" in r1.headers["Link"]
+    r2 = client.get("/api/v1/compare/history",
+                    params={"symbol": "AAPL", "limit": 2, "cursor": r1.headers["X-Next-Cursor"]})
+    assert _rois(r2) == [12.5]
+
+
+def test_export_ndjson_streams_every_row(history_db):
+    _seed_mixed(history_db)
+    r = client.get("/api/v1/compare/history/export", params={"format": "ndjson", "symbol": "SPY"})
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("application/x-ndjson")
+    docs = [json.loads(line) for line in r.text.splitlines()]
+    assert [d["result"]["roi_pct"] for d in docs] == [25.0, -3.0]  # oldest first
+    assert docs[0]["payload"]["equity_symbol"] == "SPY"
+
+
+def test_export_csv_flattens_result(history_db):
+    _seed_mixed(history_db)
+    r = client.get("/api/v1/compare/history/export", params={"format": "csv"})
+    assert r.status_code == 200
+    rows = list(csv.DictReader(io.StringIO(r.text)))
+    assert list(rows[0]) == history_export.CSV_COLUMNS
+    assert [(row["equity_symbol"], row["outcome"], row["roi_pct"]) for row in rows] == [
+        ("AAPL", "win", "12.5"), ("AAPL", "loss", "-8.0"), ("SPY", "win", "25.0"),
+        ("SPY", "loss", "-3.0"), ("AAPL", "win", "31.0"),
+    ]
+
+
+def test_export_takes_the_listing_filters(history_db, monkeypatch, capsys):
+    _seed_mixed(history_db)
+    params = {"outcome": "win", "roi_min": 20}
+    listed = _rois(client.get("/api/v1/compare/history", params=params))
+    r = client.get("/api/v1/compare/history/export", params={"format": "ndjson", **params})
+    assert sorted(json.loads(line)["result"]["roi_pct"] for line in r.text.splitlines()) == listed == [25.0, 31.0]
+
+    from backend.app.db import session as db_session
+    monkeypatch.setattr(db_session, "SessionLocal", history_db)
+    history_export.main(["--outcome", "loss", "--roi-max", "-5"])
+    assert [json.loads(line)["result"]["roi_pct"] for line in capsys.readouterr().out.splitlines()] == [-8.0]
+
+
+def test_export_csv_header_only_when_empty(history_db):
+    r = client.get("/api/v1/compare/history/export", params={"format": "csv"})
+    assert r.text.strip() == ",".join(history_export.CSV_COLUMNS)
@@ -0,0 +1,72 @@
+import threading
+import time
+
+from backend.app.history_writer import HistoryWriter
+
+
+def _row(i):
+    return {"payload": {"i": i}, "result": {}, "params": None, "notes": None}
+
+
+def test_flushes_full_batches_and_drains_on_stop():
+    batches = []
+    writer = HistoryWriter(flush_fn=lambda rows: batches.append(list(rows)), batch_size=10, flush_interval=60)
+    writer.start()
+    writer.submit_many([_row(i) for i in range(25)])
+    writer.stop(timeout=5)
+    assert [len(b) for b in batches] == [10, 10, 5]
+    assert [r["payload"]["i"] for b in batches for r in b] == list(range(25))
+    stats = writer.stats()
+    assert stats["written"] == 25 and stats["flushes"] == 3 and stats["queue_depth"] == 0
+
+
+def test_time_trigger_flushes_partial_batch():
+    flushed = threading.Event()
+    writer = HistoryWriter(flush_fn=lambda rows: flushed.set(), batch_size=100, flush_interval=0.05)
+    writer.start()
+    writer.submit(_row(1))
+    assert flushed.wait(1.0)
+    writer.stop(timeout=5)
+
+
+def test_backpressure_drops_when_queue_stays_full():
+    release = threading.Event()
+    writer = HistoryWriter(flush_fn=lambda rows: release.wait(5), maxsize=2, batch_size=1,
+                           flush_interval=0, enqueue_timeout=0.05)
+    writer.start()
+    writer.submit(_row(0))       # taken by the worker, which then blocks in flush
+    time.sleep(0.05)
+    assert writer.submit(_row(1)) and writer.submit(_row(2))
+    assert writer.submit(_row(3)) is False
+    assert writer.stats()["dropped"] == 1
+    release.set()
+    writer.stop(timeout=5)
+    assert writer.stats()["written"] == 3
+
+
+def test_bulk_submit_to_full_queue_shares_one_timeout():
+    release = threading.Event()
+    writer = HistoryWriter(flush_fn=lambda rows: release.wait(5), maxsize=2, batch_size=1,
+                           flush_interval=0, enqueue_timeout=0.05)
+    writer.start()
+    writer.submit(_row(0))       # taken by the worker, which then blocks in flush
+    time.sleep(0.05)
+
+    t0 = time.monotonic()
+    assert writer.submit_many([_row(i) for i in range(1, 1001)]) == 2
+    assert time.monotonic() - t0 < 0.5   # not 998 x enqueue_timeout
+    assert writer.stats()["dropped"] == 998
+    release.set()
+    writer.stop(timeout=5)
+    assert writer.stats()["written"] == 3
+
+
+def test_failed_flush_is_counted_not_raised():
+    def boom(rows):
+        raise RuntimeError("db down")
+
+    writer = HistoryWriter(flush_fn=boom, batch_size=2, flush_interval=60)
+    writer.start()
+    writer.submit_many([_row(0), _row(1)])
+    writer.stop(timeout=5)
+    assert writer.stats()["failed"] == 2
@@ -0,0 +1,77 @@
+import asyncio
+
+import httpx
+import pytest
+
+from backend.app import services, upstream
+from backend.app.api.v1 import compare as compare_api
+from backend.app.main import app
+from backend.loadtest import loadgen
+from backend.loadtest.mock_upstream import MockConfig, start_in_thread, synthetic_bars
+
+
+@pytest.fixture
+def mock_upstream(monkeypatch):
+    """Mock upstream server on a free port with the app pointed at it."""
+    servers = []
+
+    def start(**config):
+        server = start_in_thread(MockConfig(**config))
+        servers.append(server)
+        monkeypatch.setattr(services.settings, "ALPACA_DATA_BASE_URL", server.base_url)
+        monkeypatch.setattr(services.settings, "ODDS_API_BASE_URL", server.base_url)
+        monkeypatch.setattr(services.settings, "USE_EXTERNAL_APIS", True)
+        for key in ("ALPACA_API_KEY", "ALPACA_API_SECRET", "ODDS_API_KEY"):
+            monkeypatch.setenv(key, "test")
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def test_mock_serves_paged_bars_and_event_odds(mock_upstream):
+    server = mock_upstream(bars_page_size=7, bookmakers=6)
+    bars = synthetic_bars("SPY", "2025-01-01", "2025-03-31")
+    expected = (bars[-1]["c"] - bars[0]["o"]) / bars[0]["o"]
+    assert services.fetch_equity_return_pct("SPY", "2025-01-01", "2025-03-31") == pytest.approx(expected)
+    # ceil(len / 7) bar pages, all walked
+    assert server.requests == -(-len(bars) // 7)
+
+    payload = services.fetch_nfl_event_odds("0" * 31 + "1", "2025-02-09T22:25:38Z")
+    assert len(payload["data"]["bookmakers"]) == 6
+    assert services.fetch_nfl_moneyline_odds("0" * 31 + "1", "2025-02-09T22:25:38Z") > 1
+
+
+def test_injected_errors_surface_as_fallbacks(mock_upstream):
+    server = mock_upstream(error_rate=1.0, error_status=503)
+    assert services.fetch_nfl_moneyline_odds("0" * 31 + "2", "2025-02-09T22:25:38Z") is None
+    assert server.errors_injected >= 1
+
+
+def test_loadgen_reports_latency_percentiles(mock_upstream, monkeypatch):
+    mock_upstream(latency_ms=5)
+    monkeypatch.setattr(compare_api, "_save_history", lambda *a: None)
+    scenarios = loadgen.build_scenarios(["SPY", "AAPL"], events=2, windows=2)
+
+    async def go():
+        previous = upstream.set_async_client(upstream.create_async_client())
+        try:
+            return await loadgen.run_load("http://api", rps=100, duration_s=0.3, scenarios=scenarios,
+                                          transport=httpx.ASGITransport(app=app))
+        finally:
+            await upstream.close_async_client()
+            upstream.set_async_client(previous)
+
+    result = asyncio.run(go())
+    summary = result.summary()
+    assert summary["scheduled"] == summary["completed"] == 30
+    assert summary["statuses"] == {"200": 30}
+    lat = summary["latency_ms"]
+    assert 0 < lat["p50"] <= lat["p95"] <= lat["p99"] <= lat["max"]
+
+
+def test_percentile_nearest_rank():
+    r = loadgen.LoadResult(latencies_ms=[float(i) for i in range(1, 101)])
+    assert (r.percentile(50), r.percentile(95), r.percentile(99)) == (50.0, 95.0, 99.0)
@@ -0,0 +1,76 @@
+from fastapi.testclient import TestClient
+
+from backend.app.main import app
+from backend.app import metrics
+from backend.app.api.v1 import compare as compare_api
+from backend.tests.fake_upstream import make_bars, make_event_odds
+
+client = TestClient(app)
+
+EVENT_ID = "3fd7cba821568399920fcea4dadad30d"
+SNAP = "2025-02-09T22:25:38Z"
+URL = f"/api/v1/compare?start=2025-02-02&end=2025-02-10&odds_date={SNAP}"
+BODY = {
+    "starting_capital": 1000,
+    "equity_symbol": "AAPL",
+    "equity_weight": 0.7,
+    "bet": {"league": "NFL", "event_id": EVENT_ID, "stake": 100, "odds": None, "outcome": "win"}
+}
+
+
+def test_histogram_exposition_is_cumulative():
+    h = metrics.Histogram("test_latency_seconds", "test", ["stage"], buckets=(0.1, 1.0))
+    try:
+        h.observe(0.05, stage="a")
+        h.observe(0.5, stage="a")
+        h.observe(5.0, stage="a")
+        lines = h.render()
+        assert 'test_latency_seconds_bucket{stage="a",le="0.1"} 1' in lines
+        assert 'test_latency_seconds_bucket{stage="a",le="1.0"} 2' in lines
+        assert 'test_latency_seconds_bucket{stage="a",le="+Inf"} 3' in lines
+        assert 'test_latency_seconds_count{stage="a"} 3' in lines
+    finally:
+        metrics._registry.remove(h)
+
+
+def test_counter_escapes_label_values():
+    c = metrics.Counter("test_events_total", "test", ["kind"])
+    try:
+        c.inc(kind='a"b')
+        c.inc(2, kind='a"b')
+        assert c.render()[-1] == 'test_events_total{kind="a\\"b"} 3'
+    finally:
+        metrics._registry.remove(c)
+
+
+def test_compare_records_stages_fallbacks_and_upstream_status(fake_upstream, monkeypatch):
+    monkeypatch.setattr(compare_api, "_save_history", lambda *a: None)
+    # bars exist, the event does not: odds leg falls back after a 404
+    fake_upstream.bars["AAPL"] = make_bars([(100.0, 101.0), (101.0, 110.0)])
+    stages = ("validate", "cache_lookup", "equity_fetch", "odds_fetch", "execute", "history_write")
+    before = {s: metrics.COMPARE_STAGE_SECONDS.count(stage=s) for s in stages}
+    odds_fallbacks = metrics.FALLBACKS.value(kind="odds")
+    not_found = metrics.UPSTREAM_RESPONSES.value(host="https://api.the-odds-api.com", status="404")
+
+    r = client.post(URL, json=BODY)
+    assert r.status_code == 200
+    for s in stages:
+        assert metrics.COMPARE_STAGE_SECONDS.count(stage=s) == before[s] + 1, s
+    assert metrics.FALLBACKS.value(kind="odds") == odds_fallbacks + 1
+    assert metrics.UPSTREAM_RESPONSES.value(host="https://api.the-odds-api.com", status="404") == not_found + 1
+
+
+def test_metrics_endpoint_serves_text_exposition(fake_upstream, monkeypatch):
+    monkeypatch.setattr(compare_api, "_save_history", lambda *a: None)
+    fake_upstream.bars["AAPL"] = make_bars([(100.0, 101.0), (101.0, 110.0)])
+    fake_upstream.event_odds[EVENT_ID] = make_event_odds(EVENT_ID, {"fanduel": {"Eagles": 2.4}}, SNAP)
+    client.post(URL, json=BODY)
+
+    r = client.get("/metrics")
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/plain")
+    body = r.text
+    assert "# TYPE compare_stage_duration_seconds histogram" in body
+    assert 'http_request_duration_seconds_count{method="POST",route="/api/v1/compare",status="200"}' in body
+    assert 'upstream_responses_total{host="https://data.alpaca.markets",status="200"}' in body
+    assert 'lookup_cache_hits{cache="equity_return"}' in body
@@ -0,0 +1,133 @@
+import asyncio
+import threading
+
+import pytest
+
+from backend.app import services
+from backend.app.cache import NOT_COVERED
+from backend.app.odds_store import OddsStore, to_epoch
+
+EVENT_ID = "3fd7cba821568399920fcea4dadad30d"
+
+
+def _payload(ts, prices, event_id=EVENT_ID, next_ts=None):
+    """prices: {bookmaker: {team: price}}"""
+    return {
+        "timestamp": ts,
+        "next_timestamp": next_ts,
+        "data": {"id": event_id, "bookmakers": [
+            {"key": bk, "markets": [{"key": "h2h", "outcomes": [{"name": n, "price": p} for n, p in outcomes.items()]}]}
+            for bk, outcomes in prices.items()
+        ]},
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = OddsStore(str(tmp_path / "odds.sqlite3"))
+    s.write_event_payload(_payload("2025-02-09T18:00:00Z", {"dk": {"Chiefs": 1.8, "Eagles": 2.1}}))
+    s.write_event_payload(_payload("2025-02-09T18:05:00Z", {"dk": {"Chiefs": 1.8, "Eagles": 2.2},
+                                                            "fd": {"Chiefs": 1.75, "Eagles": 2.35}}))
+    s.write_event_payload(_payload("2025-02-09T18:10:00Z", {"dk": {"Chiefs": 1.9, "Eagles": 2.0}}))
+    return s
+
+
+def test_best_price_as_of_bisects_the_event_timeline(store):
+    assert store.stats() == {"events": 1, "snapshots": 3, "quotes": 8}
+    assert store.best_price_as_of(EVENT_ID, "2025-02-09T18:05:00Z", 900) == 2.35
+    assert store.best_price_as_of(EVENT_ID, "2025-02-09T18:09:59Z", 900) == 2.35
+    assert store.best_price_as_of(EVENT_ID, "2025-02-09T18:20:00+00:00", 900) == 2.0
+
+
+def test_lookups_outside_coverage_are_not_covered(store):
+    assert store.best_price_as_of(EVENT_ID, "2025-02-09T17:59:59Z", 900) is NOT_COVERED
+    assert store.best_price_as_of(EVENT_ID, "2025-02-09T18:30:00Z", 900) is NOT_COVERED
+    assert store.best_price_as_of("b" * 32, "2025-02-09T18:05:00Z", 900) is NOT_COVERED
+    assert store.best_price_as_of(EVENT_ID, "not a date", 900) is NOT_COVERED
+    assert OddsStore(str(store.path) + ".missing").best_price_as_of(EVENT_ID, "2025-02-09T18:05:00Z", 900) is NOT_COVERED
+
+
+def test_writes_refresh_the_cached_timeline(store):
+    assert store.best_price_as_of(EVENT_ID, "2025-02-09T18:30:00Z", 900) is NOT_COVERED
+    # a second handle (another process) writes; the first sees it on its next lookup
+    OddsStore(store.path).write_event_payload(_payload("2025-02-09T18:25:00Z", {"dk": {"Chiefs": 1.5, "Eagles": 2.6}}))
+    assert store.best_price_as_of(EVENT_ID, "2025-02-09T18:30:00Z", 900) == 2.6
+
+    # re-crawling a snapshot replaces its prices
+    store.write_event_payload(_payload("2025-02-09T18:25:00Z", {"dk": {"Chiefs": 1.5, "Eagles": 2.4}}))
+    assert store.best_price_as_of(EVENT_ID, "2025-02-09T18:30:00Z", 900) == 2.4
+
+
+def test_sport_payload_stores_every_event(tmp_path):
+    s = OddsStore(str(tmp_path / "odds.sqlite3"))
+    events = [_payload("x", {"dk": {"A": 1.9 + i / 10, "B": 1.9}}, event_id=f"{i:032x}")["data"] for i in range(3)]
+
+    assert s.write_sport_payload({"timestamp": "2024-10-01T12:00:00Z", "data": events}) == 6
+    assert s.best_price_as_of(f"{2:032x}", "2024-10-01T12:00:00Z", 0) == pytest.approx(2.1)
+    assert to_epoch("2024-10-01") == to_epoch("2024-10-01T00:00:00Z")
+
+
+def test_lookups_match_the_live_snapshot_choice_by_default(tmp_path):
+    s = OddsStore(str(tmp_path / "odds.sqlite3"))
+    s.write_event_payload(_payload("2025-02-09T18:00:00Z", {"dk": {"Chiefs": 1.8, "Eagles": 2.1}},
+                                   next_ts="2025-02-09T18:05:00Z"))
+    s.write_event_payload(_payload("2025-02-09T18:10:00Z", {"dk": {"Chiefs": 1.9, "Eagles": 2.0}}))
+
+    # upstream would also return 18:00 for 18:04, since its next snapshot is 18:05
+    assert s.best_price_as_of(EVENT_ID, "2025-02-09T18:04:59Z") == 2.1
+    # 18:05 exists upstream but was not stored: go live rather than answer from 18:00
+    assert s.best_price_as_of(EVENT_ID, "2025-02-09T18:06:00Z") is NOT_COVERED
+    assert s.best_price_as_of(EVENT_ID, "2025-02-09T18:06:00Z", 900) == 2.1
+    # exact snapshot; 18:10's next link is unknown, so later times need the tolerance
+    assert s.best_price_as_of(EVENT_ID, "2025-02-09T18:10:00Z") == 2.0
+    assert s.best_price_as_of(EVENT_ID, "2025-02-09T18:11:00Z") is NOT_COVERED
+
+    # re-crawling without the link keeps the one already known
+    s.write_event_payload(_payload("2025-02-09T18:00:00Z", {"dk": {"Chiefs": 1.8, "Eagles": 2.2}}))
+    assert s.best_price_as_of(EVENT_ID, "2025-02-09T18:04:59Z") == 2.2
+
+
+def test_moneyline_odds_read_the_store_first(store, monkeypatch):
+    monkeypatch.setattr(services.settings, "ODDS_STORE_PATH", store.path)
+    monkeypatch.setattr(services.settings, "ODDS_STORE_MAX_STALENESS_SEC", 900)
+
+    def offline(*args, **kwargs):
+        raise AssertionError("should not hit the network")
+
+    monkeypatch.setattr(services, "fetch_nfl_event_odds", offline)
+    monkeypatch.setattr(services, "fetch_nfl_event_odds_async", offline)
+
+    assert services.fetch_nfl_moneyline_odds(EVENT_ID, "2025-02-09T18:07:00Z") == 2.35
+    assert asyncio.run(services.fetch_nfl_moneyline_odds_async(EVENT_ID, "2025-02-09T18:07:00Z")) == 2.35
+
+
+def test_moneyline_odds_fall_back_when_not_covered(store, monkeypatch):
+    monkeypatch.setattr(services.settings, "ODDS_STORE_PATH", store.path)
+    monkeypatch.setattr(services.settings, "ODDS_STORE_MAX_STALENESS_SEC", 60)
+    live = []
+
+    def fetch(event_id, snapshot_ts):
+        live.append(snapshot_ts)
+        return _payload(snapshot_ts, {"dk": {"Chiefs": 1.7, "Eagles": 2.5}})
+
+    monkeypatch.setattr(services, "fetch_nfl_event_odds", fetch)
+
+    assert services.fetch_nfl_moneyline_odds(EVENT_ID, "2025-02-09T18:10:30Z") == 2.0
+    assert services.fetch_nfl_moneyline_odds(EVENT_ID, "2025-02-09T18:13:00Z") == 2.5
+    assert live == ["2025-02-09T18:13:00Z"]
+
+
+def test_async_moneyline_odds_read_the_store_off_the_event_loop(store, monkeypatch):
+    monkeypatch.setattr(services.settings, "ODDS_STORE_PATH", store.path)
+    monkeypatch.setattr(services.settings, "ODDS_STORE_MAX_STALENESS_SEC", 900)
+    readers = []
+    timeline = store.timeline
+    monkeypatch.setattr(store, "timeline", lambda event_id: readers.append(threading.get_ident()) or timeline(event_id))
+    monkeypatch.setattr(services, "get_odds_store", lambda: store)
+
+    async def lookup():
+        return threading.get_ident(), await services.fetch_nfl_moneyline_odds_async(EVENT_ID, "2025-02-09T18:07:00Z")
+
+    loop_thread, price = asyncio.run(lookup())
+    assert price == 2.35
+    assert readers and loop_thread not in readers
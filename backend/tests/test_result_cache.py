@@ -0,0 +1,132 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from backend.app.main import app
+from backend.app import result_cache
+from backend.app.api.v1 import compare as compare_api
+from backend.app.crud import history as history_crud
+from backend.app.db.base import Base
+from backend.tests.fake_upstream import make_bars, make_event_odds
+
+client = TestClient(app)
+
+EVENT_ID = "3fd7cba821568399920fcea4dadad30d"
+SNAP = "2025-02-09T22:25:38Z"
+URL = f"/api/v1/compare?start=2025-02-02&end=2025-02-10&odds_date={SNAP}"
+BODY = {
+    "starting_capital": 1000,
+    "equity_symbol": "AAPL",
+    "equity_weight": 0.7,
+    "bet": {"league": "NFL", "event_id": EVENT_ID, "stake": 100, "odds": None, "outcome": "win"}
+}
+
+
+def _seed(fake):
+    fake.bars["AAPL"] = make_bars([(100.0, 101.0), (101.0, 104.0), (104.0, 110.0)])
+    fake.event_odds[EVENT_ID] = make_event_odds(EVENT_ID, {"draftkings": {"Chiefs": 1.8, "Eagles": 2.4}}, SNAP)
+
+
+def _capture_history(monkeypatch):
+    rows = []
+    monkeypatch.setattr(compare_api, "_save_history_bulk", rows.extend)
+    return rows
+
+
+def test_request_hash_is_order_independent():
+    a = result_cache.request_hash({"x": 1, "bet": {"a": 1, "b": 2}}, "2025-01-01", "2025-01-31", None)
+    b = result_cache.request_hash({"bet": {"b": 2, "a": 1}, "x": 1}, "2025-01-01", "2025-01-31", None)
+    assert a == b
+    assert a != result_cache.request_hash({"x": 1, "bet": {"a": 1, "b": 2}}, "2025-01-01", "2025-01-30", None)
+
+
+def test_identical_compare_is_served_from_memory_cache(fake_upstream, monkeypatch):
+    monkeypatch.setattr(result_cache.settings, "RESULT_CACHE_BACKEND", "memory")
+    history = _capture_history(monkeypatch)
+    _seed(fake_upstream)
+
+    r1 = client.post(URL, json=BODY)
+    assert r1.headers["X-Result-Cache"] == "miss"
+    calls = len(fake_upstream.calls)
+    r2 = client.post(URL, json=BODY)
+    assert r2.headers["X-Result-Cache"] == "hit"
+    assert r2.json() == r1.json()
+    assert len(fake_upstream.calls) == calls
+    # one history row, tagged with the request hash
+    assert len(history) == 1 and history[0]["request_hash"]
+
+
+def test_fallback_results_are_not_cached(fake_upstream, monkeypatch):
+    monkeypatch.setattr(result_cache.settings, "RESULT_CACHE_BACKEND", "memory")
+    history = _capture_history(monkeypatch)
+    # no odds seeded for the event -> odds fallback
+    fake_upstream.bars["AAPL"] = make_bars([(100.0, 101.0), (101.0, 110.0)])
+
+    for _ in range(2):
+        r = client.post(URL, json=BODY)
+        assert r.headers["X-Result-Cache"] == "miss"
+        assert r.json()["odds_meta"]["fallback_used"] is True
+    assert [row["request_hash"] for row in history] == [None, None]
+
+
+def test_db_backend_replays_newest_history_row(fake_upstream, monkeypatch):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+    monkeypatch.setattr(compare_api, "_try_history_imports", lambda: (Session, history_crud))
+    monkeypatch.setattr(result_cache.settings, "RESULT_CACHE_BACKEND", "db")
+    monkeypatch.setattr(result_cache, "_result_cache", result_cache.DbResultCache(session_factory=Session))
+    _seed(fake_upstream)
+
+    r1 = client.post(URL, json=BODY)
+    assert r1.headers["X-Result-Cache"] == "miss"
+    r2 = client.post(URL, json=BODY)
+    assert r2.headers["X-Result-Cache"] == "hit"
+    assert r2.json() == r1.json()
+    with Session() as db:
+        assert len(history_crud.list_history(db)) == 1
+
+
+def test_batch_reuses_cached_and_repeated_scenarios(fake_upstream, monkeypatch):
+    monkeypatch.setattr(result_cache.settings, "RESULT_CACHE_BACKEND", "memory")
+    history = _capture_history(monkeypatch)
+    _seed(fake_upstream)
+    client.post(URL, json=BODY)
+
+    scenario = {**BODY, "start": "2025-02-02", "end": "2025-02-10", "odds_date": SNAP}
+    other = {**scenario, "equity_weight": 0.2}
+    calls = len(fake_upstream.calls)
+    r = client.post("/api/v1/compare/batch", json={"scenarios": [scenario, other, other]})
+    assert r.status_code == 200
+    results = r.json()["results"]
+    assert results[1] == results[2]
+    assert results[0]["equity"]["allocated"] == 700.0
+    # only "other" was computed and recorded (its lookups come from the upstream caches)
+    assert len(history) == 2
+    assert len(fake_upstream.calls) == calls
+
+
+def test_db_backend_batch_looks_up_all_scenarios_in_one_query(fake_upstream, monkeypatch):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+    monkeypatch.setattr(compare_api, "_try_history_imports", lambda: (Session, history_crud))
+    monkeypatch.setattr(result_cache.settings, "RESULT_CACHE_BACKEND", "db")
+    monkeypatch.setattr(result_cache, "_result_cache", result_cache.DbResultCache(session_factory=Session))
+    _seed(fake_upstream)
+    client.post(URL, json=BODY)
+
+    lookups = []
+    real = history_crud.get_results_by_hashes
+    monkeypatch.setattr(history_crud, "get_results_by_hashes", lambda db, keys: lookups.append(keys) or real(db, keys))
+    monkeypatch.setattr(history_crud, "get_result_by_hash", None)
+
+    scenario = {**BODY, "start": "2025-02-02", "end": "2025-02-10", "odds_date": SNAP}
+    others = [{**scenario, "equity_weight": w / 10} for w in range(1, 6)]
+    r = client.post("/api/v1/compare/batch", json={"scenarios": [scenario, *others, scenario]})
+    assert r.status_code == 200
+    results = r.json()["results"]
+    assert results[0] == results[-1] and results[0]["equity"]["allocated"] == 700.0
+    assert len(lookups) == 1 and len(lookups[0]) == 6
+    assert result_cache.get_result_cache().stats()["hits"] == 1
@@ -17,4 +17,36 @@ def test_simple_win():
     )
     out = execute_compare(req)
     assert out["bet"]["pnl"] == 150.0
-    assert "roi_pct" in out
\ No newline at end of file
+    assert "roi_pct" in out
+
+def test_live_legs_resolve_concurrently(monkeypatch):
+    import time
+    from backend.app import config, services
+
+    monkeypatch.setattr(config.settings, "USE_EXTERNAL_APIS", True)
+
+    def slow_equity(symbol, start, end):
+        time.sleep(0.3)
+        return 0.1
+
+    def slow_odds(event_id, snapshot_ts):
+        time.sleep(0.3)
+        return 2.5
+
+    monkeypatch.setattr(services, "fetch_equity_return_pct", slow_equity)
+    monkeypatch.setattr(services, "fetch_nfl_moneyline_odds", slow_odds)
+
+    t0 = time.perf_counter()
+    req = services.build_compare_request_with_live_data(
+        starting_capital=1000,
+        equity_symbol="SPY",
+        equity_weight=0.5,
+        bet_data={"league": "NFL", "event_id": "a" * 32, "stake": 100, "odds": None, "outcome": "win"},
+        start="2025-02-02",
+        end="2025-02-10",
+        odds_date="2025-02-09T22:25:38Z",
+    )
+    elapsed = time.perf_counter() - t0
+    assert req.equity_return_pct == 0.1
+    assert req.bet.odds == 2.5
+    assert elapsed < 0.55
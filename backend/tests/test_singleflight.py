@@ -0,0 +1,86 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from backend.app import services
+from backend.app.singleflight import SingleFlight
+from backend.tests.fake_upstream import make_bars
+
+
+def test_threads_share_one_call():
+    flight = SingleFlight("test_threads")
+    calls = []
+
+    def slow(x):
+        calls.append(x)
+        time.sleep(0.2)
+        return x * 2
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flight.do("k", slow, 21))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert results == [42] * 8
+    assert calls == [21]
+    assert flight.stats() == {"calls": 8, "executions": 1, "coalesced": 7, "in_flight": 0}
+
+
+def test_errors_propagate_to_waiters():
+    flight = SingleFlight("test_errors")
+
+    async def boom():
+        await asyncio.sleep(0.05)
+        raise ValueError("upstream down")
+
+    async def run():
+        return await asyncio.gather(*(flight.do_async("k", boom) for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert all(isinstance(r, ValueError) for r in results)
+    assert flight.stats()["executions"] == 1
+
+
+def test_cancelled_leader_does_not_cancel_waiters():
+    flight = SingleFlight("test_cancel")
+    started = []
+
+    async def slow(x):
+        started.append(x)
+        await asyncio.sleep(0.05)
+        return x * 2
+
+    async def run():
+        leader = asyncio.create_task(flight.do_async("k", slow, 21))
+        await asyncio.sleep(0.01)
+        waiters = [asyncio.create_task(flight.do_async("k", slow, 21)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        results = await asyncio.gather(*waiters)
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return results
+
+    assert asyncio.run(run()) == [42, 42, 42]
+    # the first call was abandoned; one waiter re-ran it and the other two shared that
+    assert started == [21, 21]
+    assert flight.stats() == {"calls": 4, "executions": 2, "coalesced": 5, "in_flight": 0}
+
+
+def test_concurrent_equity_fetches_coalesce(fake_upstream):
+    fake_upstream.bars["SPY"] = make_bars([(100.0, 101.0), (101.0, 105.0)])
+    fake_upstream.latency = 0.1
+    before = services._equity_flight.stats()
+
+    async def run():
+        return await asyncio.gather(*(
+            services.fetch_equity_return_pct_async("SPY", "2025-02-02", "2025-02-10") for _ in range(10)
+        ))
+
+    assert asyncio.run(run()) == [pytest.approx(0.05)] * 10
+    assert fake_upstream.calls == ["/v2/stocks/SPY/bars"]
+    after = services._equity_flight.stats()
+    assert after["coalesced"] - before["coalesced"] == 9
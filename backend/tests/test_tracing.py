@@ -0,0 +1,116 @@
+import io
+import json
+import logging
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.app.main import app
+from backend.app import tracing
+from backend.app.api.v1 import compare as compare_api
+from backend.tests.fake_upstream import make_bars, make_event_odds
+
+client = TestClient(app)
+
+EVENT_ID = "3fd7cba821568399920fcea4dadad30d"
+SNAP = "2025-02-09T22:25:38Z"
+URL = f"/api/v1/compare?start=2025-02-02&end=2025-02-10&odds_date={SNAP}"
+BODY = {
+    "starting_capital": 1000,
+    "equity_symbol": "AAPL",
+    "equity_weight": 0.7,
+    "bet": {"league": "NFL", "event_id": EVENT_ID, "stake": 100, "odds": None, "outcome": "win"}
+}
+
+
+@pytest.fixture
+def spans(monkeypatch):
+    """Collect exported spans in memory; returns a callable that parses them."""
+    monkeypatch.setattr(compare_api, "_save_history_inline", lambda rows: None)
+    buf = io.StringIO()
+    previous = tracing.set_exporter(tracing.JsonLinesExporter(buf))
+    yield lambda: [json.loads(line) for line in buf.getvalue().splitlines()]
+    tracing.set_exporter(previous)
+
+
+def _ancestors(span, by_id):
+    chain = []
+    while span["parent_id"] in by_id:
+        span = by_id[span["parent_id"]]
+        chain.append(span["name"])
+    return chain
+
+
+def test_compare_spans_share_the_request_trace(fake_upstream, spans):
+    fake_upstream.bars["AAPL"] = make_bars([(100.0, 101.0), (101.0, 110.0)])
+    fake_upstream.event_odds[EVENT_ID] = make_event_odds(EVENT_ID, {"fanduel": {"Eagles": 2.4}}, SNAP)
+
+    r = client.post(URL, json=BODY)
+    assert r.status_code == 200
+    trace_id = r.headers["X-Trace-Id"]
+    exported = spans()
+    assert {s["trace_id"] for s in exported} == {trace_id}
+
+    by_name = {s["name"]: s for s in exported}
+    for name in ("POST /api/v1/compare", "compare.validate", "compare.cache_lookup", "compare.build",
+                 "equity.resolve", "equity.fetch", "odds.resolve", "odds.fetch", "http.get",
+                 "compare.execute", "history.save"):
+        assert name in by_name, name
+    root = by_name["POST /api/v1/compare"]
+    assert root["parent_id"] is None and root["attrs"]["status_code"] == 200
+    by_id = {s["span_id"]: s for s in exported}
+    assert _ancestors(by_name["odds.fetch"], by_id) == ["odds.resolve", "compare.build", "POST /api/v1/compare"]
+    assert by_name["odds.fetch"]["attrs"]["status_code"] == 200
+    # history is written from the threadpool but stays in the request trace
+    assert _ancestors(by_name["history.save"], by_id) == ["POST /api/v1/compare"]
+
+
+def test_incoming_traceparent_is_continued(fake_upstream, spans):
+    trace_id = "4bf92f3577b34da6a3ce929d0e0e4736"
+    r = client.post(URL, json=BODY, headers={"traceparent": f"00-{trace_id}-00f067aa0ba902b7-01"})
+    assert r.headers["X-Trace-Id"] == trace_id
+    root = [s for s in spans() if s["name"] == "POST /api/v1/compare"][0]
+    assert root["trace_id"] == trace_id and root["parent_id"] == "00f067aa0ba902b7"
+
+
+def test_pool_threads_inherit_the_trace(fake_upstream, spans, monkeypatch):
+    # the batch path resolves lookups on the upstream thread pool via the sync client
+    monkeypatch.setattr(compare_api, "_save_history_bulk", lambda rows: None)
+    scenario = {**BODY, "start": "2025-02-02", "end": "2025-02-10", "odds_date": SNAP}
+    r = client.post("/api/v1/compare/batch", json={"scenarios": [scenario]})
+    exported = spans()
+    by_id = {s["span_id"]: s for s in exported}
+    resolve = [s for s in exported if s["name"] == "equity.resolve"][0]
+    assert resolve["trace_id"] == r.headers["X-Trace-Id"]
+    assert _ancestors(resolve, by_id) == ["compare.build_batch", "POST /api/v1/compare/batch"]
+
+
+def test_log_records_carry_trace_id(fake_upstream, caplog, monkeypatch):
+    monkeypatch.setattr(compare_api, "_save_history", lambda *a: None)
+    caplog.set_level(logging.INFO, logger="backend.app.services")
+    r = client.post(URL, json=BODY)
+    fallback = [rec for rec in caplog.records if rec.getMessage().startswith("odds_fallback")]
+    assert fallback and fallback[0].trace_id == r.headers["X-Trace-Id"]
+
+
+def test_app_log_lines_show_the_trace_id(fake_upstream, monkeypatch):
+    monkeypatch.setattr(compare_api, "_save_history", lambda *a: None)
+    handler = tracing.configure_logging()
+    buf = io.StringIO()
+    previous = handler.setStream(buf)
+    try:
+        r = client.post(URL, json=BODY)
+    finally:
+        handler.setStream(previous)
+    fallback = [line for line in buf.getvalue().splitlines() if "odds_fallback" in line]
+    assert fallback and f"trace={r.headers['X-Trace-Id']}" in fallback[0]
+
+
+def test_spans_are_noops_without_exporter():
+    previous = tracing.set_exporter(None)
+    try:
+        with tracing.span("anything") as sp:
+            sp.set(x=1)
+        assert tracing.current_span() is None
+    finally:
+        tracing.set_exporter(previous)
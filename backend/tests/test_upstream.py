@@ -0,0 +1,58 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from backend.app import upstream
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    fail_first = 0
+
+    def do_GET(self):
+        cls = type(self)
+        status = 200
+        if cls.fail_first > 0:
+            cls.fail_first -= 1
+            status = 503
+        body = json.dumps({"path": self.path}).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def local_server(monkeypatch):
+    monkeypatch.setattr(upstream.settings, "UPSTREAM_BACKOFF_FACTOR", 0)
+    upstream.close_sessions()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+    upstream.close_sessions()
+
+
+def test_session_reuses_connections_per_host(local_server):
+    for i in range(3):
+        r = upstream.http_get(f"{local_server}/v2/stocks/SPY/bars?i={i}", timeout=5)
+        assert r.status_code == 200
+    assert upstream.get_session(local_server + "/other") is upstream.get_session(local_server + "/x")
+
+    stats = upstream.connection_stats()[local_server]
+    assert stats == {"requests": 3, "connections_opened": 1, "connections_reused": 2}
+
+
+def test_retries_gateway_errors(local_server, monkeypatch):
+    monkeypatch.setattr(_Handler, "fail_first", 1)
+    r = upstream.http_get(f"{local_server}/odds", timeout=5)
+    assert r.status_code == 200
+    assert upstream.connection_stats()[local_server]["requests"] == 2
@@ -0,0 +1,56 @@
+import numpy as np
+
+from backend.app.schemas import CompareRequest, Bet
+from backend.app.services import execute_compare
+from backend.app.vector_compare import execute_compare_vectorized, round2
+
+EVENT_ID = "aaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa"
+
+
+def _scalar(capital, weight, stake, odds, outcome, ret):
+    req = CompareRequest(
+        starting_capital=capital,
+        equity_symbol="SPY",
+        equity_weight=weight,
+        equity_return_pct=ret,
+        bet=Bet(league="NFL", event_id=EVENT_ID, stake=stake, odds=odds, outcome=outcome),
+    )
+    return execute_compare(req)
+
+
+def test_round2_matches_builtin_round_on_ties():
+    values = np.array([0.125, 0.375, 1.005, 2.675, 1.115, -0.125, 1234567.885, 0.0, -0.001])
+    assert round2(values).tolist() == [round(float(v), 2) for v in values]
+
+
+def test_vectorized_matches_scalar_to_the_cent():
+    rng = np.random.default_rng(7)
+    n = 2000
+    capital = np.round(rng.uniform(1, 100_000, n), 2)
+    weight = np.round(rng.uniform(0, 1, n), 3)
+    stake = np.round(rng.uniform(0.01, 5_000, n), 2)
+    odds = np.round(rng.uniform(1.01, 15, n), 2)
+    outcome = np.where(rng.random(n) < 0.5, "win", "loss")
+    ret = rng.uniform(-0.5, 0.5, n)
+
+    cols = execute_compare_vectorized(capital, weight, stake, odds, outcome, ret)
+    for i in range(n):
+        out = _scalar(float(capital[i]), float(weight[i]), float(stake[i]), float(odds[i]),
+                      str(outcome[i]), float(ret[i]))
+        assert cols["equity_allocated"][i] == out["equity"]["allocated"]
+        assert cols["equity_pnl"][i] == out["equity"]["pnl"]
+        assert cols["equity_final"][i] == out["equity"]["final"]
+        assert cols["bet_allocated"][i] == out["bet"]["allocated"]
+        assert cols["bet_pnl"][i] == out["bet"]["pnl"]
+        assert cols["bet_final"][i] == out["bet"]["final"]
+        assert cols["combined_final"][i] == out["combined_final"]
+        assert cols["roi_pct"][i] == out["roi_pct"]
+
+
+def test_vectorized_broadcasts_grid():
+    weights = np.linspace(0, 1, 21)[:, None]
+    win = np.array([True, False])[None, :]
+    cols = execute_compare_vectorized(1000, weights, 100, 2.5, win, 0.05)
+    assert cols["roi_pct"].shape == (21, 2)
+    assert cols["bet_pnl"][0].tolist() == [150.0, 0.0]
+    assert cols["combined_final"][-1, 0] == _scalar(1000, 1.0, 100, 2.5, "win", 0.05)["combined_final"]